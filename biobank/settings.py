@@ -46,6 +46,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Grava o cache de permissões uma vez por request
+    "core.permissions.middleware.PermissionCacheMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -104,6 +106,66 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Upload em partes (retomável) de SampleFile: tamanho máximo de cada
+# parte e do arquivo inteiro (bytes)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_MAX_SIZE = 100 * 1024 ** 3
+
+# Download de anexos: a view checa a permissão e, com FILE_OFFLOAD,
+# o servidor web envia os bytes (Range incluso) em vez do gunicorn.
+#   "nginx":    X-Accel-Redirect → location FILE_OFFLOAD_PREFIX
+#               location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+#   "sendfile": X-Sendfile (Apache mod_xsendfile / lighttpd)
+FILE_OFFLOAD = ""
+FILE_OFFLOAD_PREFIX = "/protected-media/"
+
+# Prévias de imagens (miniatura, prévia, pirâmide Deep Zoom), por SHA-256.
+# Dentro de MEDIA_ROOT para que o FILE_OFFLOAD também sirva os blocos.
+PREVIEW_CACHE_ROOT = MEDIA_ROOT / "previews"
+PREVIEW_MAX_PIXELS = 1_000_000_000
+
+# Índices de FASTA/FASTQ (SQLite por SHA-256) para leitura de regiões
+SEQUENCE_INDEX_ROOT = MEDIA_ROOT / "indexes"
+
+# =========================
+# CACHE
+# =========================
+# "permissions" é file-based para ser compartilhado entre workers do
+# gunicorn no mesmo nó (invalidação por versão global de ACL).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "permissions": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "permissions",
+    },
+    # Leitura de QR/código de barras (LRU + TTL). LocMem é por processo:
+    # com vários workers, o TTL limita o tempo de dados desatualizados
+    "scan": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "scan",
+        "TIMEOUT": 60,
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+}
+PERMISSION_CACHE_TIMEOUT = 600  # segundos
+PERMISSION_CACHE_MAX_DECISIONS = 5000  # decisões guardadas por usuário
+
+# QR codes das etiquetas: cache persistente em disco (uuid + nível de correção)
+QR_CACHE_ROOT = BASE_DIR / "cache" / "qr"
+LABEL_QR_INLINE = 200  # QRs gerados no request; o restante vai para a fila
+
+# =========================
+# TAREFAS EM SEGUNDO PLANO
+# =========================
+# Fila no próprio banco, consumida por `manage.py runworker`.
+# JOBS_EAGER executa as tarefas no processo que enfileira (sem worker).
+JOBS_EAGER = False
+JOBS_CONCURRENCY = 4
+JOBS_POLL_INTERVAL = 2.0  # segundos
+JOBS_STALE_AFTER = 300  # segundos sem heartbeat → tarefa volta para a fila
+
 # =========================
 # INTERNACIONALIZAÇÃO
 # =========================
@@ -1,7 +1,6 @@
 from django.contrib import admin
 from django.urls import path
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 
 # ========================================================
@@ -24,11 +23,40 @@ from core.views.auth import CoreLoginView, logout_user
 # IMPORTS: INTERNAL LIMS (CORE)
 # ========================================================
 from core.views.internal.workspace import home
+from core.views.internal.workspace.views import permission_cache_stats_view
 
 # Biobanks, Collections & Samples
 from core.views.internal.biobanks.members import biobank_members_view
 from core.views.internal.collections.members import manage_collection_members
-from core.views.internal.samples.views import print_sample_label
+from core.views.internal.samples.views import (
+    print_sample_label,
+    import_samples_view,
+    export_samples_view,
+    print_labels_view,
+    sample_qr_view,
+    transition_samples_view,
+    assign_collection_view,
+    scan_sample_view,
+    scan_samples_view,
+)
+from core.views.internal.samples.uploads import start_upload_view, upload_chunk_view
+from core.views.internal.samples.files import (
+    sample_file_download_view,
+    sample_file_metadata_view,
+    sample_file_preview_view,
+    sample_file_region_view,
+    sample_file_table_view,
+)
+
+# Armazenamento físico (site → freezer → rack → caixa)
+from core.views.internal.storage.views import (
+    storage_free_view,
+    storage_box_view,
+    storage_place_view,
+)
+
+# Tarefas em segundo plano (fila no banco)
+from core.views.internal.jobs.views import job_status_view, job_cancel_view
 
 # Tags & Keywords
 from core.views.internal.tags.views import tags_view, create_tag_ajax_view
@@ -57,6 +85,27 @@ urlpatterns = [
     path("biobanks/<int:biobank_id>/members/", biobank_members_view, name="biobank_members"),
     path("collections/<int:collection_id>/members/", manage_collection_members, name="collection_members"),
     path("samples/<int:sample_id>/print/", print_sample_label, name="print_sample_label"),
+    path("samples/labels/", print_labels_view, name="print_labels"),
+    path("samples/qr/<uuid:sample_uuid>.png", sample_qr_view, name="sample_qr"),
+    path("samples/import/", import_samples_view, name="import_samples"),
+    path("samples/export/", export_samples_view, name="export_samples"),
+    path("samples/transition/", transition_samples_view, name="transition_samples"),
+    path("samples/assign-collection/", assign_collection_view, name="assign_collection"),
+    path("samples/scan/", scan_samples_view, name="scan_samples"),
+    path("samples/scan/<uuid:sample_uuid>/", scan_sample_view, name="scan_sample"),
+    path("samples/<int:sample_id>/uploads/", start_upload_view, name="start_sample_upload"),
+    path("samples/uploads/<uuid:upload_id>/", upload_chunk_view, name="sample_upload"),
+    path("samples/files/<int:file_id>/download/", sample_file_download_view, name="sample_file_download"),
+    path("samples/files/<int:file_id>/metadata/", sample_file_metadata_view, name="sample_file_metadata"),
+    path("samples/files/<int:file_id>/table/", sample_file_table_view, name="sample_file_table"),
+    path("samples/files/<int:file_id>/region/", sample_file_region_view, name="sample_file_region"),
+    path("samples/files/<int:file_id>/preview/<str:content_hash>/<path:name>", sample_file_preview_view, name="sample_file_preview"),
+    path("storage/<int:unit_id>/free/", storage_free_view, name="storage_free"),
+    path("storage/<int:unit_id>/box/", storage_box_view, name="storage_box"),
+    path("storage/place/", storage_place_view, name="storage_place"),
+    path("jobs/<int:job_id>/", job_status_view, name="job_status"),
+    path("jobs/<int:job_id>/cancel/", job_cancel_view, name="job_cancel"),
+    path("internal/api/permission-cache/", permission_cache_stats_view, name="permission_cache_stats"),
 
     # Tags & Keywords
     path("tags/", tags_view, name="tags_view"),
@@ -74,14 +123,17 @@ urlpatterns = [
     # --- MOLECULAR VIEWER ---
     path('internal/lab-tools/molecular/', molecular_views.molecular_index, name='molecular_index'),
     path('internal/lab-tools/molecular/<int:seq_id>/', molecular_views.molecular_viewer, name='molecular_viewer'),
+    path('internal/lab-tools/molecular/<int:seq_id>/download/', molecular_views.molecular_download, name='molecular_download'),
     # NOVA ROTA: Necessária para o formulário de upload no modal
     path('internal/lab-tools/molecular/upload/', molecular_views.molecular_upload, name='molecular_upload'),
+    path('internal/lab-tools/molecular/import/', molecular_views.molecular_import_fasta, name='molecular_import_fasta'),
 
     # ================= WORKSPACE (HOME) ==============
     path("", home, name="home"),
 ]
 
 # ================= DEBUG & STATIC FILES =============
+# MEDIA não é exposto nem em DEBUG: anexos só pela view de download
+# (samples/files/<id>/download/), que checa a permissão
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += staticfiles_urlpatterns()
\ No newline at end of file
@@ -3,9 +3,17 @@ from core.models import (
     Biobank,
     Collection,
     Sample,
+    AttachmentMetadata,
+    Blob,
     SampleFile,
+    SampleFileUpload,
     Event,
     CollectionUserRole,
+    EffectiveAccess,
+    StorageUnit,
+    StorageOccupancy,
+    Job,
+    JobLog,
     Tag,
     Keyword,
     KeywordValue,
@@ -61,7 +69,7 @@ class SampleFileInline(admin.TabularInline):
     model = SampleFile
     extra = 0
     # Campos que existem no modelo SampleFile
-    readonly_fields = ("uploaded_at", "mime_type", "file_size")
+    readonly_fields = ("uploaded_at", "mime_type", "file_size", "blob", "logical_path")
 
 class CollectionUserRoleInline(admin.TabularInline):
     model = CollectionUserRole
@@ -126,9 +134,31 @@ class SampleAdmin(admin.ModelAdmin):
 @admin.register(SampleFile)
 class SampleFileAdmin(admin.ModelAdmin):
     # Alterado 'file_type' para 'category' e 'mime_type' que existem no modelo
-    list_display = ("file", "sample", "category", "mime_type", "uploaded_at")
+    list_display = ("logical_path", "sample", "category", "mime_type", "uploaded_at")
     list_filter = ("category", "uploaded_at")
-    search_fields = ("file", "description")
+    search_fields = ("logical_path", "name", "description", "sha256")
+    readonly_fields = ("sha256", "blob", "logical_path")
+
+@admin.register(AttachmentMetadata)
+class AttachmentMetadataAdmin(admin.ModelAdmin):
+    list_display = ("content_hash", "kind", "status", "updated_at")
+    list_filter = ("kind", "status")
+    search_fields = ("content_hash",)
+    readonly_fields = ("content_hash", "kind", "data", "error", "created_at", "updated_at")
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "size", "refcount", "updated_at")
+    list_filter = ("refcount",)
+    search_fields = ("sha256",)
+    readonly_fields = ("sha256", "size", "refcount", "created_at", "updated_at")
+
+@admin.register(SampleFileUpload)
+class SampleFileUploadAdmin(admin.ModelAdmin):
+    list_display = ("filename", "sample", "status", "received", "size", "created_by", "updated_at")
+    list_filter = ("status",)
+    search_fields = ("filename", "sample__sample_id", "sha256")
+    readonly_fields = ("storage_name", "received", "sha256", "sample_file", "created_at", "updated_at")
 
 # ============================================================
 # EVENTS
@@ -139,4 +169,48 @@ class EventAdmin(admin.ModelAdmin):
     list_display = ("sample", "event_type", "location_snapshot", "timestamp")
     list_filter = ("event_type", "timestamp")
     search_fields = ("sample__sample_id", "notes", "location_snapshot")
-    readonly_fields = ("timestamp",)
\ No newline at end of file
+    readonly_fields = ("timestamp",)
+
+# ============================================================
+# ACESSO EFETIVO (materializado, somente leitura)
+# ============================================================
+@admin.register(EffectiveAccess)
+class EffectiveAccessAdmin(admin.ModelAdmin):
+    list_display = ("user", "collection", "can_view", "can_edit", "can_manage", "updated_at")
+    list_filter = ("can_view", "can_edit", "can_manage")
+    search_fields = ("user__username", "collection__name")
+    readonly_fields = ("user", "collection", "can_view", "can_edit", "can_manage", "updated_at")
+
+# ============================================================
+# ARMAZENAMENTO (site → freezer → rack → caixa)
+# ============================================================
+@admin.register(StorageUnit)
+class StorageUnitAdmin(admin.ModelAdmin):
+    list_display = ("path", "kind", "rows", "columns", "is_active")
+    list_filter = ("kind", "is_active")
+    search_fields = ("path", "name")
+    readonly_fields = ("path", "created_at")
+
+@admin.register(StorageOccupancy)
+class StorageOccupancyAdmin(admin.ModelAdmin):
+    list_display = ("box", "row", "column", "sample", "placed_at", "placed_by")
+    search_fields = ("box__path", "sample__sample_id")
+    raw_id_fields = ("sample", "box")
+    readonly_fields = ("placed_at",)
+
+# ============================================================
+# TAREFAS EM SEGUNDO PLANO (runworker)
+# ============================================================
+class JobLogInline(admin.TabularInline):
+    model = JobLog
+    extra = 0
+    can_delete = False
+    readonly_fields = ("timestamp", "level", "message")
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "progress_current", "progress_total", "created_by", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    search_fields = ("kind", "message", "error")
+    readonly_fields = ("created_at", "started_at", "finished_at", "heartbeat_at", "worker")
+    inlines = [JobLogInline]
@@ -6,4 +6,6 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         # Importa os signals para que eles comecem a ouvir as mudanças nos modelos
-        import core.signals
\ No newline at end of file
+        import core.signals
+        # Registra as tarefas da fila (runworker / JOBS_EAGER)
+        import core.tasks
\ No newline at end of file
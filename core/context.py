@@ -1,18 +1,14 @@
 # core/views/context.py
 
-from django.db.models import Q
+from django.utils.functional import SimpleLazyObject
 
 from core.models import (
     Biobank,
     Collection,
     Sample,
-    CollectionUserRole,
-    Tag,
     Keyword,
-    KeywordValue,
 )
-
-from core.forms import BiobankForm, CollectionForm
+from core.permissions.index import PermissionIndex
 
 
 def base_context(request, public: bool = False):
@@ -35,58 +31,55 @@ def base_context(request, public: bool = False):
 
     # ======================================================
     # CONTEXTO INTERNO (LIMS)
+    # Entradas preguiçosas: só tocam o banco se o template/view usar
     # ======================================================
 
-    # ----- All keywords (global listing) -----
-    all_keywords = Keyword.objects.all().order_by("name")
-
-    # ----- Collections and samples visible to user -----
-    if user.is_superuser:
-        collections = Collection.objects.all()
-        samples = Sample.objects.all()
-    else:
-        collections = Collection.objects.filter(
-            user_roles__user=user
-        ).distinct()
-
-        samples = Sample.objects.filter(
-            Q(collection__user_roles__user=user)
-            | Q(collection__isnull=True)
-        ).distinct()
-
-    # ----- Biobanks (active only) -----
-    biobanks = Biobank.objects.filter(is_active=True)
-
-    # ----- Detect if user is OWNER of any collection -----
-    is_owner_of_any = CollectionUserRole.objects.filter(
-        user=user,
-        role=CollectionUserRole.OWNER
-    ).exists()
-
-    can_manage_permissions = user.is_superuser or is_owner_of_any
-
     return {
         # request / state
         "request": request,
         "user": user,
         "is_public": False,
 
-        # entities
-        "biobanks": biobanks,
-        "collections": collections,
-        "samples": samples,
+        # entities (regras de core/permissions compiladas em SQL)
+        "biobanks": _lazy(request, "biobanks", lambda: Biobank.objects.visible_to(user)),
+        "collections": _lazy(request, "collections", lambda: Collection.objects.visible_to(user)),
+        "samples": _lazy(request, "samples", lambda: Sample.objects.visible_to(user)),
 
-        # metadata
-        "all_keywords": all_keywords,
+        # metadata (global listing)
+        "all_keywords": _lazy(request, "all_keywords", lambda: Keyword.objects.all().order_by("name")),
 
         # forms (injected later by views)
         "biobank_form": None,
         "collection_form": None,
         "sample_form": None,
 
-        # permissions
-        "can_manage_permissions": can_manage_permissions,
+        # permissions (superuser ou OWNER de alguma Collection)
+        "can_manage_permissions": _lazy(
+            request,
+            "can_manage_permissions",
+            lambda: user.is_superuser or _is_owner_of_any(user),
+        ),
 
         # state for detail pages
         "selected_collection": None,
     }
+
+
+def _lazy(request, key, factory):
+    """
+    Valor preguiçoso memoizado por request: `factory` roda no máximo uma
+    vez por request, na primeira vez em que o valor é usado.
+    """
+    memo = request.__dict__.setdefault("_base_context_memo", {})
+
+    def resolve():
+        if key not in memo:
+            memo[key] = factory()
+        return memo[key]
+
+    return SimpleLazyObject(resolve)
+
+
+def _is_owner_of_any(user) -> bool:
+    # Papéis vêm do cache de permissões (PermissionIndex)
+    return PermissionIndex.for_user(user).is_coordinator
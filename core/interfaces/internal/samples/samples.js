@@ -7,6 +7,62 @@ function getCsrfToken() {
     return document.querySelector("[name=csrfmiddlewaretoken]")?.value;
 }
 
+/* =========================================================
+   UPLOAD EM PARTES (arquivos grandes, retomável)
+   Protocolo: POST /samples/<id>/uploads/ abre a sessão; cada parte vai
+   em PUT com Content-Range; em 409 o servidor informa o offset correto.
+========================================================= */
+async function uploadSampleFileChunked(sampleId, file, { description = "", onProgress = null, retries = 5 } = {}) {
+    const headers = { "X-CSRFToken": getCsrfToken() };
+
+    const fd = new FormData();
+    fd.append("filename", file.name);
+    fd.append("size", file.size);
+    fd.append("description", description);
+
+    let res = await fetch(`/samples/${sampleId}/uploads/`, { method: "POST", body: fd, headers });
+    let info = await res.json();
+    if (!res.ok) throw new Error(info.error || "Falha ao iniciar o upload.");
+
+    let offset = info.offset;
+    let failures = 0;
+    while (info.status === "pending") {
+        const end = Math.min(offset + info.chunk_size, file.size);
+        try {
+            res = await fetch(info.url || `/samples/uploads/${info.id}/`, {
+                method: "PUT",
+                body: file.slice(offset, end),
+                headers: {
+                    ...headers,
+                    "Content-Type": "application/octet-stream",
+                    "Content-Range": `bytes ${offset}-${end - 1}/${file.size}`,
+                },
+            });
+            info = await res.json();
+        } catch (err) {
+            // Conexão caiu: pergunta ao servidor onde parou e retoma
+            if (++failures > retries) throw err;
+            await new Promise(r => setTimeout(r, 1000 * failures));
+            res = await fetch(`/samples/uploads/${info.id}/`, { headers });
+            info = await res.json();
+            offset = info.offset;
+            continue;
+        }
+
+        if (res.status === 409) {
+            offset = info.offset;
+        } else if (!res.ok) {
+            throw new Error(info.error || "Falha no upload.");
+        } else {
+            offset = info.offset;
+            failures = 0;
+        }
+        if (onProgress) onProgress(offset, file.size);
+    }
+    return info;
+}
+window.uploadSampleFileChunked = uploadSampleFileChunked;
+
 document.addEventListener("DOMContentLoaded", () => {
 
     /* =========================================================
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from core.services.blobs import collect_garbage, convert_legacy_files, verify_refcounts
+
+
+class Command(BaseCommand):
+    help = (
+        "Manutenção do armazenamento de anexos por hash: conversão de "
+        "anexos antigos, coleta de lixo e conferência de referências (use via cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--convert", action="store_true", help="Converte anexos antigos (sem blob).")
+        parser.add_argument("--gc", action="store_true", help="Remove blobs órfãos e temporários abandonados.")
+        parser.add_argument("--scan-files", action="store_true", help="Com --gc: também varre o disco.")
+        parser.add_argument("--verify", action="store_true", help="Confere refcount contra os anexos.")
+        parser.add_argument("--fix", action="store_true", help="Com --verify: corrige as divergências.")
+
+    def handle(self, *args, **options):
+        if not any(options[k] for k in ("convert", "gc", "verify")):
+            options["gc"] = True
+
+        if options["convert"]:
+            stats = convert_legacy_files()
+            self.stdout.write(
+                f"Convertidos: {stats['converted']} "
+                f"({stats['deduplicated']} deduplicados, {stats['missing']} ausentes no disco)"
+            )
+
+        if options["verify"]:
+            wrong = verify_refcounts(fix=options["fix"])
+            for sha256, stored, actual in wrong:
+                self.stdout.write(self.style.WARNING(f"{sha256}: refcount {stored}, anexos {actual}"))
+            if options["fix"] and wrong:
+                self.stdout.write(f"{len(wrong)} refcounts corrigidos.")
+
+        if options["gc"]:
+            stats = collect_garbage(scan_files=options["scan_files"])
+            self.stdout.write(self.style.SUCCESS(
+                f"Removidos: {stats['blobs']} blobs, {stats['tmp']} temporários, {stats['files']} arquivos sem registro."
+            ))
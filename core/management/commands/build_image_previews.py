@@ -0,0 +1,50 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from core.models import AttachmentMetadata, SampleFile
+from core.services.image_previews import build_image_previews, preview_dir, remove_previews
+from core.services.jobs import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Enfileira miniatura / prévia / pirâmide das imagens anexadas que "
+        "ainda não têm (uma por conteúdo). --now processa aqui mesmo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--now", action="store_true", help="Processa sem passar pela fila.")
+        parser.add_argument("--rebuild", action="store_true", help="Apaga e refaz todas as prévias.")
+
+    def handle(self, *args, **options):
+        done = AttachmentMetadata.objects.filter(kind=AttachmentMetadata.IMAGE)
+        if options["rebuild"]:
+            for content_hash in done.values_list("content_hash", flat=True):
+                remove_previews(content_hash)
+            done.delete()
+
+        hashes = (
+            SampleFile.objects
+            .filter(category="image")
+            .exclude(sha256="")
+            .values_list("sha256", flat=True)
+            .distinct()
+        )
+        ready = set(done.filter(status=AttachmentMetadata.READY).values_list("content_hash", flat=True))
+        failed = set(done.filter(status=AttachmentMetadata.FAILED).values_list("content_hash", flat=True))
+
+        count = 0
+        for content_hash in hashes.iterator():
+            # Linha "ready" sem o diretório (cache limpo) também é refeita
+            if content_hash in failed or (content_hash in ready and os.path.isdir(preview_dir(content_hash))):
+                continue
+            if options["now"]:
+                metadata = build_image_previews(content_hash)
+                self.stdout.write(f"{content_hash[:12]}: {metadata.status if metadata else '-'}")
+            else:
+                enqueue("attachments.image_preview", unique=True, content_hash=content_hash)
+            count += 1
+
+        action = "processadas" if options["now"] else "enfileiradas"
+        self.stdout.write(self.style.SUCCESS(f"{count} imagens {action}."))
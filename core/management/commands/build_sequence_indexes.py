@@ -0,0 +1,58 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from core.models import AttachmentMetadata, SampleFile
+from core.services.jobs import enqueue
+from core.services.sequence_index import (
+    build_sequence_index,
+    index_path,
+    indexable,
+    remove_sequence_index,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Enfileira o índice de acesso aleatório dos FASTA/FASTQ anexados "
+        "que ainda não têm (um por conteúdo). --now processa aqui mesmo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--now", action="store_true", help="Processa sem passar pela fila.")
+        parser.add_argument("--rebuild", action="store_true", help="Apaga e refaz todos os índices.")
+
+    def handle(self, *args, **options):
+        done = AttachmentMetadata.objects.filter(kind=AttachmentMetadata.INDEX)
+        if options["rebuild"]:
+            for content_hash in done.values_list("content_hash", flat=True):
+                remove_sequence_index(content_hash)
+            done.delete()
+
+        files = (
+            SampleFile.objects
+            .filter(category="sequence")
+            .exclude(sha256="")
+            .values_list("sha256", "name", "file")
+        )
+        ready = set(done.filter(status=AttachmentMetadata.READY).values_list("content_hash", flat=True))
+        failed = set(done.filter(status=AttachmentMetadata.FAILED).values_list("content_hash", flat=True))
+
+        count = 0
+        seen = set()
+        for content_hash, name, path in files.iterator():
+            if content_hash in seen or not indexable(name or path):
+                continue
+            seen.add(content_hash)
+            # Linha "ready" sem o arquivo lateral também é refeita
+            if content_hash in failed or (content_hash in ready and os.path.exists(index_path(content_hash))):
+                continue
+            if options["now"]:
+                metadata = build_sequence_index(content_hash)
+                self.stdout.write(f"{content_hash[:12]}: {metadata.status if metadata else '-'}")
+            else:
+                enqueue("attachments.sequence_index", unique=True, content_hash=content_hash)
+            count += 1
+
+        action = "processados" if options["now"] else "enfileirados"
+        self.stdout.write(self.style.SUCCESS(f"{count} índices {action}."))
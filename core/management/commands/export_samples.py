@@ -0,0 +1,46 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Sample
+from core.services.sample_export import CHUNK_SIZE, SERIALIZERS, export_samples
+from core.views.internal.samples.filters import (
+    SAMPLE_FILTER_PARAMS,
+    apply_sample_filters,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta os Samples visíveis a um usuário em CSV/JSONL "
+        "(streaming, memória constante)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username cujas permissões se aplicam.")
+        parser.add_argument("--format", choices=sorted(SERIALIZERS), default="csv")
+        parser.add_argument("--output", "-o", help="Arquivo de saída (padrão: stdout).")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        for name in SAMPLE_FILTER_PARAMS:
+            parser.add_argument(f"--{name}", help=f"Filtro '{name}' da listagem.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["user"]).first()
+        if not user:
+            raise CommandError(f"Usuário '{options['user']}' não encontrado.")
+
+        filters = {
+            name: options[name] for name in SAMPLE_FILTER_PARAMS if options[name]
+        }
+        samples_qs = apply_sample_filters(
+            Sample.objects.filter(is_active=True).visible_to(user),
+            filters,
+        )
+        chunks = export_samples(samples_qs, options["format"], options["chunk_size"])
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as fh:
+                fh.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
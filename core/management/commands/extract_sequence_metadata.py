@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from core.models import AttachmentMetadata, SampleFile
+from core.services.jobs import enqueue
+from core.services.sequence_metadata import extract_sequence_metadata
+
+
+class Command(BaseCommand):
+    help = (
+        "Enfileira a extração de estatísticas dos anexos de sequência que "
+        "ainda não têm (um por conteúdo). --now processa aqui mesmo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--now", action="store_true", help="Processa sem passar pela fila.")
+        parser.add_argument("--retry-failed", action="store_true", help="Refaz os que falharam.")
+
+    def handle(self, *args, **options):
+        done = AttachmentMetadata.objects.filter(kind=AttachmentMetadata.SEQUENCE)
+        if options["retry_failed"]:
+            done.filter(status=AttachmentMetadata.FAILED).delete()
+
+        hashes = (
+            SampleFile.objects
+            .filter(category="sequence")
+            .exclude(sha256="")
+            .exclude(sha256__in=done.values("content_hash"))
+            .values_list("sha256", flat=True)
+            .distinct()
+        )
+
+        count = 0
+        for content_hash in hashes.iterator():
+            if options["now"]:
+                metadata = extract_sequence_metadata(content_hash)
+                self.stdout.write(f"{content_hash[:12]}: {metadata.status if metadata else '-'}")
+            else:
+                enqueue("attachments.sequence_metadata", unique=True, content_hash=content_hash)
+            count += 1
+
+        action = "processados" if options["now"] else "enfileirados"
+        self.stdout.write(self.style.SUCCESS(f"{count} conteúdos {action}."))
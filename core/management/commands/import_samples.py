@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.sample_import import (
+    CHUNK_SIZE,
+    SampleImporter,
+    detect_format,
+    iter_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa Samples em lote a partir de CSV/TSV/XLSX "
+        "(streaming, validação por lote, bulk_create)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Manifesto (.csv, .tsv, .xlsx).")
+        parser.add_argument("--user", required=True, help="Username do responsável (owner).")
+        parser.add_argument("--dry-run", action="store_true", help="Apenas valida, sem gravar.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--format", choices=["csv", "tsv", "xlsx"], help="Força o formato.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["user"]).first()
+        if not user:
+            raise CommandError(f"Usuário '{options['user']}' não encontrado.")
+
+        importer = SampleImporter(
+            user,
+            dry_run=options["dry_run"],
+            chunk_size=options["chunk_size"],
+        )
+
+        fmt = options["format"] or detect_format(options["path"])
+        with open(options["path"], "rb") as fh:
+            report = importer.run(iter_rows(fh, fmt))
+
+        for err in report.errors:
+            self.stderr.write(f"linha {err['line']} [{err['sample_id']}]: {err['error']}")
+        self._summary(report)
+
+    def _summary(self, report):
+        mode = "DRY-RUN" if report.dry_run else "IMPORT"
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode}: {report.total} linhas, {report.valid} válidas, "
+            f"{report.created} criadas, {len(report.errors)} erros "
+            f"em {report.elapsed:.2f}s ({report.rows_per_second} linhas/s)"
+        ))
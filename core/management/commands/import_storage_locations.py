@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from core.services.storage import (
+    CHUNK_SIZE,
+    DEFAULT_BOX_COLUMNS,
+    DEFAULT_BOX_ROWS,
+    DEFAULT_SITE,
+    LocationImporter,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Converte os storage_location (texto livre) dos Samples sem posição "
+        "em hierarquia de armazenamento + ocupação de posições."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Apenas valida e reporta.")
+        parser.add_argument("--site", default=DEFAULT_SITE, help="Site usado quando o texto tem só 3 níveis.")
+        parser.add_argument("--rows", type=int, default=DEFAULT_BOX_ROWS, help="Linhas das caixas criadas.")
+        parser.add_argument("--columns", type=int, default=DEFAULT_BOX_COLUMNS, help="Colunas das caixas criadas.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        report = LocationImporter(
+            default_site=options["site"],
+            box_rows=options["rows"],
+            box_columns=options["columns"],
+            dry_run=options["dry_run"],
+            chunk_size=options["chunk_size"],
+        ).run()
+
+        for err in report.errors:
+            self.stderr.write(f"[{err['sample_id']}] '{err['location']}': {err['reason']}")
+
+        mode = "DRY-RUN" if report.dry_run else "IMPORT"
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode}: {report.total} localizações, {report.placed} alocadas, "
+            f"{report.created_units} unidades criadas, {len(report.errors)} erros"
+        ))
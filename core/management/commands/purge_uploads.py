@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.services.uploads import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Cancela uploads em partes parados e remove os arquivos .part (use via cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=48, help="Idade mínima (sem novas partes).")
+
+    def handle(self, *args, **options):
+        purged = purge_stale_uploads(max_age_hours=options["hours"])
+        self.stdout.write(self.style.SUCCESS(f"{purged} uploads cancelados."))
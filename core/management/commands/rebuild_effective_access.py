@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.permissions.effective_access import rebuild_effective_access
+
+
+class Command(BaseCommand):
+    help = "Reconstrói do zero a tabela EffectiveAccess (usuário → Collection)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Collections processadas por lote.",
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_effective_access(chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"EffectiveAccess reconstruída: {total} linhas.")
+        )
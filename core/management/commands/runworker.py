@@ -0,0 +1,109 @@
+import multiprocessing
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.services.jobs import (
+    claim_jobs,
+    default_worker_name,
+    execute_job,
+    heartbeat,
+    requeue_stale_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa as tarefas em segundo plano (fila no banco, sem broker). "
+        "Rode um processo por nó; --concurrency controla o paralelismo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int,
+            default=getattr(settings, "JOBS_CONCURRENCY", 4),
+            help="Tarefas simultâneas.",
+        )
+        parser.add_argument(
+            "--pool", choices=("thread", "process"), default="thread",
+            help="thread (I/O: Benchling, arquivos) ou process (CPU).",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float,
+            default=getattr(settings, "JOBS_POLL_INTERVAL", 2.0),
+            help="Segundos entre consultas à fila quando ociosa.",
+        )
+        parser.add_argument("--kind", action="append", dest="kinds", help="Só estes tipos (repetível).")
+        parser.add_argument("--burst", action="store_true", help="Sai quando a fila esvaziar.")
+        parser.add_argument("--name", default=None, help="Identificação do worker (padrão host:pid).")
+
+    def handle(self, *args, **options):
+        concurrency = max(options["concurrency"], 1)
+        poll_interval = options["poll_interval"]
+        worker = options["name"] or default_worker_name()
+
+        self._stopping = False
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self._stop)
+
+        if options["pool"] == "process":
+            # spawn: filhos não herdam as conexões abertas do processo pai
+            executor = ProcessPoolExecutor(
+                max_workers=concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+
+        self.stdout.write(f"Worker {worker}: {options['pool']} x{concurrency}")
+
+        running = {}
+        done_count = 0
+        last_heartbeat = time.monotonic()
+
+        with executor:
+            while True:
+                if not self._stopping:
+                    requeue_stale_jobs()
+
+                    free = concurrency - len(running)
+                    claimed = claim_jobs(worker, free, kinds=options["kinds"]) if free else []
+                    for job_id in claimed:
+                        running[executor.submit(execute_job, job_id, worker)] = job_id
+
+                    if options["burst"] and not running and not claimed:
+                        break
+
+                if not running:
+                    if self._stopping:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                finished, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job_id = running.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception as e:
+                        status = f"erro no worker: {e}"
+                    done_count += 1
+                    self.stdout.write(f"Tarefa #{job_id}: {status}")
+
+                # Heartbeat das tarefas que não reportam progresso
+                if running and time.monotonic() - last_heartbeat >= poll_interval:
+                    heartbeat(list(running.values()))
+                    last_heartbeat = time.monotonic()
+
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker} encerrado: {done_count} tarefas."))
+
+    def _stop(self, signum, frame):
+        if self._stopping:
+            raise SystemExit(1)
+        self._stopping = True
+        self.stdout.write("Encerrando após as tarefas em andamento (Ctrl+C de novo força a saída)...")
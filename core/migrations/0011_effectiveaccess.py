@@ -0,0 +1,146 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:28
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Papéis com edição / gerenciamento (valores de BiobankUserRole /
+# CollectionUserRole nesta migração)
+BIOBANK_EDIT_ROLES = ("owner", "manager")
+COLLECTION_EDIT_ROLES = ("owner", "editor")
+OWNER = "owner"
+
+CHUNK_SIZE = 500
+
+
+def _biobank_access(biobank, user, role):
+    """(view, edit, manage) no Biobank, como no PermissionIndex"""
+    if not biobank.is_active:
+        return False, False, False
+    if user.is_superuser or user.is_staff:
+        role = OWNER
+
+    if biobank.visibility == "public":
+        view = True
+    elif biobank.visibility == "private":
+        view = biobank.owner_id == user.pk
+    else:
+        view = role is not None
+    return view, role in BIOBANK_EDIT_ROLES, role == OWNER
+
+
+def _collection_access(collection, user, collection_role, biobank_role):
+    """(view, edit, manage) na Collection, como no PermissionIndex"""
+    if user.is_superuser or user.is_staff:
+        return True, True, True
+
+    biobank_view, biobank_edit, biobank_manage = _biobank_access(collection.biobank, user, biobank_role)
+    is_owner = collection.owner_id == user.pk
+
+    view = (
+        is_owner
+        or collection.visibility == "public"
+        or collection_role is not None
+        or biobank_view
+    )
+    edit = is_owner or collection_role in COLLECTION_EDIT_ROLES or biobank_edit
+    manage = collection_role == OWNER or biobank_manage
+    return view, edit, manage
+
+
+def populate_effective_access(apps, schema_editor):
+    """
+    Preenche a tabela para os usuários existentes: sem isto, toda
+    listagem por visible_to voltaria vazia até um rebuild manual.
+
+    As regras ficam copiadas aqui (modelos históricos, nada do código
+    atual de core.permissions): a migração dá sempre o mesmo resultado.
+    Candidatos por Collection: owner da Collection, owner do Biobank e
+    usuários com CollectionUserRole / BiobankUserRole.
+    """
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Collection = apps.get_model("core", "Collection")
+    BiobankUserRole = apps.get_model("core", "BiobankUserRole")
+    CollectionUserRole = apps.get_model("core", "CollectionUserRole")
+    EffectiveAccess = apps.get_model("core", "EffectiveAccess")
+
+    collection_roles = {
+        (uid, cid): role
+        for uid, cid, role in CollectionUserRole.objects.values_list("user_id", "collection_id", "role")
+    }
+    biobank_roles = {
+        (uid, bid): role
+        for uid, bid, role in BiobankUserRole.objects.values_list("user_id", "biobank_id", "role")
+    }
+    members_by_biobank = defaultdict(set)
+    for uid, bid in biobank_roles:
+        members_by_biobank[bid].add(uid)
+    members_by_collection = defaultdict(set)
+    for uid, cid in collection_roles:
+        members_by_collection[cid].add(uid)
+
+    users = User.objects.only("id", "is_superuser", "is_staff").in_bulk()
+
+    rows = []
+    for collection in Collection.objects.select_related("biobank").order_by("pk").iterator(chunk_size=CHUNK_SIZE):
+        candidates = (
+            {collection.owner_id, collection.biobank.owner_id}
+            | members_by_biobank[collection.biobank_id]
+            | members_by_collection[collection.pk]
+        )
+        for uid in candidates:
+            user = users.get(uid)
+            if user is None:
+                continue
+            view, edit, manage = _collection_access(
+                collection,
+                user,
+                collection_roles.get((uid, collection.pk)),
+                biobank_roles.get((uid, collection.biobank_id)),
+            )
+            if view or edit or manage:
+                rows.append(EffectiveAccess(
+                    user_id=uid,
+                    collection_id=collection.pk,
+                    can_view=view,
+                    can_edit=edit,
+                    can_manage=manage,
+                ))
+
+        if len(rows) >= CHUNK_SIZE:
+            EffectiveAccess.objects.bulk_create(rows)
+            rows = []
+    EffectiveAccess.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_molecularsequence_notebookentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EffectiveAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('can_view', models.BooleanField(default=False)),
+                ('can_edit', models.BooleanField(default=False)),
+                ('can_manage', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('collection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_access', to='core.collection')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Acesso Efetivo',
+                'verbose_name_plural': 'Acessos Efetivos',
+                'indexes': [models.Index(fields=['user', 'can_view', 'collection'], name='effaccess_user_view_idx')],
+                'unique_together': {('user', 'collection')},
+            },
+        ),
+        migrations.RunPython(populate_effective_access, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:30
+
+import core.models.expressions
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_effectiveaccess'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sample',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='sample_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sample',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='sample_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sample',
+            index=models.Index(fields=['collection', '-created_at', '-id'], name='sample_coll_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sample',
+            index=models.Index(fields=['biobank', '-created_at', '-id'], name='sample_biobank_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sample',
+            index=core.models.expressions.PatternOpsIndex(core.models.expressions.PatternOps(django.db.models.functions.text.Upper('organism_name')), name='sample_organism_idx'),
+        ),
+    ]
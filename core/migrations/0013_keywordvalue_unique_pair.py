@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:34
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+# Entidades com M2M para KeywordValue
+KEYWORD_OWNERS = ("Biobank", "Collection", "Sample")
+
+
+def merge_duplicate_values(apps, schema_editor):
+    """
+    Funde KeywordValues repetidos (mesma keyword e valor) no de menor id,
+    reapontando os vínculos de Biobank / Collection / Sample.
+    """
+    KeywordValue = apps.get_model("core", "KeywordValue")
+
+    groups = (
+        KeywordValue.objects
+        .values("keyword_id", "value")
+        .annotate(keep=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+
+    for group in groups:
+        keep = group["keep"]
+        duplicates = list(
+            KeywordValue.objects
+            .filter(keyword_id=group["keyword_id"], value=group["value"])
+            .exclude(id=keep)
+            .values_list("id", flat=True)
+        )
+
+        for name in KEYWORD_OWNERS:
+            field = apps.get_model("core", name)._meta.get_field("keywords")
+            through = field.remote_field.through
+            source = f"{field.m2m_field_name()}_id"
+            target = f"{field.m2m_reverse_field_name()}_id"
+
+            linked = set(
+                through.objects
+                .filter(**{target: keep})
+                .values_list(source, flat=True)
+            )
+            rows = through.objects.filter(**{f"{target}__in": duplicates})
+
+            # Entidade já ligada ao valor mantido: remove o vínculo repetido
+            rows.filter(**{f"{source}__in": linked}).delete()
+            for row in rows.order_by("id"):
+                if getattr(row, source) in linked:
+                    row.delete()
+                    continue
+                linked.add(getattr(row, source))
+                setattr(row, target, keep)
+                row.save(update_fields=[target.removesuffix("_id")])
+
+        KeywordValue.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_sample_listing_indexes'),
+    ]
+
+    operations = [
+        # A constraint vem em 0013b: no PostgreSQL, um ALTER TABLE na mesma
+        # transação das remoções acima falha com "pending trigger events"
+        migrations.RunPython(merge_duplicate_values, migrations.RunPython.noop),
+    ]
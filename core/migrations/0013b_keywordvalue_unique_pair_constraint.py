@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_keywordvalue_unique_pair'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='keywordvalue',
+            constraint=models.UniqueConstraint(fields=('keyword', 'value'), name='keywordvalue_unique_pair'),
+        ),
+    ]
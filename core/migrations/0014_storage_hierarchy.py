@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013b_keywordvalue_unique_pair_constraint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorageUnit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('site', 'Site / Laboratório'), ('freezer', 'Freezer / Tanque'), ('rack', 'Rack / Prateleira'), ('box', 'Caixa')], max_length=10)),
+                ('name', models.CharField(max_length=100)),
+                ('path', models.CharField(db_index=True, editable=False, max_length=500)),
+                ('rows', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('columns', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='core.storageunit')),
+            ],
+            options={
+                'verbose_name': 'Unidade de Armazenamento',
+                'verbose_name_plural': 'Unidades de Armazenamento',
+                'ordering': ['path'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StorageOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row', models.PositiveSmallIntegerField()),
+                ('column', models.PositiveSmallIntegerField()),
+                ('placed_at', models.DateTimeField(auto_now_add=True)),
+                ('placed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('sample', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='storage_position', to='core.sample')),
+                ('box', models.ForeignKey(limit_choices_to={'kind': 'box'}, on_delete=django.db.models.deletion.PROTECT, related_name='occupancies', to='core.storageunit')),
+            ],
+            options={
+                'verbose_name': 'Ocupação de Posição',
+                'verbose_name_plural': 'Ocupação de Posições',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='storageunit',
+            index=models.Index(fields=['kind', 'path'], name='storage_kind_path_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='storageunit',
+            constraint=models.UniqueConstraint(fields=('parent', 'name'), name='storage_unique_child_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='storageunit',
+            constraint=models.UniqueConstraint(condition=models.Q(('parent__isnull', True)), fields=('name',), name='storage_unique_root_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='storageoccupancy',
+            constraint=models.UniqueConstraint(fields=('box', 'row', 'column'), name='storage_unique_position'),
+        ),
+    ]
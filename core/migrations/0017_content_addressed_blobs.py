@@ -0,0 +1,72 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:06
+
+import os
+
+import core.models.samples.sample_files
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_names(apps, schema_editor):
+    """
+    Anexos existentes: nome original e caminho lógico a partir do
+    caminho físico atual (a conversão para blobs é feita depois, pelo
+    comando `blobs --convert`).
+    """
+    SampleFile = apps.get_model("core", "SampleFile")
+
+    batch = []
+    for sample_file in SampleFile.objects.only("id", "file").iterator(chunk_size=1000):
+        sample_file.name = os.path.basename(sample_file.file.name)[:255]
+        sample_file.logical_path = sample_file.file.name
+        batch.append(sample_file)
+        if len(batch) >= 1000:
+            SampleFile.objects.bulk_update(batch, ["name", "logical_path"])
+            batch = []
+    if batch:
+        SampleFile.objects.bulk_update(batch, ["name", "logical_path"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_sample_file_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='samplefile',
+            name='logical_path',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='samplefile',
+            name='name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='samplefile',
+            name='file',
+            field=models.FileField(max_length=500, upload_to=core.models.samples.sample_files.sample_file_upload_to),
+        ),
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('size', models.BigIntegerField()),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('refcount', 0)), fields=['updated_at'], name='blob_orphan_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='samplefile',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='sample_files', to='core.blob'),
+        ),
+        migrations.RunPython(backfill_names, migrations.RunPython.noop),
+    ]
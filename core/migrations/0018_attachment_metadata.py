@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_content_addressed_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('kind', models.CharField(choices=[('sequence', 'Estatísticas de sequência')], max_length=20)),
+                ('status', models.CharField(choices=[('ready', 'Pronto'), ('failed', 'Falhou')], default='ready', max_length=10)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('content_hash', 'kind'), name='attachment_metadata_unique_hash')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_attachment_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attachmentmetadata',
+            name='kind',
+            field=models.CharField(choices=[('sequence', 'Estatísticas de sequência'), ('image', 'Prévias de imagem')], max_length=20),
+        ),
+    ]
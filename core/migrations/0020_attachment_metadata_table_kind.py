@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_attachment_metadata_image_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attachmentmetadata',
+            name='kind',
+            field=models.CharField(choices=[('sequence', 'Estatísticas de sequência'), ('image', 'Prévias de imagem'), ('table', 'Resumo de tabela')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_attachment_metadata_table_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attachmentmetadata',
+            name='kind',
+            field=models.CharField(choices=[('sequence', 'Estatísticas de sequência'), ('image', 'Prévias de imagem'), ('table', 'Resumo de tabela'), ('index', 'Índice de sequência')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,151 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:30
+
+import struct
+import zlib
+
+import numpy as np
+from django.db import migrations, models
+
+
+# Formato de packed_data nesta migração (cópia congelada do que era
+# core.services.sequence_packing: mudanças posteriores no serviço não
+# alteram o resultado da migração)
+TWO_BIT = "2bit"
+ZLIB = "zlib"
+ZLIB_LEVEL = 6
+
+# A=0 C=1 G=2 T=3; qualquer outro byte é exceção
+_BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+_CODES = np.full(256, 255, dtype=np.uint8)
+_CODES[_BASES] = np.arange(4, dtype=np.uint8)
+
+
+def _clean_residues(text):
+    """Resíduos em maiúsculas, sem espaços, quebras de linha e cabeçalhos ">" """
+    lines = (line for line in text.splitlines() if not line.lstrip().startswith(">"))
+    return "".join("".join(lines).split()).upper().encode("ascii", "replace")
+
+
+def _pack_2bit(residues):
+    """
+    Bases em 2 bits, 4 por byte (a primeira nos bits altos); o que não é
+    A/C/G/T vira 0 e entra nas exceções em corridas (início, tamanho, letra).
+    """
+    data = np.frombuffer(residues, dtype=np.uint8)
+    codes = _CODES[data]
+    unknown = codes == 255
+    positions = np.flatnonzero(unknown)
+    codes[unknown] = 0
+
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    packed = (padded.reshape(-1, 4) << _SHIFTS).sum(axis=1, dtype=np.uint8).tobytes()
+
+    if not len(positions):
+        return packed, b""
+    letters = data[positions]
+    breaks = np.flatnonzero((np.diff(positions) != 1) | (np.diff(letters) != 0)) + 1
+    starts = positions[np.r_[0, breaks]]
+    ends = positions[np.r_[breaks - 1, len(positions) - 1]] + 1
+    exceptions = zlib.compress(
+        struct.pack("<I", len(starts))
+        + starts.astype("<u4").tobytes()
+        + (ends - starts).astype("<u4").tobytes()
+        + letters[np.r_[0, breaks]].tobytes(),
+        ZLIB_LEVEL,
+    )
+    return packed, exceptions
+
+
+def _pack_sequence(seq_type, text):
+    """(encoding, comprimento, packed_data, exceptions)"""
+    if seq_type == "PDB":
+        raw = text.encode("utf-8")
+        return ZLIB, len(raw), zlib.compress(raw, ZLIB_LEVEL), b""
+
+    residues = _clean_residues(text)
+    if seq_type == "DNA":
+        packed, exceptions = _pack_2bit(residues)
+        return TWO_BIT, len(residues), packed, exceptions
+    return ZLIB, len(residues), zlib.compress(residues, ZLIB_LEVEL), b""
+
+
+def _unpack_text(encoding, length, packed, exceptions):
+    """packed_data → texto inteiro"""
+    if encoding != TWO_BIT:
+        return zlib.decompress(packed).decode("utf-8")
+
+    codes = (np.frombuffer(packed, dtype=np.uint8)[:, None] >> _SHIFTS) & 3
+    residues = _BASES[codes.ravel()[:length]]
+    if exceptions:
+        raw = zlib.decompress(exceptions)
+        (count,) = struct.unpack_from("<I", raw)
+        starts = np.frombuffer(raw, dtype="<u4", count=count, offset=4)
+        lengths = np.frombuffer(raw, dtype="<u4", count=count, offset=4 + 4 * count)
+        letters = raw[4 + 8 * count:]
+        for start, size, letter in zip(starts.tolist(), lengths.tolist(), letters):
+            residues[start:start + size] = letter
+    return residues.tobytes().decode("ascii")
+
+
+def pack_existing(apps, schema_editor):
+    """Texto de sequence_data → packed_data (uma linha por vez: genomas são grandes)"""
+    MolecularSequence = apps.get_model("core", "MolecularSequence")
+
+    for pk in MolecularSequence.objects.values_list("pk", flat=True):
+        row = MolecularSequence.objects.only("seq_type", "sequence_data").get(pk=pk)
+        encoding, length, packed, exceptions = _pack_sequence(row.seq_type, row.sequence_data)
+        MolecularSequence.objects.filter(pk=pk).update(
+            encoding=encoding, length=length, packed_data=packed, exceptions=exceptions,
+        )
+
+
+def unpack_existing(apps, schema_editor):
+    MolecularSequence = apps.get_model("core", "MolecularSequence")
+
+    for pk in MolecularSequence.objects.values_list("pk", flat=True):
+        row = MolecularSequence.objects.only("encoding", "length", "packed_data", "exceptions").get(pk=pk)
+        text = _unpack_text(row.encoding, row.length, bytes(row.packed_data), bytes(row.exceptions))
+        MolecularSequence.objects.filter(pk=pk).update(sequence_data=text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_attachment_metadata_index_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='molecularsequence',
+            name='encoding',
+            field=models.CharField(choices=[('2bit', '2 bits por base'), ('zlib', 'zlib')], default='zlib', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='molecularsequence',
+            name='exceptions',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+        migrations.AddField(
+            model_name='molecularsequence',
+            name='length',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='molecularsequence',
+            name='packed_data',
+            field=models.BinaryField(default=b''),
+        ),
+        # Default só para a volta (RemoveField desfeito recria a coluna)
+        migrations.AlterField(
+            model_name='molecularsequence',
+            name='sequence_data',
+            field=models.TextField(default=''),
+        ),
+        migrations.RunPython(pack_existing, unpack_existing),
+        migrations.RemoveField(
+            model_name='molecularsequence',
+            name='sequence_data',
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:34
+
+import hashlib
+import struct
+import zlib
+
+import numpy as np
+from django.db import migrations, models
+
+
+# Formato de packed_data de 0022 (cópia congelada do que era
+# core.services.sequence_packing: mudanças posteriores no serviço não
+# alteram o resultado da migração)
+TWO_BIT = "2bit"
+
+# A=0 C=1 G=2 T=3; qualquer outro byte é exceção
+_BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+
+
+def _unpack_text(encoding, length, packed, exceptions):
+    """packed_data → texto inteiro"""
+    if encoding != TWO_BIT:
+        return zlib.decompress(packed).decode("utf-8")
+
+    codes = (np.frombuffer(packed, dtype=np.uint8)[:, None] >> _SHIFTS) & 3
+    residues = _BASES[codes.ravel()[:length]]
+    if exceptions:
+        raw = zlib.decompress(exceptions)
+        (count,) = struct.unpack_from("<I", raw)
+        starts = np.frombuffer(raw, dtype="<u4", count=count, offset=4)
+        lengths = np.frombuffer(raw, dtype="<u4", count=count, offset=4 + 4 * count)
+        letters = raw[4 + 8 * count:]
+        for start, size, letter in zip(starts.tolist(), lengths.tolist(), letters):
+            residues[start:start + size] = letter
+    return residues.tobytes().decode("ascii")
+
+
+def backfill_hashes(apps, schema_editor):
+    """
+    Hash do conteúdo de cada linha. Cópias idênticas (mesmo tipo) já
+    cadastradas ficam sem hash: só a mais antiga entra na constraint
+    única de 0024, e nenhuma linha é apagada.
+    """
+    MolecularSequence = apps.get_model("core", "MolecularSequence")
+
+    seen = set()
+    for pk, seq_type in MolecularSequence.objects.order_by("pk").values_list("pk", "seq_type"):
+        row = MolecularSequence.objects.only("encoding", "length", "packed_data", "exceptions").get(pk=pk)
+        text = _unpack_text(row.encoding, row.length, bytes(row.packed_data), bytes(row.exceptions))
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if (seq_type, content_hash) in seen:
+            continue
+        seen.add((seq_type, content_hash))
+        MolecularSequence.objects.filter(pk=pk).update(sequence_hash=content_hash)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_molecular_sequence_packed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='molecularsequence',
+            name='sequence_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_hashes, migrations.RunPython.noop),
+    ]
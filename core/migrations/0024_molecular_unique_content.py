@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_molecular_sequence_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # O índice único (seq_type, sequence_hash) substitui o índice simples
+        migrations.AlterField(
+            model_name='molecularsequence',
+            name='sequence_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='molecularsequence',
+            constraint=models.UniqueConstraint(condition=models.Q(('sequence_hash', ''), _negated=True), fields=('seq_type', 'sequence_hash'), name='molecular_unique_content'),
+        ),
+    ]
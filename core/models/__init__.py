@@ -5,11 +5,17 @@ from .biobanks.biobank import Biobank
 from .biobanks.biobank_user_role import BiobankUserRole
 from .collections.collection import Collection
 from .collections.collection_user_role import CollectionUserRole
+from .collections.effective_access import EffectiveAccess
 from .samples.sample import Sample
+from .samples.blobs import Blob
 from .samples.sample_files import SampleFile
+from .samples.uploads import SampleFileUpload
+from .samples.metadata import AttachmentMetadata
 
 # Novos Sub-pacotes (Organizados)
 from .tags.model import Tag
 from .keywords.model import Keyword, KeywordValue
 from .events.model import Event
-from .research_groups.model import ResearchGroup
\ No newline at end of file
+from .research_groups.model import ResearchGroup
+from .storage import StorageUnit, StorageOccupancy
+from .jobs import Job, JobLog
@@ -4,6 +4,7 @@ from django.contrib.auth.models import User
 # Importação direta dos módulos para evitar loop circular
 from core.models.tags.model import Tag
 from core.models.keywords.model import KeywordValue
+from core.models.biobanks.managers import BiobankQuerySet
 
 class Biobank(models.Model):
     """
@@ -92,6 +93,11 @@ class Biobank(models.Model):
         related_name="biobanks",
     )
 
+    # =========================
+    # MANAGERS
+    # =========================
+    objects = BiobankQuerySet.as_manager()
+
     # =========================
     # REPRESENTAÇÃO
     # =========================
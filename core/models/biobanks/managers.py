@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class BiobankQuerySet(models.QuerySet):
+
+    def visible_to(self, user):
+        """
+        Biobanks que o usuário pode visualizar (mesmas regras de
+        core.permissions.biobanks.can_view_biobank, avaliadas no banco).
+        """
+        from core.permissions.queries import biobank_visibility_q
+        return self.filter(biobank_visibility_q(user))
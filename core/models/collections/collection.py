@@ -5,6 +5,7 @@ from django.contrib.auth.models import User
 from core.models.biobanks.biobank import Biobank
 from core.models.tags import Tag
 from core.models.keywords import KeywordValue
+from core.models.collections.managers import CollectionQuerySet
 
 
 class Collection(models.Model):
@@ -89,6 +90,11 @@ class Collection(models.Model):
         blank=True,
     )
 
+    # =========================
+    # MANAGERS
+    # =========================
+    objects = CollectionQuerySet.as_manager()
+
     # =========================
     # REPRESENTAÇÃO
     # =========================
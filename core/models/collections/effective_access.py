@@ -0,0 +1,54 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class EffectiveAccess(models.Model):
+    """
+    Acesso efetivo (desnormalizado) de um usuário a uma Collection.
+
+    Materializa a herança de papéis (Collection + Biobank) calculada por
+    core.permissions.index.PermissionIndex para permitir JOIN direto em
+    listagens de Samples. Mantida incrementalmente pelos signals de ACL
+    e reconstruída com `manage.py rebuild_effective_access`.
+
+    Admin técnico e visibilidade pública não dependem desta tabela.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="effective_access",
+    )
+
+    collection = models.ForeignKey(
+        "core.Collection",
+        on_delete=models.CASCADE,
+        related_name="effective_access",
+    )
+
+    can_view = models.BooleanField(default=False)
+    can_edit = models.BooleanField(default=False)
+    can_manage = models.BooleanField(default=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "collection")
+        indexes = [
+            models.Index(
+                fields=["user", "can_view", "collection"],
+                name="effaccess_user_view_idx",
+            ),
+        ]
+        verbose_name = "Acesso Efetivo"
+        verbose_name_plural = "Acessos Efetivos"
+
+    def __str__(self):
+        flags = "".join(
+            flag for flag, on in (
+                ("v", self.can_view),
+                ("e", self.can_edit),
+                ("m", self.can_manage),
+            ) if on
+        )
+        return f"{self.user_id} → {self.collection_id} ({flags or '-'})"
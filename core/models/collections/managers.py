@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class CollectionQuerySet(models.QuerySet):
+
+    def visible_to(self, user):
+        """
+        Collections que o usuário pode visualizar (mesmas regras de
+        core.permissions.collections.can_view_collection, avaliadas no banco).
+        """
+        from core.permissions.queries import collection_visibility_q
+        return self.filter(collection_visibility_q(user))
@@ -0,0 +1,60 @@
+from django.db import models
+from django.db.models import ExpressionList, Func, OrderBy
+from django.db.models.indexes import IndexExpression
+from django.db.models.sql import Query
+
+
+class PatternOps(Func):
+    """
+    Índice com varchar_pattern_ops no PostgreSQL: só assim um btree
+    atende LIKE 'abc%' (istartswith vira UPPER(col) LIKE UPPER(...))
+    fora da collation "C". Nos outros bancos vira só a expressão.
+
+    Mesmo papel do OpClass de django.contrib.postgres, que exige o
+    psycopg instalado. Só funciona dentro de um PatternOpsIndex.
+    """
+    template = "%(expressions)s varchar_pattern_ops"
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return compiler.compile(self.source_expressions[0])
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, **extra_context)
+
+
+class PatternOpsIndex(models.Index):
+    """
+    Index por expressão que aceita PatternOps no topo, fora dos
+    parênteses da expressão indexada (como o OpClass).
+
+    O contrib.postgres faz isso com IndexExpression.register_wrappers,
+    que troca os wrappers de todos os índices do processo; aqui os
+    wrappers extras valem só para as expressões deste índice.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if not self.expressions:
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+        index_expressions = []
+        for expression in self.expressions:
+            index_expression = IndexExpression(expression)
+            index_expression.set_wrapper_classes(schema_editor.connection)
+            # Mesma ordem do contrib.postgres: (expr) COLLATE x opclass DESC
+            index_expression.wrapper_classes = (OrderBy, PatternOps) + tuple(
+                wrapper for wrapper in index_expression.wrapper_classes if wrapper is not OrderBy
+            )
+            index_expressions.append(index_expression)
+        expressions = ExpressionList(*index_expressions).resolve_expression(
+            Query(model, alias_cols=False),
+        )
+        return schema_editor._create_index_sql(
+            model,
+            name=self.name,
+            using=using,
+            db_tablespace=self.db_tablespace,
+            condition=self._get_condition_sql(model, schema_editor),
+            include=[model._meta.get_field(name).column for name in self.include],
+            expressions=expressions,
+            **kwargs,
+        )
@@ -0,0 +1,113 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Tarefa em segundo plano (fila no próprio banco, sem broker externo).
+
+    Criada por core.services.jobs.enqueue() e executada por
+    `manage.py runworker`. O worker reivindica a linha com um UPDATE
+    condicional (status=queued → running), o que dispensa locks e
+    funciona em SQLite e PostgreSQL.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    STATUS_CHOICES = [
+        (QUEUED, "Na fila"),
+        (RUNNING, "Em execução"),
+        (SUCCEEDED, "Concluída"),
+        (FAILED, "Falhou"),
+        (CANCELLED, "Cancelada"),
+    ]
+
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+    # Nome registrado com @task (ex.: "benchling.sync")
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    priority = models.SmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    # Tentativas (retry com backoff exponencial)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+
+    # Progresso reportado pela tarefa
+    progress_current = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(null=True, blank=True)
+    message = models.CharField(max_length=255, blank=True, default="")
+
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    cancel_requested = models.BooleanField(default=False)
+
+    # Execução
+    worker = models.CharField(max_length=100, blank=True, default="")
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # Reivindicação: fila por prioridade e horário liberado
+            models.Index(fields=["status", "-priority", "run_after"], name="job_claim_idx"),
+            # Detecção de workers mortos (heartbeat antigo)
+            models.Index(fields=["status", "heartbeat_at"], name="job_heartbeat_idx"),
+        ]
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED
+
+    @property
+    def percent(self):
+        if not self.progress_total:
+            return None
+        return round(100 * min(self.progress_current, self.progress_total) / self.progress_total, 1)
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} ({self.get_status_display()})"
+
+
+class JobLog(models.Model):
+    """
+    Linha de log de uma tarefa (visível no polling e no admin).
+    """
+
+    LEVEL_CHOICES = [
+        ("info", "Info"),
+        ("warning", "Aviso"),
+        ("error", "Erro"),
+    ]
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="logs")
+    timestamp = models.DateTimeField(default=timezone.now)
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES, default="info")
+    message = models.TextField()
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"#{self.job_id} [{self.level}] {self.message[:60]}"
@@ -19,6 +19,15 @@ class KeywordValue(models.Model):
     # collection = models.ForeignKey(...)
     # biobank = models.ForeignKey(...)
 
+    class Meta:
+        # Garante a resolução idempotente (bulk_create com ignore_conflicts)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["keyword", "value"],
+                name="keywordvalue_unique_pair",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.keyword.name}: {self.value}"
 
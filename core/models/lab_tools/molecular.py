@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Substr
 from django.conf import settings
 
 
@@ -6,6 +7,11 @@ class MolecularSequence(models.Model):
     """
     Armazena sequências (FASTA) ou estruturas (PDB).
     Agora parte do app Core.
+
+    O conteúdo fica compactado em `packed_data` (ver
+    core.services.sequence_packing): DNA em 2 bits por base, com as
+    letras IUPAC / N em `exceptions`; proteína e PDB com zlib. Janelas
+    de DNA são lidas do banco com SUBSTR, sem carregar o genoma inteiro.
     """
     TYPE_CHOICES = (
         ('DNA', 'Sequência DNA (FASTA)'),
@@ -13,16 +19,102 @@ class MolecularSequence(models.Model):
         ('PDB', 'Estrutura 3D (PDB)'),
     )
 
+    ENCODING_CHOICES = (
+        ('2bit', '2 bits por base'),
+        ('zlib', 'zlib'),
+    )
+
     name = models.CharField(max_length=255)
     seq_type = models.CharField(max_length=10, choices=TYPE_CHOICES, default='PDB')
-    sequence_data = models.TextField()
     description = models.TextField(blank=True)
 
+    # Resíduos (DNA / proteína) ou bytes do arquivo (PDB)
+    length = models.PositiveBigIntegerField(default=0)
+    encoding = models.CharField(max_length=10, choices=ENCODING_CHOICES, default='zlib')
+    packed_data = models.BinaryField(default=b'')
+    exceptions = models.BinaryField(default=b'', blank=True)
+
+    # SHA-256 do conteúdo normalizado: deduplicação na importação FASTA.
+    # Único por tipo; vazio só em cópias antigas (ver migração 0023)
+    sequence_hash = models.CharField(max_length=64, blank=True, default='')
+
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Campos binários: fora das listagens (.defer / .only)
+    PACKED_FIELDS = ('packed_data', 'exceptions')
+
     class Meta:
         verbose_name = "Molecular Sequence"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["seq_type", "sequence_hash"],
+                condition=~models.Q(sequence_hash=""),
+                name="molecular_unique_content",
+            ),
+        ]
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    # =========================
+    # CONTEÚDO
+    # =========================
+    def set_sequence(self, text: str):
+        from core.services.sequence_packing import content_bytes
+
+        self.set_content(content_bytes(self.seq_type, text))
+
+    def set_content(self, content: bytes):
+        """Conteúdo já normalizado (ver sequence_packing.content_bytes)"""
+        from core.services.sequence_packing import pack_content, sequence_hash
+
+        self.encoding, self.length, self.packed_data, self.exceptions = pack_content(self.seq_type, content)
+        self.sequence_hash = sequence_hash(content)
+        self.__dict__.pop('_text', None)
+
+    def _stored(self, field: str) -> bytes:
+        # Já carregado na instância ou buscado só este campo
+        if field in self.__dict__:
+            value = self.__dict__[field]
+        else:
+            value = type(self).objects.filter(pk=self.pk).values_list(field, flat=True).get()
+        return bytes(value or b'')
+
+    def read(self, start: int = 0, end: int = None) -> str:
+        """
+        Resíduos [start, end) (0-based). Em 2 bits, busca só os bytes
+        da janela (SUBSTR no banco) e decodifica só eles.
+        """
+        from core.services import sequence_packing as packing
+
+        end = self.length if end is None else min(end, self.length)
+        if start >= end:
+            return ''
+        if self.encoding != packing.TWO_BIT:
+            return self.text[start:end]
+
+        first, last = packing.packed_range(start, end)
+        if 'packed_data' in self.__dict__:
+            chunk = bytes(self.packed_data)[first:last]
+        else:
+            chunk = bytes(
+                type(self).objects
+                .filter(pk=self.pk)
+                .annotate(chunk=Substr('packed_data', first + 1, last - first, output_field=models.BinaryField()))
+                .values_list('chunk', flat=True)
+                .get()
+            )
+        exceptions = packing.load_exceptions(self._stored('exceptions'))
+        return packing.unpack_2bit(chunk, first, start, end, exceptions)
+
+    @property
+    def text(self) -> str:
+        """Conteúdo inteiro (PDB para o 3Dmol, exportação)"""
+        from core.services.sequence_packing import unpack_text
+
+        if not hasattr(self, '_text'):
+            self._text = unpack_text(
+                self.encoding, self.length, self._stored('packed_data'), self._stored('exceptions'),
+            )
+        return self._text
@@ -0,0 +1,48 @@
+import os
+
+from django.core.files.storage import default_storage
+from django.db import models
+from django.db.models import Q
+
+
+BLOB_ROOT = "blobs"
+
+
+def blob_storage_name(sha256: str) -> str:
+    """blobs/ab/cd/abcd... (dois níveis para não lotar um diretório)"""
+    return os.path.join(BLOB_ROOT, sha256[:2], sha256[2:4], sha256)
+
+
+class Blob(models.Model):
+    """
+    Conteúdo de anexo armazenado uma única vez, endereçado pelo SHA-256.
+
+    Vários SampleFile (mesmo gel / FASTA de referência em amostras
+    diferentes) apontam para o mesmo Blob; `refcount` conta essas
+    referências e o arquivo só é removido quando chega a zero
+    (ver core.services.blobs).
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Coleta de lixo: só os órfãos
+            models.Index(fields=["updated_at"], condition=Q(refcount=0), name="blob_orphan_idx"),
+        ]
+
+    @property
+    def storage_name(self) -> str:
+        return blob_storage_name(self.sha256)
+
+    @property
+    def path(self) -> str:
+        return default_storage.path(self.storage_name)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} bytes, {self.refcount} refs)"
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class SampleQuerySet(models.QuerySet):
+
+    def visible_to(self, user):
+        """
+        Samples que o usuário pode visualizar (mesmas regras de
+        core.permissions.samples.can_view_sample, avaliadas no banco).
+        """
+        from core.permissions.queries import sample_visibility_q
+        return self.filter(sample_visibility_q(user))
+
+    def editable_by(self, user):
+        """
+        Samples que o usuário pode editar (regras de
+        core.permissions.samples.can_edit_sample, avaliadas no banco).
+        """
+        from core.permissions.queries import sample_edit_q
+        return self.filter(sample_edit_q(user))
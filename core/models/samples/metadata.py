@@ -0,0 +1,51 @@
+from django.db import models
+
+
+class AttachmentMetadata(models.Model):
+    """
+    Metadados extraídos do conteúdo de um anexo (contagem de sequências,
+    N50, GC%; dimensões e pirâmide de imagens; tipos e faixas das
+    colunas de tabelas; índice de acesso aleatório de FASTA/FASTQ),
+    guardados por SHA-256: o mesmo conteúdo em
+    amostras diferentes é processado uma única vez (ver
+    core.services.sequence_metadata / sequence_index / image_previews /
+    table_previews).
+    """
+
+    SEQUENCE = "sequence"
+    IMAGE = "image"
+    TABLE = "table"
+    INDEX = "index"
+    KIND_CHOICES = [
+        (SEQUENCE, "Estatísticas de sequência"),
+        (IMAGE, "Prévias de imagem"),
+        (TABLE, "Resumo de tabela"),
+        (INDEX, "Índice de sequência"),
+    ]
+
+    READY = "ready"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (READY, "Pronto"),
+        (FAILED, "Falhou"),
+    ]
+
+    content_hash = models.CharField(max_length=64)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=READY)
+    data = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_hash", "kind"],
+                name="attachment_metadata_unique_hash",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.content_hash[:12]} ({self.status})"
@@ -1,12 +1,15 @@
 import uuid
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models.functions import Upper
 
 # Imports mantidos para integridade
 from core.models.collections.collection import Collection
 from core.models.biobanks.biobank import Biobank
 from core.models.tags import Tag
 from core.models.keywords import KeywordValue
+from core.models.expressions import PatternOps, PatternOpsIndex
+from core.models.samples.managers import SampleQuerySet
 
 class Sample(models.Model):
     """
@@ -59,14 +62,100 @@ class Sample(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SampleQuerySet.as_manager()
+
+    # Campos com histórico (Event) rastreado sem re-leitura do banco:
+    # o valor carregado fica em _tracked_snapshot (from_db / save) e é
+    # comparado em memória pelo signal track_sample_history
+    TRACKED_FIELDS = ("storage_location", "status")
+
+    # Definem a pasta dos anexos: só quando mudam o save() os reetiqueta
+    HIERARCHY_FIELDS = ("collection_id", "biobank_id")
+
+    class Meta:
+        # Índices compostos para a listagem paginada por cursor
+        # (ordem -created_at, -id) com filtros no servidor
+        indexes = [
+            models.Index(fields=["is_active", "-created_at", "-id"], name="sample_active_created_idx"),
+            models.Index(fields=["status", "-created_at", "-id"], name="sample_status_created_idx"),
+            models.Index(fields=["collection", "-created_at", "-id"], name="sample_coll_created_idx"),
+            models.Index(fields=["biobank", "-created_at", "-id"], name="sample_biobank_created_idx"),
+            # Filtro por organismo: organism_name__istartswith
+            PatternOpsIndex(PatternOps(Upper("organism_name")), name="sample_organism_idx"),
+        ]
+
     def save(self, *args, **kwargs):
-        from core.models.samples.sample_files import move_sample_files
+        from core.models.samples.sample_files import relabel_sample_files
+        from core.services.file_relocation import misplaced_files
+        from core.services.jobs import enqueue
         
         # Herança de Biobank via Collection
-        if self.collection:
-            self.biobank = self.collection.biobank
+        if self.collection_id:
+            self.biobank_id = self.collection.biobank_id
 
+        update_fields = kwargs.get("update_fields")
+        moved = (
+            not self._state.adding
+            and (update_fields is None or {"collection", "collection_id"} & set(update_fields))
+            and self.hierarchy_changed()
+        )
         super().save(*args, **kwargs)
+        self._snapshot_tracked()
+
+        if moved:
+            # Anexos em blob: trocar de coleção só reescreve o caminho lógico
+            relabel_sample_files(self)
+
+            # Anexos antigos (caminho por amostra): movidos em segundo plano
+            if misplaced_files(self).exists():
+                enqueue("samples.move_files", unique=True, sample_id=self.pk)
+
+    # =========================
+    # RASTREIO DE ALTERAÇÕES
+    # =========================
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked()
+        return instance
+
+    def _snapshot_tracked(self):
+        # Campos deferidos ficam fora do snapshot (não há valor conhecido)
+        self._tracked_snapshot = {
+            f: self.__dict__[f] for f in self.TRACKED_FIELDS + self.HIERARCHY_FIELDS if f in self.__dict__
+        }
+
+    def hierarchy_changed(self) -> bool:
+        """
+        Coleção / biobanco diferentes dos carregados (pasta dos anexos
+        mudou). Sem snapshot (instância não carregada do banco), uma query.
+        """
+        snapshot = getattr(self, "_tracked_snapshot", {})
+        if all(f in snapshot for f in self.HIERARCHY_FIELDS):
+            loaded = tuple(snapshot[f] for f in self.HIERARCHY_FIELDS)
+        else:
+            loaded = type(self)._base_manager.filter(pk=self.pk).values_list(*self.HIERARCHY_FIELDS).first()
+        return loaded != tuple(getattr(self, f) for f in self.HIERARCHY_FIELDS)
+
+    def tracked_changes(self, fields=None) -> dict:
+        """
+        {campo: (antigo, novo)} dos campos rastreados alterados desde a
+        carga. Campos ausentes do snapshot (deferidos ou instância não
+        carregada do banco) são lidos com uma única query.
+        """
+        fields = [f for f in self.TRACKED_FIELDS if fields is None or f in fields]
+        snapshot = dict(getattr(self, "_tracked_snapshot", {}))
+
+        unknown = [f for f in fields if f not in snapshot]
+        if unknown and self.pk:
+            row = type(self)._base_manager.filter(pk=self.pk).values(*unknown).first()
+            snapshot.update(row or {})
+
+        return {
+            f: (snapshot[f], getattr(self, f))
+            for f in fields
+            if f in snapshot and snapshot[f] != getattr(self, f)
+        }
 
     def __str__(self):
         return f"{self.sample_id} ({self.get_status_display()})"
\ No newline at end of file
@@ -1,12 +1,35 @@
+import hashlib
 import os
-import shutil
 import mimetypes
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat
 from django.utils.text import slugify
-from django.conf import settings
 
 # Import relativo dentro do mesmo pacote (samples)
 from .sample import Sample
+from .blobs import Blob
+
+def file_sha256(f) -> str:
+    """SHA-256 de um File do Django, lido em blocos (memória constante)"""
+    digest = hashlib.sha256()
+    for block in f.chunks():
+        digest.update(block)
+    return digest.hexdigest()
+
+# Formatos de sequência reconhecidos (extensão → formato do Biopython)
+SEQUENCE_FORMATS = {
+    ".fasta": "fasta", ".fa": "fasta", ".fna": "fasta", ".faa": "fasta",
+    ".fastq": "fastq", ".fq": "fastq",
+    ".gb": "genbank", ".gbk": "genbank", ".genbank": "genbank",
+}
+
+def split_extension(filename):
+    """('.fastq', True) para 'reads.fastq.gz': extensão real + se é gzip"""
+    base, ext = os.path.splitext(filename.lower())
+    if ext == ".gz":
+        return os.path.splitext(base)[1], True
+    return ext, False
 
 def sample_file_upload_to(instance, filename):
     sample = instance.sample
@@ -32,57 +55,101 @@ class SampleFile(models.Model):
         related_name="files",
     )
 
-    file = models.FileField(upload_to=sample_file_upload_to)
+    # Arquivo físico: o blob (conteúdo deduplicado, blobs/ab/cd/<sha256>)
+    # ou, em anexos antigos ainda não convertidos, o caminho por amostra
+    file = models.FileField(upload_to=sample_file_upload_to, max_length=500)
+    blob = models.ForeignKey(
+        Blob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="sample_files",
+    )
+
+    # Nome original e caminho lógico biobank/collection/sample/nome
+    # (relocar a amostra só altera este campo)
+    name = models.CharField(max_length=255, blank=True, default="")
+    logical_path = models.CharField(max_length=500, blank=True, default="", db_index=True)
+
     description = models.TextField(blank=True, null=True)
     
     # Metadados para o Visualizador
     mime_type = models.CharField(max_length=100, blank=True, null=True)
     file_size = models.BigIntegerField(blank=True, null=True)
     category = models.CharField(max_length=20, choices=VIEW_CATEGORIES, default='raw')
+
+    # Checksum do conteúdo (upload em partes já informa; senão é calculado)
+    sha256 = models.CharField(max_length=64, blank=True, default="", db_index=True)
     
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    @property
+    def display_name(self) -> str:
+        return self.name or os.path.basename(self.file.name)
+
+    def detect_metadata(self):
+        """Tamanho, MIME e categoria do visualizador a partir do arquivo"""
+        self.file_size = self.blob.size if self.blob_id else self.file.size
+        guess, _ = mimetypes.guess_type(self.display_name)
+        self.mime_type = guess
+
+        ext, _ = split_extension(self.display_name)
+        if ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff']:
+            self.category = 'image'
+        elif ext in ['.csv', '.tsv', '.xlsx', '.xls']:
+            self.category = 'table'
+        elif ext in SEQUENCE_FORMATS:
+            self.category = 'sequence'
+        elif ext == '.pdf':
+            self.category = 'pdf'
+
     def save(self, *args, **kwargs):
+        from core.services.blobs import store_file
+
+        # Upload novo: o conteúdo vai para o armazenamento por hash
+        # (store_file já conta a referência no Blob)
+        if self.file and not self.file._committed:
+            self.name = self.name or os.path.basename(self.file.name)
+            self.blob = store_file(self.file)
+            self.file.name = self.blob.storage_name
+            self.file._committed = True
+
+        if self.blob_id:
+            self.sha256 = self.blob.sha256
+            self.file.name = self.blob.storage_name
+
         # Auto-detecta metadados antes de salvar
         if self.file:
-            self.file_size = self.file.size
-            guess, _ = mimetypes.guess_type(self.file.name)
-            self.mime_type = guess
-            
-            ext = os.path.splitext(self.file.name)[1].lower()
-            if ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff']:
-                self.category = 'image'
-            elif ext in ['.csv', '.xlsx', '.xls']:
-                self.category = 'table'
-            elif ext in ['.fasta', '.fastq', '.gb']:
-                self.category = 'sequence'
-            elif ext == '.pdf':
-                self.category = 'pdf'
+            self.detect_metadata()
+            if not self.sha256:
+                self.sha256 = file_sha256(self.file)
+
+        self.logical_path = sample_file_upload_to(self, self.display_name)
         
         super().save(*args, **kwargs)
 
+        # Estatísticas / prévias: geradas em segundo plano (por hash)
+        if self.category == 'sequence':
+            from core.services.sequence_metadata import request_sequence_metadata
+            request_sequence_metadata(self)
+            from core.services.sequence_index import request_sequence_index
+            request_sequence_index(self)
+        elif self.category == 'image':
+            from core.services.image_previews import request_image_preview
+            request_image_preview(self)
+        elif self.category == 'table':
+            from core.services.table_previews import request_table_summary
+            request_table_summary(self)
+
     def __str__(self):
         return f"File for {self.sample.sample_id} ({self.category})"
 
-def move_sample_files(sample):
-    """Lógica de movimentação física de arquivos ao associar coleção"""
-    if not sample.collection or not sample.biobank:
-        return
-
-    old_base = os.path.join(settings.MEDIA_ROOT, "_unassigned_samples", slugify(sample.sample_id))
-    if not os.path.exists(old_base):
-        return
-
-    new_base = os.path.join(
-        settings.MEDIA_ROOT,
-        slugify(sample.biobank.name),
-        slugify(sample.collection.name),
-        slugify(sample.sample_id),
+def relabel_sample_files(sample):
+    """Atualiza o caminho lógico dos anexos (um UPDATE, sem tocar nos blobs)"""
+    prefix = sample_file_upload_to(SampleFile(sample=sample), "")
+    return (
+        SampleFile.objects
+        .filter(sample=sample, blob__isnull=False)
+        .exclude(logical_path__startswith=prefix)
+        .update(logical_path=Concat(Value(prefix), F("name")))
     )
-
-    os.makedirs(new_base, exist_ok=True)
-    for filename in os.listdir(old_base):
-        shutil.move(os.path.join(old_base, filename), os.path.join(new_base, filename))
-
-    if not os.listdir(old_base):
-        os.rmdir(old_base)
\ No newline at end of file
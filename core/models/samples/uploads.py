@@ -0,0 +1,84 @@
+import os
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.db import models
+
+from .blobs import BLOB_ROOT
+from .sample import Sample
+from .sample_files import SampleFile
+
+
+class SampleFileUpload(models.Model):
+    """
+    Upload em partes (retomável) de um SampleFile grande.
+
+    Os bytes vão direto para um ".part" no diretório temporário dos
+    blobs; o SampleFile só é criado quando todos os bytes chegaram e o
+    SHA-256 (calculado incrementalmente) confere. Ver
+    core.services.uploads.
+    """
+
+    PENDING = "pending"
+    COMPLETE = "complete"
+    FAILED = "failed"
+    ABORTED = "aborted"
+
+    STATUS_CHOICES = [
+        (PENDING, "Em andamento"),
+        (COMPLETE, "Concluído"),
+        (FAILED, "Falhou (verificação)"),
+        (ABORTED, "Cancelado"),
+    ]
+
+    PART_SUFFIX = ".part"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sample = models.ForeignKey(Sample, on_delete=models.CASCADE, related_name="uploads")
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="sample_uploads")
+
+    filename = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+
+    # Caminho lógico do anexo (biobank/collection/sample/nome)
+    storage_name = models.CharField(max_length=500)
+
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+
+    # Hash informado pelo cliente (opcional) e o calculado no servidor
+    expected_sha256 = models.CharField(max_length=64, blank=True, default="")
+    sha256 = models.CharField(max_length=64, blank=True, default="")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    error = models.CharField(max_length=255, blank=True, default="")
+    sample_file = models.OneToOneField(
+        SampleFile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="upload",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "updated_at"], name="upload_status_updated_idx"),
+        ]
+
+    @property
+    def part_path(self) -> str:
+        # Um ".part" por sessão, no diretório temporário dos blobs
+        # (mesmo sistema de arquivos: publicar é um link, não uma cópia)
+        return default_storage.path(os.path.join(BLOB_ROOT, "tmp", f"{self.pk.hex}{self.PART_SUFFIX}"))
+
+    @property
+    def is_pending(self) -> bool:
+        return self.status == self.PENDING
+
+    def __str__(self):
+        return f"{self.filename} → {self.sample.sample_id} ({self.received}/{self.size})"
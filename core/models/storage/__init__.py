@@ -0,0 +1,2 @@
+from .unit import StorageUnit
+from .occupancy import StorageOccupancy
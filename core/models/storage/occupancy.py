@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from core.models.samples.sample import Sample
+from core.models.storage.unit import StorageUnit
+
+
+def position_label(row: int, column: int) -> str:
+    """
+    (1, 1) → "A1"; linhas além de Z seguem "AA", "AB", ...
+    """
+    letters = ""
+    while row:
+        row, rest = divmod(row - 1, 26)
+        letters = chr(ord("A") + rest) + letters
+    return f"{letters}{column}"
+
+
+class StorageOccupancy(models.Model):
+    """
+    Ocupação de uma posição (linha, coluna) de uma caixa.
+
+    Só as posições ocupadas são gravadas; a restrição única em
+    (box, row, column) impede duas amostras na mesma posição e cada
+    Sample ocupa no máximo uma posição.
+    """
+
+    box = models.ForeignKey(
+        StorageUnit,
+        on_delete=models.PROTECT,
+        related_name="occupancies",
+        limit_choices_to={"kind": StorageUnit.BOX},
+    )
+    row = models.PositiveSmallIntegerField()
+    column = models.PositiveSmallIntegerField()
+
+    sample = models.OneToOneField(
+        Sample,
+        on_delete=models.CASCADE,
+        related_name="storage_position",
+    )
+
+    placed_at = models.DateTimeField(auto_now_add=True)
+    placed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["box", "row", "column"],
+                name="storage_unique_position",
+            ),
+        ]
+        verbose_name = "Ocupação de Posição"
+        verbose_name_plural = "Ocupação de Posições"
+
+    @property
+    def label(self) -> str:
+        return position_label(self.row, self.column)
+
+    def __str__(self):
+        return f"{self.box.path}{StorageUnit.PATH_SEPARATOR}{self.label}"
@@ -0,0 +1,94 @@
+from django.db import models
+from django.db.models import Q
+
+
+class StorageUnit(models.Model):
+    """
+    Nó da hierarquia física de armazenamento:
+    site → freezer → rack → box (caixa com grade de posições).
+
+    `path` materializa o caminho ("Site/Freezer/Rack/Box") para buscas
+    por prefixo sem recursão; é recalculado no save() (inclusive dos
+    descendentes, em caso de renomeação ou mudança de pai).
+    """
+
+    SITE = "site"
+    FREEZER = "freezer"
+    RACK = "rack"
+    BOX = "box"
+
+    KIND_CHOICES = [
+        (SITE, "Site / Laboratório"),
+        (FREEZER, "Freezer / Tanque"),
+        (RACK, "Rack / Prateleira"),
+        (BOX, "Caixa"),
+    ]
+
+    # Nível pai exigido por tipo
+    PARENT_KIND = {
+        FREEZER: SITE,
+        RACK: FREEZER,
+        BOX: RACK,
+    }
+
+    PATH_SEPARATOR = "/"
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    name = models.CharField(max_length=100)
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="children",
+    )
+    path = models.CharField(max_length=500, editable=False, db_index=True)
+
+    # Grade da caixa (apenas kind=box): linhas A.. e colunas 1..
+    rows = models.PositiveSmallIntegerField(null=True, blank=True)
+    columns = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["path"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["parent", "name"],
+                name="storage_unique_child_name",
+            ),
+            models.UniqueConstraint(
+                fields=["name"],
+                condition=Q(parent__isnull=True),
+                name="storage_unique_root_name",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["kind", "path"], name="storage_kind_path_idx"),
+        ]
+        verbose_name = "Unidade de Armazenamento"
+        verbose_name_plural = "Unidades de Armazenamento"
+
+    def build_path(self) -> str:
+        if self.parent_id:
+            return f"{self.parent.path}{self.PATH_SEPARATOR}{self.name}"
+        return self.name
+
+    def save(self, *args, **kwargs):
+        old_path = self.path
+        self.path = self.build_path()
+        super().save(*args, **kwargs)
+
+        # Renomeação / mudança de pai: atualiza o caminho dos descendentes
+        if old_path and old_path != self.path:
+            for child in self.children.all():
+                child.parent = self
+                child.save()
+
+    @property
+    def capacity(self) -> int:
+        return (self.rows or 0) * (self.columns or 0)
+
+    def __str__(self):
+        return self.path or self.name
@@ -0,0 +1,152 @@
+# core/permissions/cache.py
+
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+
+CACHE_ALIAS = "permissions"
+VERSION_KEY = "acl:version"
+
+# Contadores no cache compartilhado (somam todos os workers; no
+# FileBasedCache o incr não é atômico, então são aproximados)
+STATS_KEYS = {name: f"acl:stats:{name}" for name in ("hits", "misses", "invalidations")}
+
+# Versão lida no request corrente (ver request_scope)
+_request_version = ContextVar("acl_request_version", default=None)
+
+
+# ===========================================================
+# HELPERS
+# ===========================================================
+
+def _cache():
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches["default"]
+
+
+def _timeout() -> int:
+    return getattr(settings, "PERMISSION_CACHE_TIMEOUT", 600)
+
+
+def max_decisions() -> int:
+    return getattr(settings, "PERMISSION_CACHE_MAX_DECISIONS", 5000)
+
+
+def _count(name: str):
+    cache, key = _cache(), STATS_KEYS[name]
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Primeiro incremento (ou chave expulsa do cache)
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+# ===========================================================
+# VERSÃO GLOBAL DE ACL
+# ===========================================================
+
+def acl_version() -> str:
+    """
+    Versão atual das ACLs. Toda entrada de cache é indexada por ela,
+    então trocar a versão invalida o cache de todos os usuários.
+
+    Dentro de um request (request_scope) o cache compartilhado é lido
+    uma vez só; fora dele (workers, shell), a cada chamada.
+    """
+    scope = _request_version.get()
+    if scope is not None and scope["version"] is not None:
+        return scope["version"]
+
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+
+    if scope is not None:
+        scope["version"] = version
+    return version
+
+
+def invalidate_permissions():
+    """
+    Invalida as permissões efetivas de todos os usuários.
+    Chamado pelos signals de papéis, Collection e Biobank.
+    """
+    version = uuid.uuid4().hex
+    _cache().set(VERSION_KEY, version, None)
+    _count("invalidations")
+
+    # O próprio request passa a usar a versão nova
+    scope = _request_version.get()
+    if scope is not None:
+        scope["version"] = version
+
+
+@contextmanager
+def request_scope():
+    """
+    Fixa a versão de ACL durante um request (PermissionCacheMiddleware):
+    PermissionIndex.for_user pode ser chamado várias vezes sem ler o
+    cache compartilhado de novo.
+    """
+    token = _request_version.set({"version": None})
+    try:
+        yield
+    finally:
+        _request_version.reset(token)
+
+
+# ===========================================================
+# ENTRADAS POR USUÁRIO
+# ===========================================================
+
+def entry_key(user, version) -> str:
+    """
+    Chave da entrada do usuário. O flag de admin técnico entra na chave
+    para que promover/rebaixar staff não reaproveite decisões antigas.
+    """
+    is_admin = int(user.is_superuser or user.is_staff)
+    return f"acl:{version}:{user.pk}:{is_admin}"
+
+
+def load_entry(key: str):
+    """
+    Retorna a entrada em cache do usuário ({"biobank_roles",
+    "collection_roles", "decisions"}) ou None.
+    """
+    entry = _cache().get(key)
+    _count("hits" if entry is not None else "misses")
+    return entry
+
+
+def store_entry(key: str, entry: dict):
+    _cache().set(key, entry, _timeout())
+
+
+# ===========================================================
+# MÉTRICAS
+# ===========================================================
+
+def cache_stats() -> dict:
+    """
+    Contadores de hit/miss/invalidação de todos os processos.
+    """
+    found = _cache().get_many(list(STATS_KEYS.values()))
+    stats = {name: found.get(key, 0) for name, key in STATS_KEYS.items()}
+
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+    return stats
+
+
+def reset_cache_stats():
+    _cache().delete_many(list(STATS_KEYS.values()))
@@ -1,11 +1,7 @@
 # core/permissions/collections.py
 
-from core.models import Collection, CollectionUserRole
-from core.permissions.biobanks import (
-    can_view_biobank,
-    can_edit_biobank,
-    can_manage_biobank_permissions,
-)
+from core.models import Collection
+from core.permissions.index import check
 
 
 # ===========================================================
@@ -15,55 +11,9 @@ from core.permissions.biobanks import (
 def can_view_collection(user, collection: Collection) -> bool:
     """
     Define se um usuário pode visualizar uma Collection.
+    Regras em PermissionIndex.can_view_collection.
     """
-
-    # -------------------------------------------------------
-    # USUÁRIO NÃO AUTENTICADO
-    # -------------------------------------------------------
-    if not user.is_authenticated:
-        return collection.visibility == "public"
-
-    # -------------------------------------------------------
-    # ADMIN TÉCNICO
-    # -------------------------------------------------------
-    if user.is_superuser or user.is_staff:
-        return True
-
-    # -------------------------------------------------------
-    # DONO CIENTÍFICO (metadado histórico)
-    # -------------------------------------------------------
-    if collection.owner == user:
-        return True
-
-    # -------------------------------------------------------
-    # VISIBILIDADE DIRETA
-    # -------------------------------------------------------
-    if collection.visibility == "public":
-        return True
-
-    # -------------------------------------------------------
-    # ACL LOCAL (CollectionUserRole)
-    # -------------------------------------------------------
-    if CollectionUserRole.objects.filter(
-        user=user,
-        collection=collection,
-    ).exists():
-        return True
-
-    # -------------------------------------------------------
-    # HERANÇA DO BIOBANK
-    # -------------------------------------------------------
-    if collection.biobank:
-        return can_view_biobank(user, collection.biobank)
-
-    # -------------------------------------------------------
-    # FUTURO: GROUP / OUTROS
-    # -------------------------------------------------------
-    if collection.visibility == "group":
-        if hasattr(collection, "research_group") and collection.research_group:
-            return collection.research_group in user.research_groups.all()
-
-    return False
+    return check(user, "can_view_collection", collection)
 
 
 # ===========================================================
@@ -75,42 +25,7 @@ def can_edit_collection(user, collection: Collection) -> bool:
     Define se um usuário pode editar dados da Collection
     (metadados, samples, etc).
     """
-
-    if not user.is_authenticated:
-        return False
-
-    # -------------------------------------------------------
-    # ADMIN TÉCNICO
-    # -------------------------------------------------------
-    if user.is_superuser or user.is_staff:
-        return True
-
-    # -------------------------------------------------------
-    # DONO
-    # -------------------------------------------------------
-    if collection.owner == user:
-        return True
-
-    # -------------------------------------------------------
-    # PAPÉIS LOCAIS
-    # -------------------------------------------------------
-    if CollectionUserRole.objects.filter(
-        user=user,
-        collection=collection,
-        role__in=[
-            CollectionUserRole.OWNER,
-            CollectionUserRole.EDITOR,
-        ],
-    ).exists():
-        return True
-
-    # -------------------------------------------------------
-    # HERANÇA DO BIOBANK
-    # -------------------------------------------------------
-    if collection.biobank:
-        return can_edit_biobank(user, collection.biobank)
-
-    return False
+    return check(user, "can_edit_collection", collection)
 
 
 # ===========================================================
@@ -121,31 +36,4 @@ def can_manage_collection_permissions(user, collection: Collection) -> bool:
     """
     Define quem pode gerenciar membros e permissões da Collection.
     """
-
-    if not user.is_authenticated:
-        return False
-
-    # -------------------------------------------------------
-    # ADMIN TÉCNICO
-    # -------------------------------------------------------
-    if user.is_superuser or user.is_staff:
-        return True
-
-    # -------------------------------------------------------
-    # COORDENADOR LOCAL (OWNER)
-    # -------------------------------------------------------
-    if CollectionUserRole.objects.filter(
-        user=user,
-        collection=collection,
-        role=CollectionUserRole.OWNER,
-    ).exists():
-        return True
-
-    # -------------------------------------------------------
-    # HERANÇA DO BIOBANK
-    # -------------------------------------------------------
-    if collection.biobank:
-        return can_manage_biobank_permissions(user, collection.biobank)
-
-    return False
-
+    return check(user, "can_manage_collection", collection)
@@ -0,0 +1,165 @@
+# core/permissions/effective_access.py
+
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from core.models import (
+    BiobankUserRole,
+    Collection,
+    CollectionUserRole,
+    EffectiveAccess,
+)
+from core.permissions.index import PermissionIndex
+
+
+CHUNK_SIZE = 500
+
+
+# ===========================================================
+# CÁLCULO
+# ===========================================================
+
+def _compute_rows(collections, user_ids=None) -> list:
+    """
+    Calcula as linhas de EffectiveAccess para um lote de Collections
+    (com biobank carregado). Candidatos: owner da Collection, owner do
+    Biobank e usuários com CollectionUserRole / BiobankUserRole.
+    """
+    collection_ids = [c.pk for c in collections]
+    biobank_ids = {c.biobank_id for c in collections}
+
+    collection_roles = CollectionUserRole.objects.filter(
+        collection_id__in=collection_ids,
+    )
+    biobank_roles = BiobankUserRole.objects.filter(
+        biobank_id__in=biobank_ids,
+    )
+    if user_ids is not None:
+        collection_roles = collection_roles.filter(user_id__in=user_ids)
+        biobank_roles = biobank_roles.filter(user_id__in=user_ids)
+
+    # {user_id: {collection_id: role}} / {user_id: {biobank_id: role}}
+    roles_by_user_c = defaultdict(dict)
+    for uid, cid, role in collection_roles.values_list(
+        "user_id", "collection_id", "role"
+    ):
+        roles_by_user_c[uid][cid] = role
+
+    roles_by_user_b = defaultdict(dict)
+    for uid, bid, role in biobank_roles.values_list(
+        "user_id", "biobank_id", "role"
+    ):
+        roles_by_user_b[uid][bid] = role
+
+    # Candidatos por Collection
+    members_by_biobank = defaultdict(set)
+    for uid, bmap in roles_by_user_b.items():
+        for bid in bmap:
+            members_by_biobank[bid].add(uid)
+
+    candidates = {}
+    for c in collections:
+        uids = {c.owner_id, c.biobank.owner_id} | members_by_biobank[c.biobank_id]
+        uids |= {uid for uid, cmap in roles_by_user_c.items() if c.pk in cmap}
+        if user_ids is not None:
+            uids &= set(user_ids)
+        candidates[c.pk] = uids
+
+    users = User.objects.in_bulk(set().union(*candidates.values()))
+    indexes = {
+        uid: PermissionIndex(
+            user,
+            biobank_roles=roles_by_user_b.get(uid, {}),
+            collection_roles=roles_by_user_c.get(uid, {}),
+        )
+        for uid, user in users.items()
+    }
+
+    rows = []
+    for c in collections:
+        for uid in candidates[c.pk]:
+            index = indexes.get(uid)
+            if index is None:
+                continue
+
+            can_view = index.can_view_collection(c)
+            can_edit = index.can_edit_collection(c)
+            can_manage = index.can_manage_collection(c)
+
+            if can_view or can_edit or can_manage:
+                rows.append(EffectiveAccess(
+                    user_id=uid,
+                    collection_id=c.pk,
+                    can_view=can_view,
+                    can_edit=can_edit,
+                    can_manage=can_manage,
+                ))
+    return rows
+
+
+# ===========================================================
+# MANUTENÇÃO
+# ===========================================================
+
+def refresh_effective_access(collection_ids, user_ids=None):
+    """
+    Recalcula o acesso efetivo das Collections informadas (restrito a
+    `user_ids`, se informado). Usado pelos signals de ACL.
+    """
+    collection_ids = list(collection_ids)
+    if not collection_ids:
+        return
+
+    collections = list(
+        Collection.objects
+        .filter(pk__in=collection_ids)
+        .select_related("biobank")
+    )
+
+    with transaction.atomic():
+        stale = EffectiveAccess.objects.filter(collection_id__in=collection_ids)
+        if user_ids is not None:
+            stale = stale.filter(user_id__in=user_ids)
+        stale.delete()
+
+        EffectiveAccess.objects.bulk_create(
+            _compute_rows(collections, user_ids=user_ids),
+            batch_size=CHUNK_SIZE,
+        )
+
+
+def refresh_biobank_access(biobank_id, user_ids=None):
+    """
+    Recalcula o acesso efetivo de todas as Collections de um Biobank.
+    """
+    refresh_effective_access(
+        Collection.objects
+        .filter(biobank_id=biobank_id)
+        .values_list("pk", flat=True),
+        user_ids=user_ids,
+    )
+
+
+def rebuild_effective_access(chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Reconstrói a tabela inteira. Retorna o número de linhas criadas.
+    """
+    total = 0
+
+    with transaction.atomic():
+        EffectiveAccess.objects.all().delete()
+
+        ids = list(Collection.objects.order_by("pk").values_list("pk", flat=True))
+        for start in range(0, len(ids), chunk_size):
+            collections = list(
+                Collection.objects
+                .filter(pk__in=ids[start:start + chunk_size])
+                .select_related("biobank")
+            )
+            rows = _compute_rows(collections)
+            EffectiveAccess.objects.bulk_create(rows, batch_size=chunk_size)
+            total += len(rows)
+
+    return total
@@ -0,0 +1,392 @@
+# core/permissions/index.py
+
+from core.models import BiobankUserRole, CollectionUserRole
+from core.permissions import cache as permission_cache
+
+
+class PermissionIndex:
+    """
+    Índice em memória dos papéis de um usuário.
+
+    Carrega os papéis de Biobank e de Collection do usuário com no máximo
+    duas queries e responde visualização / edição / gerenciamento para
+    qualquer quantidade de objetos sem novos acessos ao banco.
+
+    Para evitar fetches preguiçosos, as Collections avaliadas devem vir
+    com `select_related("biobank")`.
+
+    Obtido via `PermissionIndex.for_user`, o índice (papéis + decisões já
+    tomadas) é compartilhado entre requests pelo cache de permissões e
+    invalidado pelos signals de ACL (ver core/permissions/cache.py).
+    Decisões novas ficam em memória e vão para o cache uma vez, em
+    `save()` (ao fim do request, pelo PermissionCacheMiddleware).
+    """
+
+    def __init__(self, user, version=None, biobank_roles=None, collection_roles=None):
+        self.user = user
+        self.is_authenticated = user.is_authenticated
+        self.user_id = user.pk if self.is_authenticated else None
+        self.is_admin = self.is_authenticated and (
+            user.is_superuser or user.is_staff
+        )
+
+        self.version = version
+        self.cache_key = (
+            permission_cache.entry_key(user, version)
+            if version is not None else None
+        )
+        # Papéis podem ser pré-carregados em lote (ver effective_access)
+        self._biobank_roles = biobank_roles
+        self._collection_roles = collection_roles
+        self._decisions = {}
+        self._dirty = False
+
+    # =======================================================
+    # CACHE ENTRE REQUESTS
+    # =======================================================
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Índice do usuário, reaproveitado dentro do request (memo no
+        objeto user) e entre requests (cache de permissões).
+        """
+        if not user.is_authenticated:
+            return cls(user)
+
+        version = permission_cache.acl_version()
+
+        index = getattr(user, "_permission_index", None)
+        if index is not None and index.version == version:
+            return index
+
+        index = cls(user, version=version)
+        entry = permission_cache.load_entry(index.cache_key)
+        if entry is not None:
+            index._biobank_roles = entry["biobank_roles"]
+            index._collection_roles = entry["collection_roles"]
+            index._decisions = entry["decisions"]
+
+        user._permission_index = index
+        return index
+
+    def save(self):
+        """
+        Persiste papéis e decisões novas no cache de permissões. Guarda
+        só as `max_decisions()` decisões mais recentes: usuários que
+        percorrem o inventário inteiro não incham a entrada.
+        """
+        if not self._dirty or self.cache_key is None:
+            return
+
+        limit = permission_cache.max_decisions()
+        if len(self._decisions) > limit:
+            self._decisions = dict(list(self._decisions.items())[-limit:])
+
+        permission_cache.store_entry(self.cache_key, {
+            "biobank_roles": self._biobank_roles,
+            "collection_roles": self._collection_roles,
+            "decisions": self._decisions,
+        })
+        self._dirty = False
+
+    def _decide(self, key, rule):
+        """
+        Memoiza a decisão `rule()` sob `key` (objetos sem pk não
+        são memoizados).
+        """
+        if key[1] is None:
+            return rule()
+
+        try:
+            return self._decisions[key]
+        except KeyError:
+            result = self._decisions[key] = rule()
+            self._dirty = True
+            return result
+
+    # =======================================================
+    # CARGA DOS PAPÉIS
+    # =======================================================
+
+    @property
+    def biobank_roles(self) -> dict:
+        """
+        {biobank_id: role} do usuário (uma query, sob demanda).
+        """
+        if self._biobank_roles is None:
+            if not self.is_authenticated:
+                self._biobank_roles = {}
+            else:
+                self._biobank_roles = dict(
+                    BiobankUserRole.objects
+                    .filter(user_id=self.user_id)
+                    .values_list("biobank_id", "role")
+                )
+                self._dirty = True
+        return self._biobank_roles
+
+    @property
+    def collection_roles(self) -> dict:
+        """
+        {collection_id: role} do usuário (uma query, sob demanda).
+        """
+        if self._collection_roles is None:
+            if not self.is_authenticated:
+                self._collection_roles = {}
+            else:
+                self._collection_roles = dict(
+                    CollectionUserRole.objects
+                    .filter(user_id=self.user_id)
+                    .values_list("collection_id", "role")
+                )
+                self._dirty = True
+        return self._collection_roles
+
+    @property
+    def is_coordinator(self) -> bool:
+        """
+        Usuário é OWNER (coordenador) de ao menos uma Collection.
+        """
+        return CollectionUserRole.OWNER in self.collection_roles.values()
+
+    def biobank_role(self, biobank_id):
+        """
+        Papel do usuário no Biobank ou None.
+        Admin técnico é tratado como OWNER.
+        """
+        if not self.is_authenticated:
+            return None
+
+        if self.is_admin:
+            return BiobankUserRole.OWNER
+
+        return self.biobank_roles.get(biobank_id)
+
+    # =======================================================
+    # BIOBANKS
+    # =======================================================
+
+    def can_view_biobank(self, biobank) -> bool:
+        return self._decide(
+            ("view_biobank", biobank.pk),
+            lambda: self._view_biobank(biobank),
+        )
+
+    def can_edit_biobank(self, biobank) -> bool:
+        return self._decide(
+            ("edit_biobank", biobank.pk),
+            lambda: self._edit_biobank(biobank),
+        )
+
+    def can_manage_biobank(self, biobank) -> bool:
+        return self._decide(
+            ("manage_biobank", biobank.pk),
+            lambda: self._manage_biobank(biobank),
+        )
+
+    def _view_biobank(self, biobank) -> bool:
+        # Biobank desativado nunca é visível
+        if not biobank.is_active:
+            return False
+
+        # Interface interna exige login
+        if not self.is_authenticated:
+            return False
+
+        # Público (qualquer usuário autenticado)
+        if biobank.visibility == "public":
+            return True
+
+        # Privado → apenas owner
+        if biobank.visibility == "private":
+            return biobank.owner_id == self.user_id
+
+        # Restrito ao Biobank → precisa ter papel
+        return self.biobank_role(biobank.pk) is not None
+
+    def _edit_biobank(self, biobank) -> bool:
+        if not self.is_authenticated or not biobank.is_active:
+            return False
+
+        return self.biobank_role(biobank.pk) in (
+            BiobankUserRole.OWNER,
+            BiobankUserRole.MANAGER,
+        )
+
+    def _manage_biobank(self, biobank) -> bool:
+        if not self.is_authenticated or not biobank.is_active:
+            return False
+
+        # Apenas OWNER científico (ou admin técnico)
+        return self.biobank_role(biobank.pk) == BiobankUserRole.OWNER
+
+    # =======================================================
+    # COLLECTIONS
+    # =======================================================
+
+    def can_view_collection(self, collection) -> bool:
+        return self._decide(
+            ("view_collection", collection.pk),
+            lambda: self._view_collection(collection),
+        )
+
+    def can_edit_collection(self, collection) -> bool:
+        return self._decide(
+            ("edit_collection", collection.pk),
+            lambda: self._edit_collection(collection),
+        )
+
+    def can_manage_collection(self, collection) -> bool:
+        return self._decide(
+            ("manage_collection", collection.pk),
+            lambda: self._manage_collection(collection),
+        )
+
+    def _view_collection(self, collection) -> bool:
+        # Usuário não autenticado
+        if not self.is_authenticated:
+            return collection.visibility == "public"
+
+        # Admin técnico
+        if self.is_admin:
+            return True
+
+        # Dono científico (metadado histórico)
+        if collection.owner_id == self.user_id:
+            return True
+
+        # Visibilidade direta
+        if collection.visibility == "public":
+            return True
+
+        # ACL local (CollectionUserRole)
+        if collection.pk in self.collection_roles:
+            return True
+
+        # Herança do Biobank
+        if collection.biobank_id:
+            return self.can_view_biobank(collection.biobank)
+
+        return False
+
+    def _edit_collection(self, collection) -> bool:
+        if not self.is_authenticated:
+            return False
+
+        if self.is_admin:
+            return True
+
+        if collection.owner_id == self.user_id:
+            return True
+
+        if self.collection_roles.get(collection.pk) in (
+            CollectionUserRole.OWNER,
+            CollectionUserRole.EDITOR,
+        ):
+            return True
+
+        if collection.biobank_id:
+            return self.can_edit_biobank(collection.biobank)
+
+        return False
+
+    def _manage_collection(self, collection) -> bool:
+        if not self.is_authenticated:
+            return False
+
+        if self.is_admin:
+            return True
+
+        # Coordenador local (OWNER)
+        if self.collection_roles.get(collection.pk) == CollectionUserRole.OWNER:
+            return True
+
+        if collection.biobank_id:
+            return self.can_manage_biobank(collection.biobank)
+
+        return False
+
+    # =======================================================
+    # SAMPLES
+    # (decisões memoizadas pelo collection_id: uma decisão em cache
+    #  dispensa o fetch de sample.collection)
+    # =======================================================
+
+    def can_view_sample(self, sample) -> bool:
+        if not sample or not self.is_authenticated:
+            return False
+
+        # Sample sem Collection (rascunho): criador ou coordenador
+        if not sample.collection_id:
+            return sample.owner_id == self.user_id or self.is_coordinator
+
+        return self._decide(
+            ("view_collection", sample.collection_id),
+            lambda: self._view_collection(sample.collection),
+        )
+
+    def can_edit_sample(self, sample) -> bool:
+        if not sample or not self.is_authenticated:
+            return False
+
+        if not sample.collection_id:
+            return sample.owner_id == self.user_id or self.is_coordinator
+
+        return self._decide(
+            ("edit_collection", sample.collection_id),
+            lambda: self._edit_collection(sample.collection),
+        )
+
+    def can_delete_sample(self, sample) -> bool:
+        if not sample or not self.is_authenticated:
+            return False
+
+        # Sample sem Collection: apenas coordenadores (OWNER)
+        if not sample.collection_id:
+            return self.is_coordinator
+
+        return self._decide(
+            ("manage_collection", sample.collection_id),
+            lambda: self._manage_collection(sample.collection),
+        )
+
+    # =======================================================
+    # LOTES (LISTAGENS)
+    # =======================================================
+
+    def visible_biobanks(self, biobanks) -> list:
+        """
+        Filtra os Biobanks visíveis e anota `can_edit` e
+        `can_manage_members` em cada um.
+        """
+        visible = []
+        for b in biobanks:
+            if not self.can_view_biobank(b):
+                continue
+            b.can_edit = self.can_edit_biobank(b)
+            b.can_manage_members = self.can_manage_biobank(b)
+            visible.append(b)
+        return visible
+
+    def visible_collections(self, collections) -> list:
+        """
+        Filtra as Collections visíveis e anota `can_edit` e
+        `can_manage_members` em cada uma.
+        """
+        visible = []
+        for c in collections:
+            if not self.can_view_collection(c):
+                continue
+            c.can_edit = self.can_edit_collection(c)
+            c.can_manage_members = self.can_manage_collection(c)
+            visible.append(c)
+        return visible
+
+
+def check(user, rule: str, obj) -> bool:
+    """
+    Avalia uma regra do índice para um único objeto, consultando o
+    cache de permissões (decisões novas são gravadas em `save()`).
+    """
+    return getattr(PermissionIndex.for_user(user), rule)(obj)
@@ -0,0 +1,32 @@
+# core/permissions/middleware.py
+
+from django.utils.functional import empty
+
+from core.permissions.cache import request_scope
+
+
+class PermissionCacheMiddleware:
+    """
+    Grava no cache de permissões, uma vez ao fim do request, os papéis e
+    as decisões novas do PermissionIndex do usuário. Durante o request
+    as decisões ficam só em memória (ver PermissionIndex.for_user) e a
+    versão de ACL é lida do cache compartilhado uma vez só.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_scope():
+            response = self.get_response(request)
+
+        # request.user é preguiçoso: se a view não o usou, não há índice
+        # (e não vale carregar a sessão só para descobrir isso)
+        user = getattr(request, "user", None)
+        if user is None or getattr(user, "_wrapped", None) is empty:
+            return response
+
+        index = getattr(user, "_permission_index", None)
+        if index is not None:
+            index.save()
+        return response
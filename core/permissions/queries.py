@@ -0,0 +1,160 @@
+# core/permissions/queries.py
+
+from django.db.models import Exists, OuterRef, Q
+
+from core.models import BiobankUserRole, CollectionUserRole, EffectiveAccess
+
+
+# ===========================================================
+# HELPERS
+# ===========================================================
+
+def _nothing() -> Q:
+    return Q(pk__in=[])
+
+
+def _is_admin(user) -> bool:
+    return user.is_authenticated and (user.is_superuser or user.is_staff)
+
+
+# ===========================================================
+# BIOBANKS
+# ===========================================================
+
+def biobank_visibility_q(user, prefix: str = "") -> Q:
+    """
+    Versão SQL de PermissionIndex.can_view_biobank.
+
+    `prefix` permite aplicar a regra a partir de outra entidade
+    (ex.: "biobank__" para Collection).
+    """
+
+    # Interface interna exige login
+    if not user.is_authenticated:
+        return _nothing()
+
+    # Restrito ao Biobank → precisa ter papel (admin técnico = OWNER)
+    restricted = Q(**{f"{prefix}visibility": "biobank"})
+    if not _is_admin(user):
+        restricted &= Exists(
+            BiobankUserRole.objects.filter(
+                user=user,
+                biobank=OuterRef(f"{prefix}pk"),
+            )
+        )
+
+    return Q(**{f"{prefix}is_active": True}) & (
+        Q(**{f"{prefix}visibility": "public"})
+        | Q(**{f"{prefix}visibility": "private", f"{prefix}owner": user})
+        | restricted
+    )
+
+
+# ===========================================================
+# COLLECTIONS
+# ===========================================================
+
+def collection_visibility_q(user, prefix: str = "") -> Q:
+    """
+    Versão SQL de PermissionIndex.can_view_collection.
+    """
+
+    # Usuário não autenticado
+    if not user.is_authenticated:
+        return Q(**{f"{prefix}visibility": "public"})
+
+    # Admin técnico
+    if _is_admin(user):
+        return Q()
+
+    return (
+        # Dono científico
+        Q(**{f"{prefix}owner": user})
+        # Visibilidade direta
+        | Q(**{f"{prefix}visibility": "public"})
+        # ACL local (CollectionUserRole)
+        | Exists(
+            CollectionUserRole.objects.filter(
+                user=user,
+                collection=OuterRef(f"{prefix}pk"),
+            )
+        )
+        # Herança do Biobank
+        | biobank_visibility_q(user, prefix=f"{prefix}biobank__")
+    )
+
+
+# ===========================================================
+# SAMPLES
+# ===========================================================
+
+def _draft_sample_q(user) -> Q:
+    # Sample sem Collection (rascunho): criador ou coordenador (OWNER)
+    is_coordinator = Exists(
+        CollectionUserRole.objects.filter(
+            user=user,
+            role=CollectionUserRole.OWNER,
+        )
+    )
+    return Q(collection__isnull=True) & (Q(owner=user) | is_coordinator)
+
+
+def sample_visibility_q(user) -> Q:
+    """
+    Versão SQL de PermissionIndex.can_view_sample.
+
+    A herança de papéis (CollectionUserRole / BiobankUserRole) vem da
+    tabela materializada EffectiveAccess, então o acesso a Collections
+    vira um único EXISTS indexado por (user, can_view, collection).
+    """
+
+    if not user.is_authenticated:
+        return _nothing()
+
+    draft = _draft_sample_q(user)
+
+    # Sample com Collection → herda da Collection
+    if _is_admin(user):
+        return draft | Q(collection__isnull=False)
+
+    assigned = (
+        # Visibilidade direta (Collection ou Biobank públicos)
+        Q(collection__visibility="public")
+        | Q(
+            collection__biobank__visibility="public",
+            collection__biobank__is_active=True,
+        )
+        # Owner, ACL local e herança do Biobank (materializados)
+        | Exists(
+            EffectiveAccess.objects.filter(
+                user=user,
+                can_view=True,
+                collection=OuterRef("collection_id"),
+            )
+        )
+    )
+
+    return draft | (Q(collection__isnull=False) & assigned)
+
+
+def sample_edit_q(user) -> Q:
+    """
+    Versão SQL de PermissionIndex.can_edit_sample (edição herdada da
+    Collection via EffectiveAccess.can_edit).
+    """
+
+    if not user.is_authenticated:
+        return _nothing()
+
+    draft = _draft_sample_q(user)
+
+    if _is_admin(user):
+        return draft | Q(collection__isnull=False)
+
+    return draft | Exists(
+        EffectiveAccess.objects.filter(
+            user=user,
+            can_edit=True,
+            collection=OuterRef("collection_id"),
+        )
+    )
@@ -21,7 +21,7 @@ class BenchlingService:
         """
         # Mapeamento de Keywords do seu Biobank para Fields do Benchling
         fields = {}
-        for kv in sample.keyword_values.all():
+        for kv in sample.keywords.all():
             # No Benchling, campos customizados esperam um dicionário com {'value': ...}
             fields[kv.keyword.name] = {"value": kv.value}
 
@@ -0,0 +1,224 @@
+import fcntl
+import hashlib
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from core.models import AttachmentMetadata, Blob
+from core.models.samples.blobs import BLOB_ROOT, blob_storage_name
+from core.services.image_previews import remove_previews
+from core.services.sequence_index import remove_sequence_index
+
+
+# Arquivos temporários (uploads em andamento) ficam no mesmo sistema de
+# arquivos dos blobs: a publicação é um link/rename, nunca uma cópia
+TMP_DIR = os.path.join(BLOB_ROOT, "tmp")
+
+READ_BLOCK = 1024 * 1024
+
+# Temporários / blobs sem linha mais antigos que isto são lixo
+GC_GRACE = 6 * 3600  # segundos
+
+
+def tmp_path(suffix: str = ".tmp") -> str:
+    path = default_storage.path(os.path.join(TMP_DIR, f"{uuid.uuid4().hex}{suffix}"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+@contextmanager
+def _store_lock():
+    """
+    Serializa "publicar arquivo + contar referência" contra "apagar
+    órfão", entre processos (flock no próprio diretório de blobs).
+    """
+    path = default_storage.path(os.path.join(BLOB_ROOT, ".lock"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# ===========================================================
+# ENTRADA DE CONTEÚDO
+# ===========================================================
+
+def adopt_file(path: str, sha256: str, size: int) -> Blob:
+    """
+    Incorpora um arquivo local (já com hash conhecido) ao armazenamento
+    e soma uma referência. Se o conteúdo já existe, o arquivo é apenas
+    descartado (deduplicação). `path` deixa de existir ao final.
+    """
+    with _store_lock():
+        blob, _ = Blob.objects.get_or_create(sha256=sha256, defaults={"size": size})
+        Blob.objects.filter(pk=blob.pk).update(refcount=F("refcount") + 1, updated_at=timezone.now())
+
+        target = default_storage.path(blob_storage_name(sha256))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(path, target)
+        except FileExistsError:
+            pass
+        os.remove(path)
+
+    blob.refresh_from_db(fields=["refcount"])
+    return blob
+
+
+def store_file(f) -> Blob:
+    """
+    Grava um File do Django (ex.: UploadedFile do formulário) em um
+    temporário calculando o SHA-256 no caminho, e o incorpora.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    path = tmp_path()
+    with open(path, "wb") as out:
+        for block in f.chunks(READ_BLOCK):
+            out.write(block)
+            digest.update(block)
+            size += len(block)
+    return adopt_file(path, digest.hexdigest(), size)
+
+
+def convert_legacy_files(batch_size: int = 100) -> dict:
+    """
+    Converte anexos antigos (arquivo no caminho por amostra, sem blob)
+    para o armazenamento por hash. O arquivo é ligado ao blob e o
+    caminho antigo removido; conteúdos repetidos passam a ocupar o
+    disco uma vez só.
+    """
+    from core.models import SampleFile
+
+    stats = {"converted": 0, "deduplicated": 0, "missing": 0}
+    legacy = SampleFile.objects.filter(blob__isnull=True).only("id", "file", "name")
+
+    for sample_file in legacy.iterator(chunk_size=batch_size):
+        path = default_storage.path(sample_file.file.name)
+        if not os.path.isfile(path):
+            stats["missing"] += 1
+            continue
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(READ_BLOCK), b""):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+
+        with transaction.atomic():
+            existed = Blob.objects.filter(sha256=sha256).exists()
+            blob = adopt_file(path, sha256, os.path.getsize(path))
+            SampleFile.objects.filter(pk=sample_file.pk).update(
+                blob=blob,
+                file=blob.storage_name,
+                name=sample_file.name or os.path.basename(sample_file.file.name),
+                sha256=sha256,
+            )
+        stats["converted"] += 1
+        stats["deduplicated"] += existed
+
+    return stats
+
+
+# ===========================================================
+# REFERÊNCIAS / COLETA
+# ===========================================================
+
+def release_blob(blob_id) -> None:
+    """
+    Remove uma referência; o arquivo é apagado após o commit se nenhum
+    outro SampleFile usar o conteúdo.
+    """
+    Blob.objects.filter(pk=blob_id, refcount__gt=0).update(
+        refcount=F("refcount") - 1, updated_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: collect_blob(blob_id), robust=True)
+
+
+def collect_blob(blob_id) -> bool:
+    """
+    Apaga o blob se continuar sem referências. O DELETE condicional
+    (refcount=0) perde para um adopt_file concorrente que já contou a
+    sua referência.
+    """
+    with _store_lock():
+        blob = Blob.objects.filter(pk=blob_id, refcount=0).first()
+        if blob is None:
+            return False
+
+        deleted, _ = Blob.objects.filter(pk=blob_id, refcount=0).delete()
+        if deleted:
+            # Metadados / prévias derivados do conteúdo saem junto
+            AttachmentMetadata.objects.filter(content_hash=blob.sha256).delete()
+            remove_previews(blob.sha256)
+            remove_sequence_index(blob.sha256)
+            if os.path.exists(blob.path):
+                os.remove(blob.path)
+        return bool(deleted)
+
+
+def collect_garbage(scan_files: bool = False, grace: int = GC_GRACE) -> dict:
+    """
+    Remove blobs sem referência, temporários abandonados e, com
+    `scan_files`, arquivos de blob sem linha no banco (ex.: transação
+    desfeita após a publicação).
+    """
+    stats = {"blobs": 0, "tmp": 0, "files": 0}
+    cutoff = time.time() - grace
+
+    for blob_id in Blob.objects.filter(refcount=0).values_list("pk", flat=True):
+        stats["blobs"] += collect_blob(blob_id)
+
+    tmp_root = default_storage.path(TMP_DIR)
+    if os.path.isdir(tmp_root):
+        for name in os.listdir(tmp_root):
+            path = os.path.join(tmp_root, name)
+            # ".part" de uploads em partes: ciclo de vida em purge_stale_uploads
+            if not name.endswith(".part") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                stats["tmp"] += 1
+
+    if scan_files:
+        root = default_storage.path(BLOB_ROOT)
+        for dirpath, dirnames, filenames in os.walk(root):
+            if os.path.abspath(dirpath) == os.path.abspath(tmp_root):
+                dirnames[:] = []
+                continue
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if len(name) != 64 or os.path.getmtime(path) >= cutoff:
+                    continue
+                with _store_lock():
+                    if not Blob.objects.filter(sha256=name).exists():
+                        os.remove(path)
+                        stats["files"] += 1
+
+    return stats
+
+
+def verify_refcounts(fix: bool = False) -> list:
+    """
+    Compara `refcount` com os SampleFile que apontam para cada blob.
+    Retorna [(sha256, gravado, real)] das divergências.
+    """
+    wrong = [
+        (sha256, stored, actual)
+        for sha256, stored, actual in
+        Blob.objects
+        .annotate(actual=Count("sample_files"))
+        .exclude(refcount=F("actual"))
+        .values_list("sha256", "refcount", "actual")
+    ]
+    if fix:
+        for sha256, _, actual in wrong:
+            Blob.objects.filter(sha256=sha256).update(refcount=actual)
+    return wrong
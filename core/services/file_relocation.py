@@ -0,0 +1,298 @@
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Sample, SampleFile
+from core.models.samples.sample_files import relabel_sample_files, sample_file_upload_to
+from core.permissions.queries import sample_edit_q
+from core.services.scan import invalidate_scan_cache
+
+
+# Diário das relocações em andamento (um JSON por Sample), para
+# retomar depois de uma queda entre o commit e a limpeza
+JOURNAL_DIR = "_relocations"
+
+READ_BLOCK = 1024 * 1024
+
+# Samples por tarefa na reassociação em massa
+JOB_CHUNK = 500
+
+# Erros de os.link que pedem cópia (outro disco, FS sem hard link)
+_LINK_FALLBACK = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+
+class RelocationError(OSError):
+    """Cópia entre sistemas de arquivos não confere com a origem."""
+
+
+# ===========================================================
+# CAMINHOS
+# ===========================================================
+
+def sample_prefix(sample) -> str:
+    """Pasta atual dos anexos do Sample (relativa ao MEDIA_ROOT, com "/")"""
+    return sample_file_upload_to(SampleFile(sample=sample), "")
+
+
+def misplaced_files(sample):
+    """
+    Anexos antigos (sem blob) fora da pasta do Sample. Anexos em blob
+    nunca se movem: trocar de coleção só reescreve o caminho lógico.
+    """
+    return (
+        SampleFile.objects
+        .filter(sample=sample, blob__isnull=True)
+        .exclude(file__startswith=sample_prefix(sample))
+    )
+
+
+def _journal_path(sample_pk) -> str:
+    return default_storage.path(os.path.join(JOURNAL_DIR, f"{sample_pk}.json"))
+
+
+@contextmanager
+def _sample_lock(sample_pk):
+    """Uma relocação por Sample de cada vez (save() e lote podem coincidir)"""
+    path = _journal_path(sample_pk)[:-len(".json")] + ".lock"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _write_journal(sample_pk, moves):
+    path = _journal_path(sample_pk)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"moves": moves}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+# ===========================================================
+# ARQUIVOS
+# ===========================================================
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _copy_verified(src: str, dst: str, expected: str = ""):
+    """
+    Cópia para outro sistema de arquivos: grava em ".part", faz fsync,
+    relê e compara o SHA-256 com a origem antes do rename final.
+    """
+    expected = expected or _sha256(src)
+    part = dst + ".part"
+    with open(src, "rb") as source, open(part, "wb") as out:
+        shutil.copyfileobj(source, out, READ_BLOCK)
+        out.flush()
+        os.fsync(out.fileno())
+    if _sha256(part) != expected:
+        os.remove(part)
+        raise RelocationError(f"Cópia divergente: {src} → {dst}")
+    shutil.copystat(src, part)
+    os.replace(part, dst)
+
+
+def _same_content(src: str, dst: str, sha256: str) -> bool:
+    """`dst` já é o arquivo de `src` (link de uma execução anterior ou cópia conferida)"""
+    if os.path.exists(src):
+        if os.path.samefile(src, dst):
+            return True
+        if os.path.getsize(src) != os.path.getsize(dst):
+            return False
+        return _sha256(dst) == (sha256 or _sha256(src))
+    # Origem já removida: só o hash gravado pode confirmar
+    return bool(sha256) and _sha256(dst) == sha256
+
+
+def _place(src_rel: str, dst_rel: str, sha256: str):
+    """
+    Deixa o conteúdo de `src_rel` também em `dst_rel`, sem remover a
+    origem (os dois caminhos valem até o commit). Mesmo sistema de
+    arquivos: hard link (atômico, sem copiar bytes); senão cópia
+    conferida. Retorna o caminho usado (outro nome se `dst_rel` já
+    estiver ocupado por outro conteúdo) ou None se a origem sumiu.
+    """
+    src = default_storage.path(src_rel)
+    dst = default_storage.path(dst_rel)
+
+    if os.path.exists(dst):
+        if _same_content(src, dst, sha256):
+            return dst_rel
+        dst_rel = default_storage.get_available_name(dst_rel)
+        dst = default_storage.path(dst_rel)
+
+    if not os.path.exists(src):
+        return None
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in _LINK_FALLBACK:
+            raise
+        _copy_verified(src, dst, sha256)
+    return dst_rel
+
+
+def _remove_unreferenced(rel: str):
+    """Apaga o caminho se nenhum anexo aponta para ele, e as pastas que ficarem vazias"""
+    if SampleFile.objects.filter(file=rel).exists():
+        return
+    path = default_storage.path(rel)
+    if os.path.exists(path):
+        os.remove(path)
+
+    root = os.path.abspath(default_storage.path(""))
+    parent = os.path.dirname(os.path.abspath(path))
+    while parent != root and parent.startswith(root):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+
+
+def _finish(sample_pk):
+    """
+    Limpeza pós-commit (ou retomada após queda): de cada par do diário,
+    o caminho que não ficou no banco é apagado. Pode rodar várias vezes.
+    """
+    path = _journal_path(sample_pk)
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        moves = json.load(f)["moves"]
+
+    current = dict(SampleFile.objects.filter(pk__in=[m[0] for m in moves]).values_list("pk", "file"))
+    removed = 0
+    for file_id, src_rel, dst_rel in moves:
+        # Banco aponta para o destino: sai a origem; commit perdido: sai o
+        # destino; anexo apagado no meio: saem os dois
+        for rel in (src_rel, dst_rel):
+            if rel != current.get(file_id) and default_storage.exists(rel):
+                _remove_unreferenced(rel)
+                removed += 1
+    os.remove(path)
+    return removed
+
+
+# ===========================================================
+# RELOCAÇÃO
+# ===========================================================
+
+def relocate_sample_files(sample) -> dict:
+    """
+    Leva os anexos antigos do Sample para a pasta da coleção atual.
+    Idempotente e retomável:
+
+    1. termina uma relocação interrompida (diário);
+    2. liga/copia cada arquivo no destino, mantendo a origem;
+    3. grava o diário e atualiza todos os SampleFile.file em uma
+       transação (se a coleção mudou no meio, nada é gravado);
+    4. após o commit, apaga as origens e as pastas vazias.
+
+    Em nenhum momento um anexo aponta para um caminho inexistente.
+    """
+    with _sample_lock(sample.pk):
+        return _relocate(sample)
+
+
+def _relocate(sample) -> dict:
+    stats = {"moved": 0, "missing": 0, "recovered": _finish(sample.pk)}
+
+    relabel_sample_files(sample)
+    prefix = sample_prefix(sample)
+
+    moves = []
+    for sample_file in misplaced_files(sample).only("id", "file", "sha256"):
+        src_rel = sample_file.file.name
+        dst_rel = _place(src_rel, prefix + os.path.basename(src_rel), sample_file.sha256)
+        if dst_rel is None:
+            stats["missing"] += 1
+            continue
+        moves.append([sample_file.pk, src_rel, dst_rel])
+
+    if not moves:
+        return stats
+
+    _write_journal(sample.pk, moves)
+    with transaction.atomic():
+        locked = (
+            Sample.objects
+            .select_for_update(of=("self",))
+            .select_related("biobank", "collection")
+            .get(pk=sample.pk)
+        )
+        if sample_prefix(locked) == prefix:
+            updated = []
+            for file_id, src_rel, dst_rel in moves:
+                sample_file = SampleFile(pk=file_id, file=dst_rel, logical_path=dst_rel)
+                updated.append(sample_file)
+            SampleFile.objects.bulk_update(updated, ["file", "logical_path"])
+            stats["moved"] = len(updated)
+
+    # Só depois do commit as origens podem sair
+    transaction.on_commit(lambda: _finish(sample.pk))
+    return stats
+
+
+# ===========================================================
+# REASSOCIAÇÃO EM MASSA
+# ===========================================================
+
+def assign_collection(user, queryset, collection) -> dict:
+    """
+    Troca a coleção (e o biobanco herdado) dos Samples editáveis de
+    `queryset` com um UPDATE por lote, sem chamar save(). Caminhos
+    lógicos e arquivos antigos ficam para tarefas em segundo plano
+    ("samples.relocate_files", JOB_CHUNK Samples cada).
+    """
+    from core.services.jobs import enqueue
+
+    with transaction.atomic():
+        rows = list(
+            queryset
+            .filter(is_active=True)
+            .filter(sample_edit_q(user))
+            .exclude(collection=collection)
+            .select_for_update(of=("self",))
+            .order_by("pk")
+            .values_list("pk", "uuid")
+        )
+        ids = [pk for pk, _ in rows]
+
+        updated = 0
+        for start in range(0, len(ids), JOB_CHUNK):
+            chunk = ids[start:start + JOB_CHUNK]
+            updated += Sample.objects.filter(pk__in=chunk).update(
+                collection=collection,
+                biobank_id=collection.biobank_id,
+                updated_at=timezone.now(),
+            )
+            enqueue("samples.relocate_files", user=user, sample_ids=chunk)
+
+        # Depois do commit: antes dele outra requisição recolocaria no
+        # cache a coleção antiga (lida fora desta transação)
+        uuids = [sample_uuid for _, sample_uuid in rows]
+        transaction.on_commit(lambda: invalidate_scan_cache(uuids))
+
+    return {"updated": updated, "jobs": -(-len(ids) // JOB_CHUNK)}
@@ -0,0 +1,178 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+
+# "" (o Django envia os bytes), "nginx" (X-Accel-Redirect) ou
+# "sendfile" (X-Sendfile: Apache mod_xsendfile, lighttpd)
+OFFLOAD = getattr(settings, "FILE_OFFLOAD", "")
+
+# Location "internal" do nginx que aponta para MEDIA_ROOT
+OFFLOAD_PREFIX = getattr(settings, "FILE_OFFLOAD_PREFIX", "/protected-media/")
+
+# Respostas cujo conteúdo nunca muda na mesma URL (prévias por hash)
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Range de faixa única: "bytes=início-fim", "bytes=início-" ou "bytes=-sufixo"
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class RangeFile:
+    """
+    Janela [início, início+tamanho) de um arquivo aberto. Expõe fileno()
+    para o wsgi.file_wrapper (o sendfile do gunicorn parte da posição
+    atual e envia só o Content-Length).
+    """
+
+    def __init__(self, f, start: int, length: int):
+        f.seek(start)
+        self._file = f
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b""
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self._file.close()
+
+
+def parse_range(header: str, size: int):
+    """
+    (início, fim) inclusivos. None quando não há Range utilizável
+    (ausente, malformado ou com várias faixas: responde o arquivo
+    inteiro, como a RFC 9110 permite).
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.replace(" ", ""))
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start:
+        if not end or int(end) == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - int(end), 0), size - 1
+
+    start = int(start)
+    if start >= size:
+        raise RangeNotSatisfiable()
+    end = min(int(end), size - 1) if end else size - 1
+    if end < start:
+        return None
+    return start, end
+
+
+def _range_applies(request, etag, last_modified) -> bool:
+    """If-Range: a faixa só vale se o validador ainda for o atual"""
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return etag is not None and if_range == etag
+    return last_modified is not None and if_range == http_date(last_modified)
+
+
+def _content_type(filename: str, content_type=None) -> str:
+    if content_type:
+        return content_type
+    guess, encoding = mimetypes.guess_type(filename)
+    return {
+        "gzip": "application/gzip",
+        "bzip2": "application/x-bzip",
+        "xz": "application/x-xz",
+    }.get(encoding, guess) or "application/octet-stream"
+
+
+def _finish(response, etag, last_modified, immutable=False):
+    if etag:
+        response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["Accept-Ranges"] = "bytes"
+    if immutable:
+        # URL muda junto com o conteúdo (hash no caminho)
+        patch_cache_control(response, private=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        # Conteúdo protegido: só o navegador guarda, e revalida (304 barato)
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+# ===========================================================
+# RESPOSTA
+# ===========================================================
+
+def serve_file(request, path: str, *, filename: str, content_type=None, etag=None,
+               last_modified=None, as_attachment: bool = True, immutable: bool = False):
+    """
+    Serve `path` já autorizado pela view: pedidos condicionais
+    (If-None-Match / If-Modified-Since → 304), Range de faixa única
+    (206 / 416) e, com settings.FILE_OFFLOAD, entrega os bytes ao
+    servidor web (a checagem de permissão continua no Django).
+    `immutable`: cache longo no navegador, para URLs versionadas.
+    """
+    size = os.path.getsize(path)
+    etag = quote_etag(etag) if etag else None
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+    content_type = _content_type(filename, content_type)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        return _finish(response, etag, last_modified, immutable)
+
+    if OFFLOAD:
+        response = HttpResponse(content_type=content_type)
+        if OFFLOAD == "nginx":
+            relative = os.path.relpath(path, settings.MEDIA_ROOT)
+            response.headers["X-Accel-Redirect"] = OFFLOAD_PREFIX + quote(relative)
+        else:
+            response.headers["X-Sendfile"] = path
+        response.headers["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+        return _finish(response, etag, last_modified, immutable)
+
+    try:
+        byte_range = parse_range(request.headers.get("Range"), size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response.headers["Content-Range"] = f"bytes */{size}"
+        return _finish(response, etag, last_modified, immutable)
+
+    if byte_range and _range_applies(request, etag, last_modified):
+        start, end = byte_range
+        response = FileResponse(
+            RangeFile(open(path, "rb"), start, end - start + 1),
+            status=206,
+            content_type=content_type,
+            as_attachment=as_attachment,
+            filename=filename,
+        )
+        response.headers["Content-Length"] = end - start + 1
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        response = FileResponse(
+            open(path, "rb"),
+            content_type=content_type,
+            as_attachment=as_attachment,
+            filename=filename,
+        )
+    return _finish(response, etag, last_modified, immutable)
@@ -0,0 +1,306 @@
+import math
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+from PIL import ExifTags, Image, UnidentifiedImageError
+
+from core.models import AttachmentMetadata, SampleFile
+
+
+# Miniatura (listas) e prévia (visualizador) — maior lado, em pixels
+THUMBNAIL_SIZE = 256
+PREVIEW_SIZE = 2048
+
+# Acima do tamanho da prévia gera a pirâmide de blocos (Deep Zoom)
+TILE_SIZE = 256
+TILE_FORMAT = "jpg"
+JPEG_QUALITY = 85
+
+# Pixels por faixa na conversão 16 bits → 8 bits (limita as cópias)
+STRIP_PIXELS = 1 << 20
+
+# Orientação EXIF → transposição (como o ImageOps.exif_transpose)
+EXIF_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+class ImagePreviewError(ValueError):
+    """
+    Imagem que não decodifica (truncada, corrompida): a prévia fica
+    "failed" em vez de voltar para a fila.
+    """
+
+
+@contextmanager
+def _pixel_limit():
+    """
+    Microscopia passa fácil do limite padrão do Pillow (~89 Mpx). O
+    limite (global no Pillow) só sobe durante a geração das prévias,
+    no worker; os Image.open dos processos web seguem com o padrão.
+    """
+    previous = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = getattr(settings, "PREVIEW_MAX_PIXELS", 1_000_000_000)
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = previous
+
+
+# ===========================================================
+# CACHE EM DISCO (POR CONTEÚDO)
+# ===========================================================
+
+def preview_dir(content_hash: str) -> str:
+    """
+    PREVIEW_CACHE_ROOT/<2 primeiros>/<sha256>/: thumb.jpg, preview.jpg
+    e tiles/<nível>/<coluna>_<linha>.jpg. Conteúdo novo = hash novo =
+    diretório novo; nada é sobrescrito.
+    """
+    return os.path.join(settings.PREVIEW_CACHE_ROOT, content_hash[:2], content_hash)
+
+
+def preview_path(content_hash: str, name: str) -> str:
+    return os.path.join(preview_dir(content_hash), name)
+
+
+def tile_name(level: int, column: int, row: int) -> str:
+    return os.path.join("tiles", str(level), f"{column}_{row}.{TILE_FORMAT}")
+
+
+def remove_previews(content_hash: str):
+    shutil.rmtree(preview_dir(content_hash), ignore_errors=True)
+
+
+# ===========================================================
+# RENDERIZAÇÃO
+# ===========================================================
+
+def _strips(image):
+    """Faixas de ~STRIP_PIXELS pixels como arrays (uma cópia pequena por vez)"""
+    width, height = image.size
+    rows = max(1, STRIP_PIXELS // width)
+    for top in range(0, height, rows):
+        yield top, np.asarray(image.crop((0, top, width, min(top + rows, height))))
+
+
+def to_display(image):
+    """
+    Converte para L/RGB de 8 bits. Imagens de 16 bits / float
+    (microscopia) têm o contraste esticado entre os percentis 0,5 e
+    99,5, calculados em uma amostra da imagem.
+
+    A conversão é feita em faixas de linhas direto para a imagem de
+    saída: além da original só existe a versão de 8 bits, nunca uma
+    cópia inteira em numpy / float.
+    """
+    if image.mode in ("L", "RGB"):
+        return image
+    if image.mode == "1":
+        return image.convert("L")
+    if not image.mode.startswith(("I", "F")):
+        return image.convert("RGB")
+
+    step = max(1, int(math.sqrt(image.width * image.height / 1_000_000)))
+    sample = np.concatenate([
+        strip[(step - top % step) % step::step, ::step].ravel()
+        for top, strip in _strips(image)
+    ])
+    low, high = np.percentile(sample, (0.5, 99.5))
+    scale = 255.0 / (high - low) if high > low else 0.0
+    del sample
+
+    out = Image.new("L", image.size)
+    for top, strip in _strips(image):
+        values = strip.astype(np.float32)
+        values -= low
+        values *= scale
+        np.clip(values, 0, 255, out=values)
+        out.paste(Image.fromarray(values.astype(np.uint8)), (0, top))
+    return out
+
+
+def _save(image, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    image.save(path, "JPEG", quality=JPEG_QUALITY)
+
+
+def _downscaled(image, size: int):
+    # resize direto (sem copiar a original); reducing_gap faz um
+    # reduce() inteiro antes do LANCZOS, muito mais rápido em imagens grandes
+    scale = size / max(image.size)
+    if scale >= 1:
+        return image
+    new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def build_pyramid(image, target: str) -> int:
+    """
+    Pirâmide no layout Deep Zoom (nível máximo = resolução original,
+    cada nível abaixo com metade do lado, até 1 px; blocos de
+    TILE_SIZE sem sobreposição). Retorna o número de níveis.
+    """
+    max_level = math.ceil(math.log2(max(image.size))) if max(image.size) > 1 else 0
+
+    level_image = image
+    for level in range(max_level, -1, -1):
+        width, height = level_image.size
+        for row in range(math.ceil(height / TILE_SIZE)):
+            for column in range(math.ceil(width / TILE_SIZE)):
+                box = (
+                    column * TILE_SIZE,
+                    row * TILE_SIZE,
+                    min((column + 1) * TILE_SIZE, width),
+                    min((row + 1) * TILE_SIZE, height),
+                )
+                _save(level_image.crop(box), os.path.join(target, tile_name(level, column, row)))
+
+        if level:
+            # reduce(2): média 2x2, arredonda para cima (igual ao Deep Zoom)
+            level_image = level_image.reduce(2)
+
+    return max_level + 1
+
+
+def _decode(fileobj):
+    """
+    Primeira página (TIFF multipágina) já em 8 bits, com a orientação
+    EXIF aplicada depois da conversão (na cópia menor).
+    """
+    with _pixel_limit(), Image.open(fileobj) as source:
+        frames = getattr(source, "n_frames", 1)
+        source.seek(0)
+        info = {
+            "width": source.width,
+            "height": source.height,
+            "mode": source.mode,
+            "format": source.format,
+            "frames": frames,
+        }
+        orientation = source.getexif().get(ExifTags.Base.Orientation)
+
+        source.load()
+        image = to_display(source)
+        if image is source:
+            # Fora do `with` o arquivo fecha; os pixels já estão carregados
+            image = source.copy() if orientation in EXIF_TRANSPOSE else source
+
+    if orientation in EXIF_TRANSPOSE:
+        image = image.transpose(EXIF_TRANSPOSE[orientation])
+    return image, info
+
+
+def render_previews(path: str, target: str) -> dict:
+    """
+    Gera miniatura, prévia e (imagens grandes) pirâmide em `target`.
+    Multipágina (TIFF): só a primeira página.
+    """
+    # Erro ao abrir o arquivo é de I/O (a fila tenta de novo); OSError
+    # durante a decodificação é arquivo truncado / corrompido
+    with open(path, "rb") as fileobj:
+        try:
+            image, info = _decode(fileobj)
+        except UnidentifiedImageError:
+            raise
+        except OSError as e:
+            raise ImagePreviewError(f"Imagem ilegível: {e}") from e
+
+    preview = _downscaled(image, PREVIEW_SIZE)
+    _save(preview, os.path.join(target, "preview.jpg"))
+    _save(_downscaled(preview, THUMBNAIL_SIZE), os.path.join(target, "thumb.jpg"))
+
+    large = max(image.size) > PREVIEW_SIZE
+    info["pyramid"] = large
+    if large:
+        info.update(
+            levels=build_pyramid(image, target),
+            tile_size=TILE_SIZE,
+            overlap=0,
+            tile_format=TILE_FORMAT,
+        )
+    return info
+
+
+# ===========================================================
+# CACHE POR CONTEÚDO / FILA
+# ===========================================================
+
+def _cached(content_hash: str):
+    metadata = AttachmentMetadata.objects.filter(
+        content_hash=content_hash, kind=AttachmentMetadata.IMAGE,
+    ).first()
+    # Diretório apagado (limpeza do cache): gera de novo
+    if metadata and metadata.status == AttachmentMetadata.READY and not os.path.isdir(preview_dir(content_hash)):
+        return None
+    return metadata
+
+
+def request_image_preview(sample_file):
+    """Enfileira a geração se o conteúdo ainda não tem prévias"""
+    from core.services.jobs import enqueue
+
+    if not sample_file.sha256 or _cached(sample_file.sha256):
+        return None
+    return enqueue("attachments.image_preview", unique=True, content_hash=sample_file.sha256)
+
+
+def build_image_previews(content_hash: str):
+    """
+    Gera as prévias em um diretório temporário e o publica com rename
+    (quem lê nunca vê uma pirâmide pela metade). Imagem ilegível grava
+    status "failed" (inclusive truncada / corrompida); erro de I/O
+    sobe para a fila tentar de novo.
+    """
+    cached = _cached(content_hash)
+    if cached:
+        return cached
+
+    sample_file = (
+        SampleFile.objects
+        .filter(sha256=content_hash, category="image")
+        .only("id", "file")
+        .first()
+    )
+    if sample_file is None:
+        return None
+
+    final = preview_dir(content_hash)
+    os.makedirs(os.path.dirname(final), exist_ok=True)
+    work = tempfile.mkdtemp(dir=os.path.dirname(final), prefix=".tmp-")
+    try:
+        data = render_previews(sample_file.file.path, work)
+        fields = {"status": AttachmentMetadata.READY, "data": data, "error": ""}
+        # Outro worker já publicou o mesmo conteúdo: fica o dele
+        if not os.path.isdir(final):
+            os.rename(work, final)
+    except (UnidentifiedImageError, Image.DecompressionBombError, ValueError) as e:
+        fields = {"status": AttachmentMetadata.FAILED, "data": {}, "error": str(e)[:1000]}
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    metadata, _ = AttachmentMetadata.objects.update_or_create(
+        content_hash=content_hash, kind=AttachmentMetadata.IMAGE, defaults=fields,
+    )
+    return metadata
+
+
+def image_preview_for(sample_file) -> dict:
+    """Estado para a interface: pending / ready / failed + dimensões"""
+    metadata = _cached(sample_file.sha256) if sample_file.sha256 else None
+    if metadata is None:
+        return {"status": "pending"}
+    result = {"status": metadata.status, "data": metadata.data}
+    if metadata.error:
+        result["error"] = metadata.error
+    return result
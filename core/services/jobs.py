@@ -0,0 +1,321 @@
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import Job, JobLog
+
+
+# Intervalo mínimo entre gravações de progresso/heartbeat de uma tarefa
+PROGRESS_INTERVAL = 1.0  # segundos
+
+# Backoff entre tentativas: RETRY_BASE * 2^(tentativa-1), limitado a RETRY_MAX
+RETRY_BASE = 10  # segundos
+RETRY_MAX = 3600
+
+# Tarefa "running" sem heartbeat por este tempo volta para a fila
+STALE_AFTER = getattr(settings, "JOBS_STALE_AFTER", 300)  # segundos
+
+
+# ===========================================================
+# REGISTRO DE TAREFAS
+# ===========================================================
+
+_registry = {}
+
+
+def task(name: str, max_attempts: int = 3):
+    """
+    Registra `func(ctx, **payload)` como tarefa `name`. O payload é
+    JSON (ids, não instâncias); `ctx` é um JobContext.
+
+        @task("benchling.sync")
+        def sync(ctx, sample_ids):
+            ...
+    """
+    def decorator(func):
+        func.job_name = name
+        func.max_attempts = max_attempts
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name: str):
+    if name not in _registry:
+        raise LookupError(f"Tarefa não registrada: '{name}'.")
+    return _registry[name]
+
+
+class JobCancelled(Exception):
+    """
+    Levantada por JobContext quando o cancelamento foi solicitado.
+    """
+
+
+# ===========================================================
+# ENFILEIRAMENTO
+# ===========================================================
+
+def enqueue(name: str, user=None, priority: int = 0, delay: float = 0, unique: bool = False, **payload) -> Job:
+    """
+    Cria a tarefa e retorna o Job (a view devolve job.pk para polling).
+    Com `unique`, reaproveita uma tarefa idêntica ainda na fila.
+
+    Com settings.JOBS_EAGER a tarefa roda no próprio processo ao fim da
+    transação corrente (testes / desenvolvimento sem worker).
+    """
+    func = get_task(name)
+
+    if unique:
+        pending = Job.objects.filter(kind=name, status=Job.QUEUED, payload=payload).first()
+        if pending:
+            return pending
+
+    job = Job.objects.create(
+        kind=name,
+        payload=payload,
+        priority=priority,
+        max_attempts=func.max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+        created_by=user if user and user.is_authenticated else None,
+    )
+
+    if getattr(settings, "JOBS_EAGER", False):
+        transaction.on_commit(lambda: execute_job(job.pk, worker="eager"))
+
+    return job
+
+
+def cancel_job(job) -> bool:
+    """
+    Na fila: cancela na hora. Em execução: marca cancel_requested, que a
+    tarefa percebe no próximo ctx.progress(). Retorna False se já terminou.
+    """
+    now = timezone.now()
+    if Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+        status=Job.CANCELLED, cancel_requested=True, finished_at=now,
+    ):
+        return True
+    return bool(
+        Job.objects.filter(pk=job.pk, status=Job.RUNNING).update(cancel_requested=True)
+    )
+
+
+# ===========================================================
+# CONTEXTO DE EXECUÇÃO
+# ===========================================================
+
+class JobContext:
+    """
+    Passado à tarefa: progresso, log e verificação de cancelamento.
+
+    O progresso é acumulado em memória e gravado no máximo a cada
+    PROGRESS_INTERVAL, num único UPDATE que também renova o heartbeat
+    e detecta cancelamento (0 linhas = cancel_requested).
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.job_id = job.pk
+        self.payload = job.payload
+        self.user_id = job.created_by_id
+        self._current = job.progress_current
+        self._total = job.progress_total
+        self._message = job.message
+        self._flushed_at = 0.0
+
+    @property
+    def attempt(self) -> int:
+        return self.job.attempts
+
+    def progress(self, current: int, total: int = None, message: str = None, force: bool = False):
+        self._current = current
+        if total is not None:
+            self._total = total
+        if message is not None:
+            self._message = message[:255]
+
+        if force or time.monotonic() - self._flushed_at >= PROGRESS_INTERVAL:
+            self.flush()
+
+    def step(self, n: int = 1, message: str = None):
+        self.progress(self._current + n, message=message)
+
+    def flush(self):
+        self._flushed_at = time.monotonic()
+        alive = Job.objects.filter(
+            pk=self.job_id, status=Job.RUNNING, cancel_requested=False,
+        ).update(
+            progress_current=self._current,
+            progress_total=self._total,
+            message=self._message,
+            heartbeat_at=timezone.now(),
+        )
+        if not alive:
+            raise JobCancelled()
+
+    def log(self, message: str, level: str = "info"):
+        JobLog.objects.create(job_id=self.job_id, level=level, message=message)
+
+
+# ===========================================================
+# EXECUÇÃO (WORKER)
+# ===========================================================
+
+def default_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def retry_delay(attempt: int) -> int:
+    return min(RETRY_BASE * 2 ** max(attempt - 1, 0), RETRY_MAX)
+
+
+def claim_jobs(worker: str, limit: int, kinds=None) -> list:
+    """
+    Reivindica até `limit` tarefas liberadas (prioridade, depois ordem
+    de chegada). Cada uma por UPDATE condicional: se outro worker
+    pegou antes, o UPDATE afeta 0 linhas e a tarefa é pulada.
+    """
+    now = timezone.now()
+    candidates = Job.objects.filter(status=Job.QUEUED, run_after__lte=now)
+    if kinds:
+        candidates = candidates.filter(kind__in=kinds)
+    candidates = candidates.order_by("-priority", "run_after", "pk").values_list("pk", flat=True)
+
+    claimed = []
+    for pk in candidates[:limit * 2]:
+        if Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            worker=worker,
+            attempts=F("attempts") + 1,
+            started_at=now,
+            heartbeat_at=now,
+            finished_at=None,
+        ):
+            claimed.append(pk)
+            if len(claimed) >= limit:
+                break
+    return claimed
+
+
+def heartbeat(job_ids):
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, status=Job.RUNNING).update(heartbeat_at=timezone.now())
+
+
+def requeue_stale_jobs(stale_after: int = STALE_AFTER) -> int:
+    """
+    Tarefas "running" sem heartbeat (worker morto) voltam para a fila,
+    ou falham se já esgotaram as tentativas.
+    """
+    now = timezone.now()
+    stale = Q(status=Job.RUNNING, heartbeat_at__lt=now - timedelta(seconds=stale_after))
+
+    failed = Job.objects.filter(stale, attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED,
+        error="Worker interrompido (sem heartbeat).",
+        finished_at=now,
+    )
+    requeued = Job.objects.filter(stale).update(
+        status=Job.QUEUED,
+        worker="",
+        run_after=now,
+    )
+    return failed + requeued
+
+
+def _finish(job_id, **fields):
+    fields.setdefault("finished_at", timezone.now())
+    return Job.objects.filter(pk=job_id, status=Job.RUNNING).update(**fields)
+
+
+def execute_job(job_id: int, worker: str = "") -> str:
+    """
+    Executa uma tarefa já reivindicada (ou, no modo eager, ainda na
+    fila) e grava o resultado. Exceções viram retry com backoff até
+    max_attempts. Retorna o status final.
+
+    Função de módulo (picklable) para rodar em pool de processos.
+    """
+    close_old_connections()
+    try:
+        if worker == "eager":
+            Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+                status=Job.RUNNING, worker=worker, attempts=F("attempts") + 1,
+                started_at=timezone.now(), heartbeat_at=timezone.now(),
+            )
+
+        job = Job.objects.select_related("created_by").get(pk=job_id)
+        if job.status != Job.RUNNING:
+            return job.status
+
+        ctx = JobContext(job)
+        try:
+            result = get_task(job.kind)(ctx, **job.payload)
+        except JobCancelled:
+            ctx.log("Cancelada a pedido do usuário.", level="warning")
+            _finish(job_id, status=Job.CANCELLED)
+            return Job.CANCELLED
+        except Exception as e:
+            ctx.log(traceback.format_exc(), level="error")
+            if job.attempts < job.max_attempts:
+                delay = retry_delay(job.attempts)
+                ctx.log(f"Nova tentativa em {delay}s ({job.attempts}/{job.max_attempts}).", level="warning")
+                _finish(
+                    job_id,
+                    status=Job.QUEUED,
+                    error=str(e),
+                    run_after=timezone.now() + timedelta(seconds=delay),
+                    finished_at=None,
+                )
+                return Job.QUEUED
+
+            _finish(job_id, status=Job.FAILED, error=str(e))
+            return Job.FAILED
+
+        _finish(
+            job_id,
+            status=Job.SUCCEEDED,
+            result=result,
+            error="",
+            progress_current=ctx._total or ctx._current,
+            progress_total=ctx._total,
+            message=ctx._message,
+        )
+        return Job.SUCCEEDED
+    finally:
+        close_old_connections()
+
+
+def job_summary(job, after_log: int = 0) -> dict:
+    """
+    Estado da tarefa para polling; `after_log` devolve só os logs novos.
+    """
+    logs = job.logs.filter(pk__gt=after_log).values("id", "timestamp", "level", "message")
+    return {
+        "id": job.pk,
+        "kind": job.kind,
+        "status": job.status,
+        "finished": job.is_finished,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "progress": {
+            "current": job.progress_current,
+            "total": job.progress_total,
+            "percent": job.percent,
+            "message": job.message,
+        },
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "logs": list(logs),
+    }
@@ -0,0 +1,246 @@
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from django.db import transaction
+
+from core.models import Keyword, KeywordValue
+
+
+# Separador usado pelos formulários ("chave:::valor")
+PAIR_SEPARATOR = ":::"
+
+CACHE_SIZE = 4096
+
+# Versão do cache no cache compartilhado entre processos (o mesmo das
+# permissões): trocá-la esvazia o LRU de todos os workers
+SHARED_CACHE_ALIAS = "permissions"
+VERSION_KEY = "keywords:version"
+
+
+# ===========================================================
+# CACHE EM PROCESSO (chave, valor) → id de KeywordValue
+# ===========================================================
+
+class _KeywordValueCache:
+    """
+    LRU pequeno e thread-safe, local ao processo. Os signals de
+    Keyword / KeywordValue (ver core/signals.py) trocam a versão no
+    cache compartilhado; cada processo compara a versão a cada
+    resolução e descarta o LRU quando ela muda.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.version = None
+        self._entries = OrderedDict()
+        self._keys_by_id = {}
+        self._lock = threading.Lock()
+
+    def sync(self, version):
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self._keys_by_id.clear()
+                self.version = version
+
+    def get_many(self, pairs) -> dict:
+        found = {}
+        with self._lock:
+            for pair in pairs:
+                pk = self._entries.get(pair)
+                if pk is not None:
+                    self._entries.move_to_end(pair)
+                    found[pair] = pk
+        return found
+
+    def set_many(self, mapping: dict):
+        with self._lock:
+            for pair, pk in mapping.items():
+                self._entries[pair] = pk
+                self._entries.move_to_end(pair)
+                self._keys_by_id[pk] = pair
+
+            while len(self._entries) > self.size:
+                pair, pk = self._entries.popitem(last=False)
+                self._keys_by_id.pop(pk, None)
+
+    def discard_id(self, pk):
+        with self._lock:
+            pair = self._keys_by_id.pop(pk, None)
+            if pair is not None:
+                self._entries.pop(pair, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_id.clear()
+
+
+_cache = _KeywordValueCache(CACHE_SIZE)
+
+
+def _shared_cache():
+    try:
+        return caches[SHARED_CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches["default"]
+
+
+def _shared_version() -> str:
+    cache = _shared_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_keyword_cache():
+    """
+    Esvazia o cache deste processo na hora e, após o commit, troca a
+    versão compartilhada (os outros processos descartam o LRU na
+    próxima resolução). Trocar antes do commit deixaria outro processo
+    recolocar no cache o valor que ainda está sendo apagado.
+    """
+    _cache.clear()
+    transaction.on_commit(lambda: _shared_cache().set(VERSION_KEY, uuid.uuid4().hex, None))
+
+
+# ===========================================================
+# PARSING
+# ===========================================================
+
+def parse_keyword_pairs(raw_values, separator: str = PAIR_SEPARATOR) -> list:
+    """
+    ["chave:::valor", ...] → [(chave, valor), ...], sem duplicatas e
+    ignorando entradas malformadas ou vazias.
+    """
+    pairs = []
+    for raw in raw_values:
+        if separator not in raw:
+            continue
+
+        key, value = raw.split(separator, 1)
+        key, value = key.strip(), value.strip()
+        if key and value and (key, value) not in pairs:
+            pairs.append((key, value))
+    return pairs
+
+
+# ===========================================================
+# RESOLUÇÃO EM LOTE
+# ===========================================================
+
+def _keyword_ids(names) -> dict:
+    ids = dict(Keyword.objects.filter(name__in=names).values_list("name", "id"))
+
+    missing = names - ids.keys()
+    if missing:
+        Keyword.objects.bulk_create(
+            [Keyword(name=n) for n in missing],
+            ignore_conflicts=True,
+        )
+        ids.update(
+            Keyword.objects.filter(name__in=missing).values_list("name", "id")
+        )
+    return ids
+
+
+def _value_ids(wanted) -> dict:
+    """
+    {(keyword_id, valor): id} para os pares pedidos. Filtra por
+    keyword_id IN / value IN e descarta combinações cruzadas em Python.
+    """
+    found = {}
+    candidates = KeywordValue.objects.filter(
+        keyword_id__in={kid for kid, _ in wanted},
+        value__in={v for _, v in wanted},
+    ).values_list("id", "keyword_id", "value")
+
+    for pk, kid, value in candidates:
+        if (kid, value) in wanted:
+            found[(kid, value)] = pk
+    return found
+
+
+def _existing(cached) -> dict:
+    """
+    Confere os ids vindos do cache com uma query: um KeywordValue
+    apagado por outro processo antes da troca de versão viraria uma FK
+    inválida na tabela through. Os que sumiram saem do cache e são
+    resolvidos de novo no banco.
+    """
+    alive = set(
+        KeywordValue.objects.filter(pk__in=cached.values()).values_list("pk", flat=True)
+    )
+    for pk in set(cached.values()) - alive:
+        _cache.discard_id(pk)
+    return {pair: pk for pair, pk in cached.items() if pk in alive}
+
+
+def resolve_keyword_values(pairs) -> dict:
+    """
+    Resolve ou cria os KeywordValues de `pairs` [(chave, valor), ...]
+    com um número constante de queries (bulk_create com
+    ignore_conflicts + re-select, seguro sob requests concorrentes).
+
+    Retorna {(chave, valor): keywordvalue_id}.
+    """
+    pairs = set(pairs)
+    _cache.sync(_shared_version())
+    resolved = _cache.get_many(pairs)
+    if resolved:
+        resolved = _existing(resolved)
+
+    missing = pairs - resolved.keys()
+    if not missing:
+        return resolved
+
+    keyword_ids = _keyword_ids({k for k, _ in missing})
+    wanted = {(keyword_ids[k], v) for k, v in missing}
+
+    found = _value_ids(wanted)
+    existing = {(k, v) for k, v in missing if (keyword_ids[k], v) in found}
+
+    new = wanted - found.keys()
+    if new:
+        KeywordValue.objects.bulk_create(
+            [KeywordValue(keyword_id=kid, value=v) for kid, v in new],
+            ignore_conflicts=True,
+        )
+        found.update(_value_ids(new))
+
+    fetched = {(k, v): found[(keyword_ids[k], v)] for k, v in missing}
+    _cache.set_many({pair: fetched[pair] for pair in existing})
+
+    # Valores criados só entram no cache se a transação for confirmada
+    created = {pair: pk for pair, pk in fetched.items() if pair not in existing}
+    if created:
+        transaction.on_commit(lambda: _cache.set_many(created))
+
+    resolved.update(fetched)
+    return resolved
+
+
+def attach_keywords(obj, pairs) -> list:
+    """
+    Vincula os pares a um Biobank, Collection ou Sample com um único
+    INSERT na tabela through. Retorna os ids de KeywordValue.
+    """
+    kv_ids = list(resolve_keyword_values(pairs).values())
+    if not kv_ids:
+        return kv_ids
+
+    field = obj._meta.get_field("keywords")
+    through = field.remote_field.through
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+
+    through.objects.bulk_create(
+        [through(**{source: obj.pk, target: kv_id}) for kv_id in kv_ids],
+        ignore_conflicts=True,
+    )
+    return kv_ids
@@ -0,0 +1,188 @@
+import io
+import math
+import os
+import tempfile
+
+import qrcode
+from django.conf import settings
+
+
+# Níveis de correção de erro aceitos (?ec=)
+ERROR_CORRECTION = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+DEFAULT_ERROR_CORRECTION = "L"
+
+# QRs que faltam gerados no próprio request; acima disso o restante vai
+# para a fila (labels.render_qr) e o sample_qr_view cobre o que a
+# tarefa ainda não gerou
+INLINE_QR_LIMIT = getattr(settings, "LABEL_QR_INLINE", 200)
+
+
+# ===========================================================
+# LAYOUT DAS FOLHAS
+# ===========================================================
+
+class LabelLayout:
+    """
+    Grade de etiquetas por folha (medidas em mm).
+    """
+
+    PRESETS = {
+        # Rolo de criotubo: uma etiqueta 25x25 por "folha"
+        "cryo": dict(columns=1, rows=1, width=25, height=25, gap=0, margin=1),
+        # A4 com etiquetas quadradas 25x25 (70 por folha)
+        "a4-25": dict(columns=7, rows=10, width=25, height=25, gap=3, margin=5),
+        # A4 padrão de 65 etiquetas (38,1 x 21,2)
+        "a4-65": dict(columns=5, rows=13, width=38.1, height=21.2, gap=0, margin=5),
+    }
+    DEFAULT_PRESET = "a4-25"
+
+    LIMITS = {
+        "columns": (1, 20),
+        "rows": (1, 40),
+        "width": (10, 200),
+        "height": (10, 200),
+        "gap": (0, 20),
+        "margin": (0, 30),
+    }
+
+    def __init__(self, columns, rows, width, height, gap=0, margin=0):
+        self.columns = int(columns)
+        self.rows = int(rows)
+        self.width = float(width)
+        self.height = float(height)
+        self.gap = float(gap)
+        self.margin = float(margin)
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Preset (?layout=) com sobrescritas opcionais por parâmetro
+        (?columns=&rows=&width=&height=&gap=&margin=), limitadas a
+        faixas razoáveis.
+        """
+        values = dict(cls.PRESETS.get(params.get("layout"), cls.PRESETS[cls.DEFAULT_PRESET]))
+
+        for name, (low, high) in cls.LIMITS.items():
+            raw = params.get(name)
+            if not raw:
+                continue
+            try:
+                value = float(raw)
+            except ValueError:
+                continue
+            # "nan" / "inf" passam pelo float() e pelo min/max
+            if not math.isfinite(value):
+                continue
+            values[name] = min(max(value, low), high)
+
+        return cls(**values)
+
+    @property
+    def per_sheet(self) -> int:
+        return self.columns * self.rows
+
+    @property
+    def sheet_width(self) -> float:
+        return self.columns * self.width + (self.columns - 1) * self.gap + 2 * self.margin
+
+    @property
+    def sheet_height(self) -> float:
+        return self.rows * self.height + (self.rows - 1) * self.gap + 2 * self.margin
+
+    @property
+    def qr_size(self) -> float:
+        # QR ocupa ~60% do menor lado (o restante fica para o texto)
+        return round(min(self.width, self.height) * 0.6, 2)
+
+    def sheets(self, items) -> list:
+        items = list(items)
+        return [
+            items[i:i + self.per_sheet]
+            for i in range(0, len(items), self.per_sheet)
+        ]
+
+
+# ===========================================================
+# QR CODES (cache persistente em disco)
+# ===========================================================
+
+def normalize_level(level) -> str:
+    level = (level or DEFAULT_ERROR_CORRECTION).upper()
+    return level if level in ERROR_CORRECTION else DEFAULT_ERROR_CORRECTION
+
+
+def qr_path(sample_uuid, level: str) -> str:
+    """
+    Caminho do PNG em cache: QR_CACHE_ROOT/<2 primeiros>/<uuid>-<nível>.png
+    """
+    name = str(sample_uuid)
+    return os.path.join(settings.QR_CACHE_ROOT, name[:2], f"{name}-{level}.png")
+
+
+def render_qr_png(data: str, level: str) -> bytes:
+    """
+    Gera o PNG do QR (alguns ms; sem ORM).
+    """
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=ERROR_CORRECTION[level],
+        box_size=10,
+        border=0,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    buf = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _write_atomic(path: str, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def missing_qr_images(uuids, level: str) -> list:
+    return [str(u) for u in dict.fromkeys(uuids) if not os.path.exists(qr_path(u, level))]
+
+
+def ensure_qr_images(uuids, level: str) -> int:
+    """
+    Garante os PNGs em cache para `uuids`, no próprio processo. Lotes
+    grandes ficam para a fila (request_qr_images / labels.render_qr),
+    onde o paralelismo vem dos workers. Retorna quantos foram gerados.
+    """
+    missing = missing_qr_images(uuids, level)
+    for sample_uuid in missing:
+        _write_atomic(qr_path(sample_uuid, level), render_qr_png(sample_uuid, level))
+    return len(missing)
+
+
+def request_qr_images(samples, level: str, user=None):
+    """
+    Prepara os QRs de uma folha de etiquetas: até INLINE_QR_LIMIT
+    gerados já; o restante enfileirado (retorna o Job, ou None).
+    """
+    missing = set(missing_qr_images([s.uuid for s in samples], level))
+    pending = [s for s in samples if str(s.uuid) in missing]
+
+    ensure_qr_images([s.uuid for s in pending[:INLINE_QR_LIMIT]], level)
+    rest = pending[INLINE_QR_LIMIT:]
+    if not rest:
+        return None
+
+    from core.services.jobs import enqueue
+    return enqueue("labels.render_qr", user=user, sample_ids=[s.pk for s in rest], level=level)
@@ -0,0 +1,196 @@
+import gzip
+import io
+import os
+import time
+
+from Bio import SeqIO
+from django.db import transaction
+
+from core.models.lab_tools import MolecularSequence
+from core.models.samples.sample_files import split_extension
+from core.services.sequence_packing import sequence_hash
+
+
+# Registros por bulk_create (e teto de bytes compactados por lote:
+# um lote de genomas de fago não pode virar centenas de MB em memória)
+BATCH_SIZE = 200
+BATCH_BYTES = 32 * 1024 * 1024
+
+# Acima disto a view enfileira a importação em vez de processar na hora
+INLINE_MAX_SIZE = 5 * 1024 * 1024
+
+# Erros guardados no relatório (o resto só entra na contagem)
+MAX_ERRORS = 100
+
+FASTA_EXTENSIONS = {".fasta", ".fa", ".fna", ".faa", ".ffn", ".fas"}
+
+# Alfabeto IUPAC por tipo ("-" / "." = gap, "*" = códon de parada)
+ALPHABETS = {
+    "DNA": frozenset(b"ACGTURYSWKMBDHVN-."),
+    "PROTEIN": frozenset(b"ACDEFGHIKLMNPQRSTVWYBXZJUO*-."),
+}
+
+
+# ===========================================================
+# RELATÓRIO
+# ===========================================================
+
+class FastaImportReport:
+    """
+    Resultado de uma importação multi-FASTA.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def add_error(self, record, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"record": record, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+# ===========================================================
+# IMPORTADOR
+# ===========================================================
+
+def is_fasta(filename: str) -> bool:
+    ext, _ = split_extension(filename)
+    return ext in FASTA_EXTENSIONS
+
+
+def invalid_letters(residues: bytes, seq_type: str) -> str:
+    """Letras fora do alfabeto (vazio = válido)"""
+    return "".join(sorted({chr(b) for b in set(residues) - ALPHABETS[seq_type]}))
+
+
+class FastaImporter:
+    """
+    Lê o multi-FASTA registro a registro (SeqIO.parse é um iterador:
+    só um registro em memória por vez), valida o alfabeto, descarta
+    sequências repetidas (no arquivo e já no banco, pelo SHA-256 do
+    conteúdo normalizado) e grava com bulk_create, uma transação por
+    lote. A constraint única (seq_type, sequence_hash) garante a
+    deduplicação mesmo com importações simultâneas do mesmo painel.
+    """
+
+    def __init__(self, seq_type: str, author, description: str = "", batch_size: int = BATCH_SIZE):
+        if seq_type not in ALPHABETS:
+            raise ValueError("Importação FASTA só para DNA ou PROTEIN.")
+        self.seq_type = seq_type
+        self.author = author
+        self.description = description
+        self.batch_size = batch_size
+        self.report = FastaImportReport()
+        self._seen = set()
+        self._batch = []
+        self._batch_bytes = 0
+
+    def add(self, record):
+        self.report.total += 1
+        name = record.id or f"registro {self.report.total}"
+        residues = bytes(record.seq).upper()
+
+        if not residues:
+            self.report.add_error(name, "Sequência vazia.")
+            return
+        bad = invalid_letters(residues, self.seq_type)
+        if bad:
+            self.report.add_error(name, f"Caracteres inválidos para {self.seq_type}: {bad}")
+            return
+
+        content_hash = sequence_hash(residues)
+        if content_hash in self._seen:
+            self.report.duplicates += 1
+            return
+        self._seen.add(content_hash)
+
+        sequence = MolecularSequence(
+            name=name[:255],
+            seq_type=self.seq_type,
+            description=(record.description[len(record.id):].strip() or self.description),
+            author=self.author,
+        )
+        sequence.set_content(residues)
+        self._batch.append(sequence)
+        self._batch_bytes += len(sequence.packed_data) + len(sequence.exceptions)
+
+        if len(self._batch) >= self.batch_size or self._batch_bytes >= BATCH_BYTES:
+            self.flush()
+
+    def flush(self):
+        if not self._batch:
+            return
+        stored = MolecularSequence.objects.filter(
+            seq_type=self.seq_type,
+            sequence_hash__in=[s.sequence_hash for s in self._batch],
+        )
+
+        with transaction.atomic():
+            # Já no banco: nem envia o conteúdo. O que outra importação
+            # gravar no meio tempo cai no ignore_conflicts
+            existing = set(stored.values_list("sequence_hash", flat=True))
+            new = [s for s in self._batch if s.sequence_hash not in existing]
+            MolecularSequence.objects.bulk_create(new, ignore_conflicts=True)
+
+            # ignore_conflicts não diz quais linhas entraram: são as que
+            # voltam com o created_at preenchido aqui pelo bulk_create
+            ours = {(s.sequence_hash, s.created_at) for s in new}
+            created = sum(
+                1 for row in stored.values_list("sequence_hash", "created_at") if row in ours
+            ) if new else 0
+
+        self.report.created += created
+        self.report.duplicates += len(self._batch) - created
+        self._batch = []
+        self._batch_bytes = 0
+
+    def run(self, handle, on_progress=None) -> FastaImportReport:
+        started = time.perf_counter()
+        try:
+            for record in SeqIO.parse(handle, "fasta"):
+                self.add(record)
+                if on_progress and self.report.total % self.batch_size == 0:
+                    on_progress(self.report)
+        except (ValueError, EOFError, gzip.BadGzipFile) as e:
+            # Arquivo malformado / gzip truncado: o que já foi lido é gravado mesmo assim
+            self.report.add_error(f"após o registro {self.report.total}", str(e) or type(e).__name__)
+        self.flush()
+        self.report.elapsed = time.perf_counter() - started
+        return self.report
+
+
+def import_fasta(fileobj, filename, seq_type, author, description="", ctx=None) -> FastaImportReport:
+    """
+    Importa um multi-FASTA (opcionalmente .gz) de `fileobj` binário.
+    Com `ctx` (tarefa em segundo plano), o progresso é medido em bytes
+    lidos do arquivo.
+    """
+    if not is_fasta(filename):
+        raise ValueError(f"Extensão não reconhecida como FASTA: {filename}")
+
+    _, gzipped = split_extension(filename)
+    size = fileobj.seek(0, os.SEEK_END)
+    fileobj.seek(0)
+    stream = gzip.GzipFile(fileobj=fileobj) if gzipped else fileobj
+    handle = io.TextIOWrapper(stream, encoding="ascii", errors="replace")
+
+    def on_progress(report):
+        if ctx is not None:
+            ctx.progress(fileobj.tell(), total=size, message=f"{report.total} registros lidos")
+
+    return FastaImporter(seq_type, author, description).run(handle, on_progress)
@@ -0,0 +1,67 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+# ===========================================================
+# CURSOR (keyset em created_at, id)
+# ===========================================================
+
+def encode_cursor(created_at, pk) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    Retorna (created_at, pk) ou None para cursores inválidos.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    if created_at is None:
+        return None
+    return created_at, pk
+
+
+# ===========================================================
+# PÁGINA
+# ===========================================================
+
+def keyset_page(queryset, cursor=None, page_size: int = 50):
+    """
+    Página de `queryset` ordenada por (-created_at, -id) a partir do
+    cursor. O custo é o mesmo em qualquer profundidade: a posição vira
+    um WHERE sobre o índice composto, não um OFFSET.
+
+    Retorna (itens, próximo_cursor | None).
+    """
+    queryset = queryset.order_by("-created_at", "-id")
+
+    position = decode_cursor(cursor)
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at)
+            | Q(created_at=created_at, id__lt=pk)
+        )
+
+    items = list(queryset[:page_size + 1])
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.pk)
+
+    return items, next_cursor
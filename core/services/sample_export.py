@@ -0,0 +1,182 @@
+import csv
+import json
+from collections import defaultdict
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from core.models import Event, Sample, SampleFile
+
+
+CHUNK_SIZE = 2000
+
+# Colunas exportadas (mesma ordem no CSV e no JSONL)
+EXPORT_FIELDS = (
+    "sample_id",
+    "uuid",
+    "organism_name",
+    "sample_type",
+    "status",
+    "visibility",
+    "collection",
+    "biobank",
+    "location",
+    "tags",
+    "keywords",
+    "file_count",
+    "created_at",
+)
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+
+# ===========================================================
+# CONSULTA
+# ===========================================================
+
+def export_queryset(queryset):
+    """
+    Colunas escalares do export (uma linha por Sample, sem JOIN em
+    M2M). A localização mais recente é o storage_location atual ou,
+    na falta dele, o snapshot do último Event.
+    """
+    last_location = Subquery(
+        Event.objects
+        .filter(sample=OuterRef("pk"))
+        .exclude(location_snapshot__isnull=True)
+        .order_by("-timestamp", "-id")
+        .values("location_snapshot")[:1]
+    )
+
+    return (
+        queryset
+        .annotate(
+            collection_name=F("collection__name"),
+            biobank_name=F("biobank__name"),
+            location=Coalesce("storage_location", last_location),
+        )
+        .order_by("id")
+        .values(
+            "id", "sample_id", "uuid", "organism_name", "sample_type",
+            "status", "visibility", "collection_name", "biobank_name",
+            "location", "created_at",
+        )
+    )
+
+
+def _related(sample_ids):
+    """
+    Tags, pares de keyword e contagem de arquivos de um lote de
+    Samples (três queries por lote).
+    """
+    tags = defaultdict(list)
+    for sid, name in (
+        Sample.tags.through.objects
+        .filter(sample_id__in=sample_ids)
+        .order_by("tag__name")
+        .values_list("sample_id", "tag__name")
+    ):
+        tags[sid].append(name)
+
+    keywords = defaultdict(list)
+    for sid, key, value in (
+        Sample.keywords.through.objects
+        .filter(sample_id__in=sample_ids)
+        .order_by("keywordvalue__keyword__name", "keywordvalue__value")
+        .values_list("sample_id", "keywordvalue__keyword__name", "keywordvalue__value")
+    ):
+        keywords[sid].append(f"{key}={value}")
+
+    file_counts = dict(
+        SampleFile.objects
+        .filter(sample_id__in=sample_ids)
+        .values("sample_id")
+        .annotate(total=Count("id"))
+        .values_list("sample_id", "total")
+    )
+    return tags, keywords, file_counts
+
+
+def iter_export_rows(queryset, chunk_size: int = CHUNK_SIZE):
+    """
+    Gera dicts prontos para serialização em memória constante:
+    `.iterator(chunk_size)` nas colunas escalares e prefetch manual
+    dos M2M por lote.
+    """
+    rows = export_queryset(queryset).iterator(chunk_size=chunk_size)
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield from _with_related(chunk)
+            chunk = []
+    if chunk:
+        yield from _with_related(chunk)
+
+
+def _with_related(chunk):
+    tags, keywords, file_counts = _related([row["id"] for row in chunk])
+
+    for row in chunk:
+        yield {
+            "sample_id": row["sample_id"],
+            "uuid": str(row["uuid"]),
+            "organism_name": row["organism_name"] or "",
+            "sample_type": row["sample_type"] or "",
+            "status": row["status"],
+            "visibility": row["visibility"],
+            "collection": row["collection_name"] or "",
+            "biobank": row["biobank_name"] or "",
+            "location": row["location"] or "",
+            "tags": tags.get(row["id"], []),
+            "keywords": keywords.get(row["id"], []),
+            "file_count": file_counts.get(row["id"], 0),
+            "created_at": row["created_at"].isoformat(),
+        }
+
+
+# ===========================================================
+# SERIALIZAÇÃO
+# ===========================================================
+
+class _Echo:
+    """
+    Buffer "de passagem" para o csv.writer (write devolve a linha).
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+
+    for row in rows:
+        yield writer.writerow([
+            ";".join(row[f]) if isinstance(row[f], list) else row[f]
+            for f in EXPORT_FIELDS
+        ])
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+SERIALIZERS = {
+    "csv": iter_csv,
+    "jsonl": iter_jsonl,
+}
+
+
+def export_samples(queryset, fmt: str = "csv", chunk_size: int = CHUNK_SIZE):
+    """
+    Gera o export serializado (str por linha) de `queryset`, que deve
+    vir já restrito aos Samples visíveis (`visible_to`).
+    """
+    return SERIALIZERS[fmt](iter_export_rows(queryset, chunk_size=chunk_size))
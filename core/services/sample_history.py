@@ -0,0 +1,76 @@
+from django.utils import timezone
+
+from core.models import Event, Sample
+
+
+CHUNK_SIZE = 1000
+
+STATUS_LABELS = dict(Sample.STATUS_CHOICES)
+
+
+# ===========================================================
+# EVENTOS A PARTIR DAS ALTERAÇÕES
+# ===========================================================
+
+def history_events(sample_id, changes: dict, performed_by=None, location=None, timestamp=None) -> list:
+    """
+    Events (não salvos) correspondentes a {campo: (antigo, novo)}.
+    `location` é a localização atual, usada no snapshot das mudanças
+    de status. Em lotes, passe um `timestamp` comum (evita um
+    timezone.now() por Event).
+    """
+    events = []
+    timestamp = timestamp or timezone.now()
+    performed_by_id = performed_by.pk if performed_by else None
+
+    # 1. Rastreio de Movimentação Física (MAPA/LOG)
+    if "storage_location" in changes:
+        old, new = changes["storage_location"]
+        events.append(Event(
+            sample_id=sample_id,
+            event_type="transfer",
+            location_snapshot=new or "N/A",
+            notes=f"Movimentação detectada: De '{old}' para '{new}'",
+            timestamp=timestamp,
+            performed_by_id=performed_by_id,
+        ))
+
+    # 2. Rastreio de Mudança de Status (Controle de Qualidade)
+    if "status" in changes:
+        old, new = changes["status"]
+        events.append(Event(
+            sample_id=sample_id,
+            event_type="qc_update",
+            location_snapshot=location,
+            notes=(
+                f"Status alterado: {STATUS_LABELS.get(old, old)} -> "
+                f"{STATUS_LABELS.get(new, new)}"
+            ),
+            timestamp=timestamp,
+            performed_by_id=performed_by_id,
+        ))
+
+    return events
+
+
+def insert_status_events(rows, target: str, performed_by=None, timestamp=None, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Grava o Event "qc_update" de cada linha (pk, status antigo,
+    storage_location), lida com values_list antes do UPDATE de status,
+    com bulk_create em lotes. Mesmo formato de history_events.
+    """
+    timestamp = timestamp or timezone.now()
+
+    created = 0
+    for start in range(0, len(rows), chunk_size):
+        events = []
+        for pk, status, location in rows[start:start + chunk_size]:
+            events += history_events(
+                pk,
+                {"status": (status, target)},
+                performed_by=performed_by,
+                location=location or "N/A",
+                timestamp=timestamp,
+            )
+        created += len(Event.objects.bulk_create(events))
+    return created
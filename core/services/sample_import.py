@@ -0,0 +1,422 @@
+import csv
+import io
+import os
+import time
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from core.models import (
+    Biobank,
+    Collection,
+    Event,
+    Sample,
+    Tag,
+)
+from core.permissions.index import PermissionIndex
+from core.services.keywords import resolve_keyword_values
+
+
+CHUNK_SIZE = 1000
+
+# Colunas reconhecidas no manifesto (cabeçalho, sem diferenciar caixa)
+COLUMNS = (
+    "sample_id",
+    "organism_name",
+    "sample_type",
+    "collection",
+    "biobank",
+    "storage_location",
+    "status",
+    "visibility",
+    "notes",
+    "tags",
+    "keywords",
+)
+
+# Separadores dentro das células multi-valor
+LIST_SEPARATOR = ";"
+KEYWORD_SEPARATORS = (":::", "=")
+
+
+# ===========================================================
+# LEITURA EM STREAMING (CSV / TSV / XLSX)
+# ===========================================================
+
+def detect_format(filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".xlsx":
+        return "xlsx"
+    if ext in (".tsv", ".tab", ".txt"):
+        return "tsv"
+    return "csv"
+
+
+def _normalize_header(header) -> list:
+    return [(h or "").strip().lower() for h in header]
+
+
+def iter_rows(fileobj, fmt: str):
+    """
+    Gera (número_da_linha, {coluna: valor}) sem carregar o arquivo
+    inteiro. `fileobj` deve ser binário.
+    """
+    if fmt == "xlsx":
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportError("Importação de XLSX requer o pacote 'openpyxl'.")
+
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = _normalize_header(next(rows, []))
+            for line, values in enumerate(rows, start=2):
+                if not any(v not in (None, "") for v in values):
+                    continue
+                yield line, {
+                    col: "" if v is None else str(v).strip()
+                    for col, v in zip(header, values)
+                }
+        finally:
+            workbook.close()
+        return
+
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text, delimiter="\t" if fmt == "tsv" else ",")
+        header = _normalize_header(next(reader, []))
+        for line, values in enumerate(reader, start=2):
+            if not any(v.strip() for v in values):
+                continue
+            yield line, {
+                col: v.strip() for col, v in zip(header, values)
+            }
+    finally:
+        text.detach()
+
+
+def _chunks(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _split_list(value: str) -> list:
+    return [v.strip() for v in (value or "").split(LIST_SEPARATOR) if v.strip()]
+
+
+def _split_keywords(value: str) -> list:
+    """
+    "chave:::valor; chave=valor" → [(chave, valor), ...]
+    """
+    pairs = []
+    for raw in _split_list(value):
+        for sep in KEYWORD_SEPARATORS:
+            if sep in raw:
+                key, val = raw.split(sep, 1)
+                pairs.append((key.strip(), val.strip()))
+                break
+        else:
+            pairs.append((raw, ""))
+    return pairs
+
+
+# ===========================================================
+# RELATÓRIO
+# ===========================================================
+
+class ImportReport:
+    """
+    Resultado de uma importação (ou simulação) de Samples.
+    """
+
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.total = 0
+        self.valid = 0
+        self.created = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def add_error(self, line, sample_id, message):
+        self.errors.append({"line": line, "sample_id": sample_id, "error": message})
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.total / self.elapsed, 1) if self.elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "total": self.total,
+            "valid": self.valid,
+            "created": self.created,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+# ===========================================================
+# IMPORTADOR
+# ===========================================================
+
+class SampleImporter:
+    """
+    Importa Samples em lotes: valida cada lote com lookups em conjunto
+    (IDs existentes, Collections, Tags, Keywords) e grava Sample, tabelas
+    through de tags/keywords e o Event inicial com bulk_create, em uma
+    transação por lote.
+
+    Tags precisam existir (nome desconhecido é erro da linha, não Tag
+    nova); Keywords chave=valor são criadas sob demanda.
+
+    Em `dry_run` apenas valida e reporta erros por linha.
+    """
+
+    valid_status = {key for key, _ in Sample.STATUS_CHOICES}
+    valid_visibility = {key for key, _ in Sample.VISIBILITY_CHOICES}
+
+    def __init__(self, user, dry_run: bool = False, chunk_size: int = CHUNK_SIZE):
+        self.user = user
+        self.dry_run = dry_run
+        self.chunk_size = chunk_size
+        self.index = PermissionIndex.for_user(user)
+
+        self._seen_ids = set()
+        self._collections = {}
+        self._biobanks = {}
+        self._tags = {}
+
+    def run(self, rows) -> ImportReport:
+        report = ImportReport(self.dry_run)
+        started = time.perf_counter()
+
+        for chunk in _chunks(rows, self.chunk_size):
+            report.total += len(chunk)
+            valid = self._validate(chunk, report)
+            report.valid += len(valid)
+
+            if valid and not self.dry_run:
+                report.created += self._write(valid, report)
+
+        self.index.save()
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    # -------------------------------------------------------
+    # RESOLUÇÃO EM CONJUNTO
+    # -------------------------------------------------------
+
+    def _resolve(self, cache, model, refs, select_related=()):
+        """
+        Resolve referências (id ou nome) ainda não vistas com uma query.
+        """
+        missing = [r for r in refs if r not in cache]
+        if not missing:
+            return
+
+        ids = [int(r) for r in missing if r.isdigit()]
+        names = [r for r in missing if not r.isdigit()]
+
+        by_name = {}
+        qs = model.objects.filter(Q(pk__in=ids) | Q(name__in=names))
+        for obj in qs.select_related(*select_related):
+            cache[str(obj.pk)] = obj
+            by_name.setdefault(obj.name, []).append(obj)
+
+        for name in names:
+            matches = by_name.get(name, [])
+            cache[name] = matches[0] if len(matches) == 1 else (
+                "ambiguous" if matches else None
+            )
+        for r in missing:
+            cache.setdefault(r, None)
+
+    # -------------------------------------------------------
+    # VALIDAÇÃO
+    # -------------------------------------------------------
+
+    def _validate(self, chunk, report) -> list:
+        sample_ids = [row.get("sample_id", "") for _, row in chunk]
+        existing = set(
+            Sample.objects
+            .filter(sample_id__in=[s for s in sample_ids if s])
+            .values_list("sample_id", flat=True)
+        )
+
+        self._resolve(
+            self._collections, Collection,
+            {row["collection"] for _, row in chunk if row.get("collection")},
+            select_related=("biobank",),
+        )
+        self._resolve(
+            self._biobanks, Biobank,
+            {row["biobank"] for _, row in chunk if row.get("biobank")},
+        )
+        self._resolve_tags(
+            {name for _, row in chunk for name in _split_list(row.get("tags"))}
+        )
+
+        valid = []
+        for line, row in chunk:
+            sample_id = row.get("sample_id", "")
+            error = self._row_error(row, sample_id, existing)
+            if error:
+                report.add_error(line, sample_id, error)
+                continue
+
+            self._seen_ids.add(sample_id)
+            valid.append((line, row))
+        return valid
+
+    def _row_error(self, row, sample_id, existing):
+        if not sample_id:
+            return "sample_id obrigatório."
+        if len(sample_id) > 100:
+            return "sample_id excede 100 caracteres."
+        if sample_id in existing:
+            return "sample_id já cadastrado."
+        if sample_id in self._seen_ids:
+            return "sample_id duplicado no arquivo."
+
+        status = row.get("status") or "pending"
+        if status not in self.valid_status:
+            return f"Status inválido: '{status}'."
+
+        visibility = row.get("visibility") or "private"
+        if visibility not in self.valid_visibility:
+            return f"Visibilidade inválida: '{visibility}'."
+
+        ref = row.get("collection")
+        if ref:
+            collection = self._collections.get(ref)
+            if collection is None:
+                return f"Collection não encontrada: '{ref}'."
+            if collection == "ambiguous":
+                return f"Nome de Collection ambíguo: '{ref}' (use o id)."
+            if not self.index.can_edit_collection(collection):
+                return f"Sem permissão de edição na Collection '{ref}'."
+        elif row.get("biobank"):
+            biobank = self._biobanks.get(row["biobank"])
+            if biobank is None or biobank == "ambiguous":
+                return f"Biobank inválido: '{row['biobank']}'."
+
+        unknown = [n for n in _split_list(row.get("tags")) if self._tags.get(n) is None]
+        if unknown:
+            return "Tag não encontrada: " + ", ".join(f"'{n}'" for n in unknown) + "."
+
+        for key, value in _split_keywords(row.get("keywords")):
+            if not key or not value:
+                return "Keyword inválida (use chave=valor)."
+
+        return None
+
+    def _resolve_tags(self, names):
+        """
+        Ids das Tags existentes (nomes ainda não vistos, uma query).
+        Nomes desconhecidos ficam como None: erro na validação.
+        """
+        missing = [n for n in names if n not in self._tags]
+        if not missing:
+            return
+        self._tags.update(Tag.objects.filter(name__in=missing).values_list("name", "id"))
+        for name in missing:
+            self._tags.setdefault(name, None)
+
+    # -------------------------------------------------------
+    # ESCRITA (uma transação por lote)
+    # -------------------------------------------------------
+
+    def _write(self, rows, report) -> int:
+        """
+        Grava o lote. Outra importação pode ter gravado os mesmos
+        sample_id depois da validação: a transação do lote é desfeita,
+        as linhas em conflito vão para os erros e o restante é regravado.
+        """
+        while rows:
+            try:
+                return self._write_chunk([row for _, row in rows])
+            except IntegrityError:
+                taken = set(
+                    Sample.objects
+                    .filter(sample_id__in=[row["sample_id"] for _, row in rows])
+                    .values_list("sample_id", flat=True)
+                )
+                if not taken:
+                    raise
+                for line, row in rows:
+                    if row["sample_id"] in taken:
+                        report.add_error(line, row["sample_id"], "sample_id já cadastrado.")
+                        report.valid -= 1
+                rows = [(line, row) for line, row in rows if row["sample_id"] not in taken]
+        return 0
+
+    def _write_chunk(self, rows) -> int:
+        with transaction.atomic():
+            tag_ids = self._tags
+            kv_ids = resolve_keyword_values(
+                pair for row in rows for pair in _split_keywords(row.get("keywords"))
+            )
+
+            samples = []
+            for row in rows:
+                collection = self._collections.get(row.get("collection") or "")
+                biobank = (
+                    collection.biobank if collection
+                    else self._biobanks.get(row.get("biobank") or "")
+                )
+                samples.append(Sample(
+                    sample_id=row["sample_id"],
+                    organism_name=row.get("organism_name") or None,
+                    sample_type=row.get("sample_type") or None,
+                    collection=collection,
+                    biobank=biobank,
+                    storage_location=row.get("storage_location") or None,
+                    status=row.get("status") or "pending",
+                    visibility=row.get("visibility") or "private",
+                    notes=row.get("notes") or None,
+                    owner=self.user,
+                    is_active=True,
+                ))
+
+            # bulk_create não passa por Sample.save: herança de Biobank feita acima
+            samples = Sample.objects.bulk_create(samples, batch_size=self.chunk_size)
+
+            SampleTag = Sample.tags.through
+            SampleKeyword = Sample.keywords.through
+            tag_links, kv_links, events = [], [], []
+
+            for sample, row in zip(samples, rows):
+                for name in set(_split_list(row.get("tags"))):
+                    tag_links.append(SampleTag(sample_id=sample.pk, tag_id=tag_ids[name]))
+                for pair in set(_split_keywords(row.get("keywords"))):
+                    kv_links.append(SampleKeyword(sample_id=sample.pk, keywordvalue_id=kv_ids[pair]))
+
+                events.append(Event(
+                    sample=sample,
+                    event_type="entry",
+                    location_snapshot=sample.storage_location or "N/A",
+                    notes="Registro via importação em lote",
+                    performed_by=self.user,
+                ))
+
+            SampleTag.objects.bulk_create(tag_links, batch_size=self.chunk_size)
+            SampleKeyword.objects.bulk_create(kv_links, batch_size=self.chunk_size)
+            Event.objects.bulk_create(events, batch_size=self.chunk_size)
+
+        return len(samples)
+
+
+def import_samples(fileobj, filename, user, dry_run=False, chunk_size=CHUNK_SIZE) -> ImportReport:
+    """
+    Atalho: detecta o formato pelo nome e importa o arquivo.
+    """
+    rows = iter_rows(fileobj, detect_format(filename))
+    return SampleImporter(user, dry_run=dry_run, chunk_size=chunk_size).run(rows)
@@ -0,0 +1,127 @@
+import time
+
+from django.db import transaction
+from django.db.models import BooleanField, Case, Value, When
+from django.utils import timezone
+
+from core.permissions.queries import sample_edit_q
+from core.services.sample_history import STATUS_LABELS, insert_status_events
+from core.services.scan import invalidate_scan_cache
+
+
+# Transições de status permitidas (origem → destinos)
+ALLOWED_TRANSITIONS = {
+    "pending": ("qc", "rejected"),
+    "qc": ("available", "rejected"),
+    "available": ("qc", "depleted"),
+    "rejected": ("qc",),
+    "depleted": (),
+}
+
+
+def allowed_sources(target: str) -> list:
+    return [src for src, targets in ALLOWED_TRANSITIONS.items() if target in targets]
+
+
+# ===========================================================
+# RELATÓRIO
+# ===========================================================
+
+class TransitionReport:
+    """
+    Resultado de uma transição de status em lote (ou simulação).
+    """
+
+    def __init__(self, target: str, dry_run: bool):
+        self.target = target
+        self.dry_run = dry_run
+        self.matched = 0
+        self.updated = 0
+        self.skipped = []
+        self.elapsed = 0.0
+
+    def skip(self, sample_id, reason):
+        self.skipped.append({"sample": sample_id, "reason": reason})
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.target,
+            "dry_run": self.dry_run,
+            "matched": self.matched,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+# ===========================================================
+# TRANSIÇÃO EM LOTE
+# ===========================================================
+
+def transition_samples(user, queryset, target: str, dry_run: bool = False, requested_ids=None) -> TransitionReport:
+    """
+    Move os Samples de `queryset` (visíveis e editáveis por `user`) para
+    o status `target`, respeitando ALLOWED_TRANSITIONS.
+
+    Uma leitura (status atual + permissão de edição por linha), os
+    Events "qc_update" com performed_by em bulk_create a partir dessa
+    leitura e um único UPDATE com os mesmos filtros. Linhas ignoradas
+    vão para o relatório.
+    """
+    if target not in STATUS_LABELS:
+        raise ValueError(f"Status inválido: '{target}'.")
+
+    report = TransitionReport(target, dry_run)
+    started = time.perf_counter()
+    sources = allowed_sources(target)
+
+    base = queryset.filter(is_active=True).visible_to(user)
+
+    with transaction.atomic():
+        rows = list(
+            base
+            .annotate(editable=Case(
+                When(sample_edit_q(user), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ))
+            .select_for_update(of=("self",))
+            .order_by("pk")
+            .values_list("pk", "uuid", "sample_id", "status", "storage_location", "editable")
+        )
+        report.matched = len(rows)
+
+        if requested_ids is not None:
+            found = {row[0] for row in rows}
+            for pk in dict.fromkeys(requested_ids):
+                if pk not in found:
+                    report.skip(pk, "Sample não encontrado ou sem acesso.")
+
+        valid = []
+        for pk, sample_uuid, sample_id, status, location, editable in rows:
+            if not editable:
+                report.skip(sample_id, "Sem permissão de edição.")
+            elif status == target:
+                report.skip(sample_id, f"Já está em '{target}'.")
+            elif status not in sources:
+                report.skip(sample_id, f"Transição não permitida: {status} → {target}.")
+            else:
+                valid.append((pk, sample_uuid, status, location))
+
+        if valid and not dry_run:
+            now = timezone.now()
+            changing = base.filter(sample_edit_q(user), status__in=sources)
+
+            # Linhas travadas acima: os Events saem da mesma leitura
+            insert_status_events(
+                [(pk, status, location) for pk, _, status, location in valid],
+                target, performed_by=user, timestamp=now,
+            )
+            report.updated = changing.update(status=target, updated_at=now)
+
+            # Depois do commit (como em assign_collection)
+            uuids = [sample_uuid for _, sample_uuid, _, _ in valid]
+            transaction.on_commit(lambda: invalidate_scan_cache(uuids))
+
+    report.elapsed = time.perf_counter() - started
+    return report
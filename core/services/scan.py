@@ -0,0 +1,105 @@
+from django.core.cache import caches
+
+from core.models import Sample
+from core.permissions import cache as permission_cache
+from core.permissions.index import PermissionIndex
+
+
+CACHE_ALIAS = "scan"
+
+# Racks de 96 tubos; limite folgado para leitores de placa maiores
+MAX_BATCH = 384
+
+
+# ===========================================================
+# CACHE (uuid → Sample com collection/biobank)
+# ===========================================================
+
+def _key(version, sample_uuid) -> str:
+    # Indexado pela versão de ACL: mudanças de visibilidade/owner de
+    # Collection/Biobank invalidam todas as entradas de uma vez
+    return f"scan:{version}:{sample_uuid}"
+
+
+def invalidate_scan_cache(uuids):
+    """
+    Remove os Samples informados do cache. Chamado no save/delete de
+    Sample e pelos caminhos de edição em massa (que não disparam signals).
+    """
+    version = permission_cache.acl_version()
+    caches[CACHE_ALIAS].delete_many([_key(version, u) for u in uuids])
+
+
+def _load(uuids, version) -> dict:
+    cache = caches[CACHE_ALIAS]
+    keys = {_key(version, u): u for u in uuids}
+
+    found = {keys[k]: s for k, s in cache.get_many(list(keys)).items()}
+
+    missing = [u for u in uuids if u not in found]
+    if missing:
+        fetched = {
+            str(s.uuid): s
+            for s in (
+                Sample.objects
+                .filter(uuid__in=missing)
+                .select_related("collection__biobank", "biobank", "storage_position__box")
+            )
+        }
+        cache.set_many({_key(version, u): s for u, s in fetched.items()})
+        found.update(fetched)
+
+    return found
+
+
+# ===========================================================
+# LOOKUP
+# ===========================================================
+
+def _position(sample):
+    # OneToOne reverso via select_related: ausência não gera query
+    occupancy = getattr(sample, "storage_position", None)
+    if occupancy is None:
+        return None
+    return {"box_id": occupancy.box_id, "box": occupancy.box.path, "position": occupancy.label}
+
+
+def _summary(sample, index) -> dict:
+    collection = sample.collection
+    return {
+        "id": sample.pk,
+        "uuid": str(sample.uuid),
+        "sample_id": sample.sample_id,
+        "status": sample.status,
+        "status_display": sample.get_status_display(),
+        "is_active": sample.is_active,
+        "location": sample.storage_location,
+        "position": _position(sample),
+        "collection": {"id": collection.pk, "name": collection.name} if collection else None,
+        "biobank": {"id": sample.biobank.pk, "name": sample.biobank.name} if sample.biobank else None,
+        "permissions": {
+            "can_view": True,
+            "can_edit": index.can_edit_sample(sample),
+            "can_delete": index.can_delete_sample(sample),
+        },
+    }
+
+
+def lookup_samples(user, uuids) -> dict:
+    """
+    {uuid: resumo ou None} para os uuids lidos. Samples inexistentes ou
+    não visíveis ao usuário voltam como None.
+
+    Com cache quente não há queries; a frio, uma query para os uuids
+    ausentes (mais a carga dos papéis, se o índice não estiver em cache).
+    """
+    uuids = list(dict.fromkeys(str(u) for u in uuids))
+    index = PermissionIndex.for_user(user)
+    samples = _load(uuids, index.version or permission_cache.acl_version())
+
+    results = {}
+    for u in uuids:
+        sample = samples.get(u)
+        visible = sample is not None and index.can_view_sample(sample)
+        results[u] = _summary(sample, index) if visible else None
+    return results
@@ -0,0 +1,366 @@
+import gzip
+import os
+import sqlite3
+import tempfile
+
+from Bio import bgzf
+from django.conf import settings
+
+from core.models import AttachmentMetadata, SampleFile
+from core.services.sequence_metadata import sequence_format
+
+
+# Maior região devolvida por requisição (bases)
+MAX_REGION = 1_000_000
+
+# Linhas do índice por INSERT em lote
+BATCH_SIZE = 10_000
+
+
+class SequenceIndexError(ValueError):
+    """
+    Arquivo que não admite índice (formato, gzip comum, linhas
+    irregulares) ou região inválida.
+    """
+
+
+# ===========================================================
+# ARQUIVO LATERAL (POR CONTEÚDO)
+# ===========================================================
+# SQLite por conteúdo, com os campos do .fai do samtools (name, length,
+# offset, linebases, linewidth [, qualoffset]) e, para bgzip, os pares
+# (início compactado, início descompactado) de cada bloco, como no .gzi.
+# Nome como chave primária: achar um contig / leitura custa o mesmo em
+# 10 registros ou em 200 milhões.
+
+def index_path(content_hash: str) -> str:
+    return os.path.join(settings.SEQUENCE_INDEX_ROOT, content_hash[:2], f"{content_hash}.sqlite3")
+
+
+def remove_sequence_index(content_hash: str):
+    path = index_path(content_hash)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def is_bgzf(path: str) -> bool:
+    """gzip com o subcampo "BC" do BGZF no cabeçalho (bgzip / htslib)"""
+    with open(path, "rb") as f:
+        header = f.read(18)
+    return (
+        len(header) == 18
+        and header[:4] == b"\x1f\x8b\x08\x04"
+        and header[12:14] == b"BC"
+    )
+
+
+def _index_schema(db):
+    db.executescript(
+        """
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        CREATE TABLE records (
+            name TEXT PRIMARY KEY,
+            length INTEGER NOT NULL,
+            offset INTEGER NOT NULL,
+            linebases INTEGER NOT NULL,
+            linewidth INTEGER NOT NULL,
+            qualoffset INTEGER
+        ) WITHOUT ROWID;
+        CREATE TABLE blocks (
+            uncompressed INTEGER PRIMARY KEY,
+            compressed INTEGER NOT NULL
+        );
+        """
+    )
+
+
+# ===========================================================
+# CONSTRUÇÃO
+# ===========================================================
+
+def _fasta_entries(lines):
+    """
+    (nome, comprimento, offset, linebases, linewidth, None) por registro.
+    Como no samtools faidx: todas as linhas de um registro com a mesma
+    largura, exceto a última; linhas vazias só no fim do registro.
+    """
+    position = 0
+    name = None
+    for line in lines:
+        if line.startswith(b">"):
+            if name is not None:
+                yield name, length, offset, linebases, linewidth, None
+            name = line[1:].split(None, 1)[0].decode("ascii", "replace") if line[1:].strip() else ""
+            position += len(line)
+            offset, length, linebases, linewidth, short = position, 0, 0, 0, False
+            continue
+
+        position += len(line)
+        bases = len(line.rstrip(b"\r\n"))
+        if name is None:
+            continue
+        if not bases:
+            # Linha vazia conta como linha curta: só pode fechar o registro
+            # (senão os offsets por linebases / linewidth ficam errados)
+            short = True
+            continue
+        # Última linha do arquivo pode vir sem quebra de linha
+        ending = len(line) - bases
+        if short or (linebases and (bases > linebases or (ending and ending != linewidth - linebases))):
+            raise SequenceIndexError(f"Linhas de tamanho irregular no registro '{name}'.")
+        if not linebases:
+            linebases, linewidth = bases, len(line)
+        elif bases < linebases:
+            short = True
+        length += bases
+
+    if name is not None:
+        yield name, length, offset, linebases, linewidth, None
+
+
+def _fastq_entries(lines):
+    """FASTQ de quatro linhas por registro (sequência e qualidade em uma linha)"""
+    position = 0
+    lines = iter(lines)
+    for header in lines:
+        if not header.strip():
+            position += len(header)
+            continue
+        seq, plus, qual = next(lines, b""), next(lines, b""), next(lines, b"")
+        if not header.startswith(b"@") or not plus.startswith(b"+"):
+            raise SequenceIndexError("FASTQ fora do formato de quatro linhas por registro.")
+
+        name = header[1:].split(None, 1)[0].decode("ascii", "replace")
+        bases = len(seq.rstrip(b"\r\n"))
+        offset = position + len(header)
+        qualoffset = offset + len(seq) + len(plus)
+        yield name, bases, offset, bases, len(seq), qualoffset
+        position = qualoffset + len(qual)
+
+
+_ENTRIES = {"fasta": _fasta_entries, "fastq": _fastq_entries}
+INDEXED_FORMATS = tuple(_ENTRIES)
+
+
+def build_index(path: str, filename: str, target: str, ctx=None) -> dict:
+    """
+    Varre o arquivo uma vez (mais uma passada pelos blocos, se bgzip) e
+    grava o índice em `target`. Offsets são do fluxo descompactado.
+    """
+    fmt, gzipped = sequence_format(filename)
+    if fmt not in INDEXED_FORMATS:
+        raise SequenceIndexError("Índice só para FASTA / FASTQ.")
+    if gzipped and not is_bgzf(path):
+        raise SequenceIndexError(
+            "gzip comum não permite acesso aleatório; recompacte com `bgzip`."
+        )
+
+    size = os.path.getsize(path)
+    db = sqlite3.connect(target)
+    try:
+        _index_schema(db)
+
+        if gzipped:
+            with open(path, "rb") as raw:
+                db.executemany(
+                    "INSERT INTO blocks (uncompressed, compressed) VALUES (?, ?)",
+                    (
+                        (data_start, start)
+                        for start, _, data_start, data_length in bgzf.BgzfBlocks(raw)
+                        if data_length
+                    ),
+                )
+
+        records = duplicates = 0
+        with open(path, "rb", buffering=1024 * 1024) as raw:
+            lines = gzip.GzipFile(fileobj=raw) if gzipped else raw
+            batch = []
+            for entry in _ENTRIES[fmt](lines):
+                batch.append(entry)
+                if len(batch) >= BATCH_SIZE:
+                    duplicates += _insert(db, batch)
+                    records += len(batch)
+                    batch = []
+                    if ctx is not None:
+                        ctx.progress(raw.tell(), total=size, message=f"{records} registros")
+            duplicates += _insert(db, batch)
+            records += len(batch)
+
+        db.commit()
+    finally:
+        db.close()
+
+    return {"format": fmt, "bgzf": gzipped, "records": records, "duplicates": duplicates}
+
+
+def _insert(db, batch) -> int:
+    """Insere o lote; nomes repetidos ficam com a primeira ocorrência"""
+    before = db.total_changes
+    db.executemany("INSERT OR IGNORE INTO records VALUES (?, ?, ?, ?, ?, ?)", batch)
+    return len(batch) - (db.total_changes - before)
+
+
+# ===========================================================
+# LEITURA DE REGIÕES
+# ===========================================================
+
+class IndexedSequence:
+    """
+    Leitura por seek a partir do índice. Regiões em coordenadas de
+    1 a N, fim inclusivo (como "chr1:100-200" no samtools).
+    """
+
+    def __init__(self, path: str, content_hash: str, bgzf_compressed: bool):
+        self.path = path
+        self.bgzf = bgzf_compressed
+        self.db = sqlite3.connect(f"file:{index_path(content_hash)}?mode=ro", uri=True)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, name: str):
+        row = self.db.execute(
+            "SELECT name, length, offset, linebases, linewidth, qualoffset FROM records WHERE name = ?",
+            (name,),
+        ).fetchone()
+        if row is None:
+            raise SequenceIndexError(f"Registro não encontrado: {name}")
+        return row
+
+    def _read(self, offset: int, length: int) -> bytes:
+        if not self.bgzf:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                return f.read(length)
+
+        uncompressed, compressed = self.db.execute(
+            "SELECT uncompressed, compressed FROM blocks WHERE uncompressed <= ? "
+            "ORDER BY uncompressed DESC LIMIT 1",
+            (offset,),
+        ).fetchone()
+        with open(self.path, "rb") as f:
+            reader = bgzf.BgzfReader(fileobj=f, mode="rb", max_cache=4)
+            reader.seek(bgzf.make_virtual_offset(compressed, offset - uncompressed))
+            return reader.read(length)
+
+    def _bases(self, offset, linebases, linewidth, start, end) -> str:
+        """Bases [start, end) (0-based) de um registro quebrado em linhas"""
+        first = offset + (start // linebases) * linewidth + start % linebases
+        last = offset + ((end - 1) // linebases) * linewidth + (end - 1) % linebases
+        data = self._read(first, last - first + 1)
+        return data.replace(b"\n", b"").replace(b"\r", b"").decode("ascii", "replace")
+
+    def fetch(self, name: str, start: int = None, end: int = None) -> dict:
+        name, length, offset, linebases, linewidth, qualoffset = self.record(name)
+        start = 1 if start is None else start
+        end = length if end is None else min(end, length)
+        if start < 1 or start > end:
+            raise SequenceIndexError(f"Região inválida: {name}:{start}-{end} (comprimento {length}).")
+        if end - start + 1 > MAX_REGION:
+            raise SequenceIndexError(f"Região maior que {MAX_REGION} bases.")
+
+        result = {
+            "name": name,
+            "length": length,
+            "start": start,
+            "end": end,
+            "sequence": self._bases(offset, linebases, linewidth, start - 1, end) if length else "",
+        }
+        if qualoffset is not None:
+            result["quality"] = self._bases(qualoffset, linebases, linewidth, start - 1, end) if length else ""
+        return result
+
+
+def parse_region(region: str):
+    """'chr1:1.000-2.000' → ('chr1', 1000, 2000); só o nome → registro inteiro"""
+    name, sep, span = region.rpartition(":")
+    if not sep or "-" not in span:
+        return region, None, None
+    start, _, end = span.replace(",", "").replace(".", "").partition("-")
+    if not start.isdigit() or not end.isdigit():
+        return region, None, None
+    return name, int(start), int(end)
+
+
+# ===========================================================
+# CACHE POR CONTEÚDO / FILA
+# ===========================================================
+
+def indexable(filename: str) -> bool:
+    return sequence_format(filename)[0] in INDEXED_FORMATS
+
+
+def _cached(content_hash: str):
+    metadata = AttachmentMetadata.objects.filter(
+        content_hash=content_hash, kind=AttachmentMetadata.INDEX,
+    ).first()
+    # Arquivo lateral apagado: refaz
+    if metadata and metadata.status == AttachmentMetadata.READY and not os.path.exists(index_path(content_hash)):
+        return None
+    return metadata
+
+
+def request_sequence_index(sample_file):
+    """Enfileira o índice de FASTA / FASTQ (uma vez por conteúdo)"""
+    from core.services.jobs import enqueue
+
+    if not indexable(sample_file.display_name) or not sample_file.sha256 or _cached(sample_file.sha256):
+        return None
+    return enqueue("attachments.sequence_index", unique=True, content_hash=sample_file.sha256)
+
+
+def build_sequence_index(content_hash: str, ctx=None):
+    """
+    Constrói o índice em um temporário e o publica com rename. Arquivo
+    sem índice possível grava status "failed".
+    """
+    cached = _cached(content_hash)
+    if cached:
+        return cached
+
+    sample_file = (
+        SampleFile.objects
+        .filter(sha256=content_hash, category="sequence")
+        .only("id", "file", "name")
+        .first()
+    )
+    if sample_file is None:
+        return None
+
+    final = index_path(content_hash)
+    os.makedirs(os.path.dirname(final), exist_ok=True)
+    fd, work = tempfile.mkstemp(dir=os.path.dirname(final), suffix=".tmp")
+    os.close(fd)
+    os.remove(work)
+    try:
+        data = build_index(sample_file.file.path, sample_file.display_name, work, ctx)
+        fields = {"status": AttachmentMetadata.READY, "data": data, "error": ""}
+        os.replace(work, final)
+    except (SequenceIndexError, EOFError, gzip.BadGzipFile) as e:
+        fields = {"status": AttachmentMetadata.FAILED, "data": {}, "error": str(e)[:1000]}
+    finally:
+        if os.path.exists(work):
+            os.remove(work)
+
+    metadata, _ = AttachmentMetadata.objects.update_or_create(
+        content_hash=content_hash, kind=AttachmentMetadata.INDEX, defaults=fields,
+    )
+    return metadata
+
+
+def sequence_index_for(sample_file) -> dict:
+    """Estado para a interface: pending / ready / failed + resumo do índice"""
+    metadata = _cached(sample_file.sha256) if sample_file.sha256 else None
+    if metadata is None:
+        return {"status": "pending"}
+    result = {"status": metadata.status, "data": metadata.data}
+    if metadata.error:
+        result["error"] = metadata.error
+    return result
@@ -0,0 +1,236 @@
+import gzip
+import io
+import os
+from collections import Counter
+
+from Bio import SeqIO
+from Bio.SeqIO.QualityIO import FastqGeneralIterator
+
+from core.models import AttachmentMetadata, SampleFile
+from core.models.samples.sample_files import SEQUENCE_FORMATS, split_extension
+
+
+# Faixas do histograma de comprimentos
+LENGTH_BINS = 20
+
+# Registros entre atualizações de progresso (o JobContext ainda limita a escrita)
+PROGRESS_EVERY = 10_000
+
+
+# ===========================================================
+# LEITURA EM FLUXO
+# ===========================================================
+
+def sequence_format(filename: str):
+    """('fastq', True) para 'reads.fastq.gz'; (None, False) se não for sequência"""
+    ext, gzipped = split_extension(filename)
+    return SEQUENCE_FORMATS.get(ext), gzipped
+
+
+def _fasta_records(handle):
+    """
+    (comprimento, GC, AT) por registro, linha a linha: um cromossomo de
+    centenas de Mb nunca vira uma string única (o SimpleFastaParser do
+    Biopython junta o registro inteiro antes de devolver).
+    """
+    length = gc = at = 0
+    started = False
+    for line in handle:
+        if line.startswith(">"):
+            if started:
+                yield length, gc, at, None
+            length = gc = at = 0
+            started = True
+            continue
+        line = line.rstrip().upper()
+        length += len(line)
+        gc += line.count("G") + line.count("C")
+        at += line.count("A") + line.count("T")
+    if started:
+        yield length, gc, at, None
+
+
+def _fastq_records(handle):
+    for _, seq, qual in FastqGeneralIterator(handle):
+        seq = seq.upper()
+        yield len(seq), seq.count("G") + seq.count("C"), seq.count("A") + seq.count("T"), qual
+
+
+def _genbank_records(handle):
+    for record in SeqIO.parse(handle, "genbank"):
+        seq = str(record.seq).upper()
+        yield len(seq), seq.count("G") + seq.count("C"), seq.count("A") + seq.count("T"), None
+
+
+_READERS = {
+    "fasta": _fasta_records,
+    "fastq": _fastq_records,
+    "genbank": _genbank_records,
+}
+
+
+# ===========================================================
+# ESTATÍSTICAS
+# ===========================================================
+
+def n50(lengths: Counter) -> int:
+    """N50 a partir da contagem por comprimento (sem guardar cada leitura)"""
+    half = sum(length * count for length, count in lengths.items()) / 2
+    running = 0
+    for length in sorted(lengths, reverse=True):
+        running += length * lengths[length]
+        if running >= half:
+            return length
+    return 0
+
+
+def length_histogram(lengths: Counter, bins: int = LENGTH_BINS) -> list:
+    if not lengths:
+        return []
+    low, high = min(lengths), max(lengths)
+    width = max(-(-(high - low + 1) // bins), 1)
+
+    counts = Counter()
+    for length, count in lengths.items():
+        counts[(length - low) // width] += count
+
+    return [
+        {"start": low + i * width, "end": low + (i + 1) * width - 1, "count": counts[i]}
+        for i in range(max(counts) + 1)
+    ]
+
+
+def summarize_sequences(handle, fmt: str, on_progress=None) -> dict:
+    """
+    Percorre os registros uma única vez. Só contagens agregadas ficam em
+    memória: comprimentos em um Counter (leituras curtas repetem muito
+    o comprimento) e qualidade média por leitura em faixas de 1 Phred.
+    """
+    lengths = Counter()
+    read_quality = Counter()
+    gc = at = 0
+    quality_sum = quality_bases = 0
+    count = 0
+
+    for length, record_gc, record_at, qual in _READERS[fmt](handle):
+        count += 1
+        lengths[length] += 1
+        gc += record_gc
+        at += record_at
+
+        if qual:
+            # Phred+33: soma dos bytes menos o deslocamento
+            score = sum(qual.encode("ascii")) - 33 * len(qual)
+            quality_sum += score
+            quality_bases += len(qual)
+            read_quality[score // len(qual)] += 1
+
+        if on_progress and count % PROGRESS_EVERY == 0:
+            on_progress(count)
+
+    total = sum(length * n for length, n in lengths.items())
+    return {
+        "format": fmt,
+        "sequences": count,
+        "total_length": total,
+        "min_length": min(lengths) if lengths else 0,
+        "max_length": max(lengths) if lengths else 0,
+        "mean_length": round(total / count, 2) if count else 0,
+        "n50": n50(lengths),
+        "gc_percent": round(100 * gc / (gc + at), 2) if gc + at else None,
+        "mean_quality": round(quality_sum / quality_bases, 2) if quality_bases else None,
+        "length_histogram": length_histogram(lengths),
+        "quality_histogram": [
+            {"quality": q, "count": read_quality[q]} for q in sorted(read_quality)
+        ],
+    }
+
+
+def summarize_file(path: str, filename: str, ctx=None) -> dict:
+    """
+    Abre o arquivo (descompactando gzip em fluxo) e resume. O progresso
+    é medido em bytes lidos do disco (compactados, se for o caso).
+    """
+    fmt, gzipped = sequence_format(filename)
+    if fmt is None:
+        raise ValueError(f"Formato de sequência não reconhecido: {filename}")
+
+    size = os.path.getsize(path)
+    with open(path, "rb", buffering=1024 * 1024) as raw:
+        stream = gzip.GzipFile(fileobj=raw) if gzipped else raw
+        handle = io.TextIOWrapper(stream, encoding="ascii", errors="replace")
+
+        def on_progress(count):
+            if ctx is not None:
+                ctx.progress(raw.tell(), total=size, message=f"{count} sequências lidas")
+
+        data = summarize_sequences(handle, fmt, on_progress)
+
+    data["compressed"] = gzipped
+    return data
+
+
+# ===========================================================
+# CACHE POR CONTEÚDO / FILA
+# ===========================================================
+
+def request_sequence_metadata(sample_file):
+    """
+    Enfileira a extração se o conteúdo (SHA-256) ainda não foi
+    processado. Uma tarefa por hash, não por anexo.
+    """
+    from core.services.jobs import enqueue
+
+    if not sample_file.sha256:
+        return None
+    if AttachmentMetadata.objects.filter(
+        content_hash=sample_file.sha256, kind=AttachmentMetadata.SEQUENCE,
+    ).exists():
+        return None
+    return enqueue("attachments.sequence_metadata", unique=True, content_hash=sample_file.sha256)
+
+
+def extract_sequence_metadata(content_hash: str, ctx=None):
+    """
+    Calcula (ou devolve do cache) as estatísticas do conteúdo. Arquivo
+    malformado grava status "failed" (não adianta repetir); erro de
+    I/O sobe para a fila tentar de novo.
+    """
+    cached = AttachmentMetadata.objects.filter(
+        content_hash=content_hash, kind=AttachmentMetadata.SEQUENCE,
+    ).first()
+    if cached:
+        return cached
+
+    sample_file = (
+        SampleFile.objects
+        .filter(sha256=content_hash, category="sequence")
+        .only("id", "file", "name")
+        .first()
+    )
+    if sample_file is None:
+        return None
+
+    try:
+        data = summarize_file(sample_file.file.path, sample_file.display_name, ctx)
+        fields = {"status": AttachmentMetadata.READY, "data": data, "error": ""}
+    except (ValueError, EOFError, gzip.BadGzipFile) as e:
+        fields = {"status": AttachmentMetadata.FAILED, "data": {}, "error": str(e)[:1000]}
+
+    metadata, _ = AttachmentMetadata.objects.update_or_create(
+        content_hash=content_hash, kind=AttachmentMetadata.SEQUENCE, defaults=fields,
+    )
+    return metadata
+
+
+def sequence_metadata_for(sample_file) -> dict:
+    """Estado para a interface: pending / ready / failed + estatísticas"""
+    metadata = AttachmentMetadata.objects.filter(
+        content_hash=sample_file.sha256, kind=AttachmentMetadata.SEQUENCE,
+    ).first()
+    if metadata is None:
+        return {"status": "pending"}
+    result = {"status": metadata.status, "data": metadata.data}
+    if metadata.error:
+        result["error"] = metadata.error
+    return result
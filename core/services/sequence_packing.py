@@ -0,0 +1,144 @@
+import hashlib
+import struct
+import zlib
+
+import numpy as np
+
+
+# Codificações de MolecularSequence.packed_data
+TWO_BIT = "2bit"  # DNA: 4 bases por byte + lista de exceções (IUPAC, N)
+ZLIB = "zlib"     # proteína / PDB: texto compactado inteiro
+
+ZLIB_LEVEL = 6
+
+# A=0 C=1 G=2 T=3; qualquer outro byte é exceção
+_BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+_CODES = np.full(256, 255, dtype=np.uint8)
+_CODES[_BASES] = np.arange(4, dtype=np.uint8)
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+
+
+# ===========================================================
+# NORMALIZAÇÃO
+# ===========================================================
+
+def clean_residues(text: str) -> bytes:
+    """
+    Sequência colada no formulário → resíduos em maiúsculas, sem
+    espaços / quebras de linha e sem as linhas de cabeçalho FASTA (">").
+    """
+    lines = (line for line in text.splitlines() if not line.lstrip().startswith(">"))
+    return "".join("".join(lines).split()).upper().encode("ascii", "replace")
+
+
+# ===========================================================
+# 2 BITS (DNA)
+# ===========================================================
+# packed_data: bases em 2 bits, 4 por byte (a primeira nos bits altos);
+# exceções (tudo que não é A/C/G/T) gravadas como 0 e listadas à parte
+# em corridas (início, tamanho, letra): um gap de 1 Mb de N é uma linha.
+
+def _runs(residues: np.ndarray, positions: np.ndarray):
+    """Corridas de posições consecutivas com a mesma letra"""
+    if not len(positions):
+        empty = np.empty(0, dtype="<u4")
+        return empty, empty, b""
+    letters = residues[positions]
+    breaks = np.flatnonzero((np.diff(positions) != 1) | (np.diff(letters) != 0)) + 1
+    starts = positions[np.r_[0, breaks]]
+    ends = positions[np.r_[breaks - 1, len(positions) - 1]] + 1
+    return starts.astype("<u4"), (ends - starts).astype("<u4"), letters[np.r_[0, breaks]].tobytes()
+
+
+def pack_2bit(residues: bytes):
+    """bytes → (packed, exceptions)"""
+    data = np.frombuffer(residues, dtype=np.uint8)
+    codes = _CODES[data]
+    unknown = codes == 255
+    starts, lengths, letters = _runs(data, np.flatnonzero(unknown))
+    codes[unknown] = 0
+
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    packed = (padded.reshape(-1, 4) << _SHIFTS).sum(axis=1, dtype=np.uint8)
+
+    exceptions = b""
+    if len(starts):
+        exceptions = zlib.compress(
+            struct.pack("<I", len(starts)) + starts.tobytes() + lengths.tobytes() + letters,
+            ZLIB_LEVEL,
+        )
+    return packed.tobytes(), exceptions
+
+
+def load_exceptions(exceptions: bytes):
+    """(inícios, fins, letras) ordenados por início"""
+    if not exceptions:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, b""
+    raw = zlib.decompress(exceptions)
+    (count,) = struct.unpack_from("<I", raw)
+    starts = np.frombuffer(raw, dtype="<u4", count=count, offset=4).astype(np.int64)
+    lengths = np.frombuffer(raw, dtype="<u4", count=count, offset=4 + 4 * count).astype(np.int64)
+    return starts, starts + lengths, raw[4 + 8 * count:]
+
+
+def packed_range(start: int, end: int):
+    """Bytes de packed_data [início, fim) que cobrem as bases [start, end)"""
+    return start // 4, -(-end // 4)
+
+
+def unpack_2bit(packed: bytes, first_byte: int, start: int, end: int, exceptions) -> str:
+    """
+    Bases [start, end) a partir do trecho `packed` (que começa no byte
+    `first_byte` de packed_data) e das exceções já carregadas.
+    """
+    codes = (np.frombuffer(packed, dtype=np.uint8)[:, None] >> _SHIFTS) & 3
+    offset = start - first_byte * 4
+    window = _BASES[codes.ravel()[offset:offset + end - start]]
+
+    starts, ends, letters = exceptions
+    # Corridas que cruzam a janela: fim > start e início < end
+    for i in range(np.searchsorted(ends, start, side="right"), np.searchsorted(starts, end)):
+        a, b = max(starts[i], start), min(ends[i], end)
+        window[a - start:b - start] = letters[i]
+    return window.tobytes().decode("ascii")
+
+
+# ===========================================================
+# ENTRADA / SAÍDA
+# ===========================================================
+
+def content_bytes(seq_type: str, text: str) -> bytes:
+    """Resíduos normalizados (DNA / proteína) ou o arquivo como veio (PDB)"""
+    if seq_type == "PDB":
+        return text.encode("utf-8")
+    return clean_residues(text)
+
+
+def sequence_hash(content: bytes) -> str:
+    """SHA-256 do conteúdo normalizado (deduplicação de sequências)"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def pack_content(seq_type: str, content: bytes):
+    """
+    (encoding, comprimento, packed_data, exceptions). DNA em 2 bits;
+    proteína normalizada e PDB como veio (o 3Dmol precisa do arquivo
+    inteiro), ambos com zlib.
+    """
+    if seq_type == "DNA":
+        packed, exceptions = pack_2bit(content)
+        return TWO_BIT, len(content), packed, exceptions
+    return ZLIB, len(content), zlib.compress(content, ZLIB_LEVEL), b""
+
+
+def pack_sequence(seq_type: str, text: str):
+    return pack_content(seq_type, content_bytes(seq_type, text))
+
+
+def unpack_text(encoding: str, length: int, packed: bytes, exceptions: bytes) -> str:
+    """Sequência / arquivo inteiro (migração, exportação)"""
+    if encoding == TWO_BIT:
+        return unpack_2bit(packed, 0, 0, length, load_exceptions(exceptions))
+    return zlib.decompress(packed).decode("utf-8")
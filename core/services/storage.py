@@ -0,0 +1,392 @@
+import re
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.models import Event, Sample, StorageOccupancy, StorageUnit
+from core.models.storage.occupancy import position_label
+from core.services.sample_history import history_events
+from core.services.scan import invalidate_scan_cache
+
+
+CHUNK_SIZE = 1000
+
+DEFAULT_SITE = "Principal"
+DEFAULT_BOX_ROWS = 9
+DEFAULT_BOX_COLUMNS = 9
+
+# Hierarquia abaixo do site (importação de textos livres)
+LEVELS = (StorageUnit.SITE, StorageUnit.FREEZER, StorageUnit.RACK, StorageUnit.BOX)
+
+
+# ===========================================================
+# POSIÇÕES
+# ===========================================================
+
+_SEPARATORS = re.compile(r"\s*[/|>\\;,]\s*")
+_GRID_POSITION = re.compile(r"^(?:pos(?:i[cç][aã]o)?\s*)?([A-Za-z]{1,2})\s*-?\s*(\d{1,3})$", re.I)
+_ROW_COLUMN = re.compile(r"^r(\d{1,3})\s*c(\d{1,3})$", re.I)
+_LINEAR = re.compile(r"^(?:pos(?:i[cç][aã]o)?\s*)?#?(\d{1,4})$", re.I)
+
+
+def row_number(letters: str) -> int:
+    """
+    "A" → 1, "Z" → 26, "AA" → 27.
+    """
+    number = 0
+    for ch in letters.upper():
+        number = number * 26 + (ord(ch) - ord("A") + 1)
+    return number
+
+
+def parse_position(token: str):
+    """
+    "A1" / "A-1" / "pos B12" → (linha, coluna); "r2c3" → (2, 3);
+    "17" → 17 (índice linear, depende da grade da caixa); senão None.
+    """
+    token = token.strip()
+
+    match = _GRID_POSITION.match(token)
+    if match:
+        return row_number(match.group(1)), int(match.group(2))
+
+    match = _ROW_COLUMN.match(token)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+
+    match = _LINEAR.match(token)
+    if match:
+        return int(match.group(1))
+
+    return None
+
+
+def resolve_position(position, box):
+    """
+    Converte a posição lida em (linha, coluna) dentro da grade da caixa.
+    Retorna None se estiver fora da grade.
+    """
+    if isinstance(position, int):
+        if not box.columns or not 1 <= position <= box.capacity:
+            return None
+        return (position - 1) // box.columns + 1, (position - 1) % box.columns + 1
+
+    row, column = position
+    if 1 <= row <= (box.rows or 0) and 1 <= column <= (box.columns or 0):
+        return row, column
+    return None
+
+
+def parse_location(text: str, default_site: str = DEFAULT_SITE):
+    """
+    Texto livre de storage_location → ([site, freezer, rack, box], posição).
+
+    Aceita 3 níveis (freezer/rack/box, site padrão) ou 4 níveis antes da
+    posição, separados por / | > \\ ; , ou, sem nenhum deles, por "-".
+    Retorna None se o texto não seguir esse formato.
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+
+    tokens = [t for t in _SEPARATORS.split(text) if t]
+    if len(tokens) == 1:
+        tokens = [t.strip() for t in text.split("-") if t.strip()]
+
+    if len(tokens) not in (4, 5):
+        return None
+
+    position = parse_position(tokens[-1])
+    if position is None:
+        return None
+
+    levels = tokens[:-1]
+    if len(levels) == 3:
+        levels = [default_site] + levels
+    return levels, position
+
+
+def location_string(box, row: int, column: int) -> str:
+    return f"{box.path}{StorageUnit.PATH_SEPARATOR}{position_label(row, column)}"
+
+
+# ===========================================================
+# CONSULTAS DE OCUPAÇÃO
+# ===========================================================
+
+def boxes_under(unit) -> list:
+    """
+    Caixas ativas de uma unidade (a própria, se for caixa), em ordem de
+    caminho. Busca por prefixo de `path`, sem recursão.
+    """
+    if unit.kind == StorageUnit.BOX:
+        return [unit]
+
+    return list(
+        StorageUnit.objects
+        .filter(
+            kind=StorageUnit.BOX,
+            is_active=True,
+            path__startswith=f"{unit.path}{StorageUnit.PATH_SEPARATOR}",
+        )
+        .order_by("path")
+    )
+
+
+def next_free_positions(unit, n: int, start=None) -> list:
+    """
+    As próximas `n` posições livres [(box, linha, coluna), ...] da
+    unidade, percorrendo caixas por caminho e a grade linha a linha.
+    `start` (linha, coluna) pula as posições anteriores da primeira caixa.
+
+    Duas queries, independente do tamanho do rack.
+    """
+    boxes = boxes_under(unit)
+    occupied = set(
+        StorageOccupancy.objects
+        .filter(box__in=boxes)
+        .values_list("box_id", "row", "column")
+    )
+
+    free = []
+    for i, box in enumerate(boxes):
+        for row in range(1, (box.rows or 0) + 1):
+            for column in range(1, (box.columns or 0) + 1):
+                if i == 0 and start and (row, column) < tuple(start):
+                    continue
+                if (box.pk, row, column) in occupied:
+                    continue
+
+                free.append((box, row, column))
+                if len(free) >= n:
+                    return free
+    return free
+
+
+def box_grid(box, visible_ids=None) -> dict:
+    """
+    Conteúdo da caixa: {"A1": {...} ou None, ...}. Samples fora de
+    `visible_ids` aparecem apenas como ocupados.
+    """
+    grid = {
+        position_label(row, column): None
+        for row in range(1, (box.rows or 0) + 1)
+        for column in range(1, (box.columns or 0) + 1)
+    }
+
+    for occ in (
+        StorageOccupancy.objects
+        .filter(box=box)
+        .select_related("sample")
+        .only("row", "column", "sample__id", "sample__uuid", "sample__sample_id", "sample__status")
+    ):
+        sample = occ.sample
+        if visible_ids is None or sample.pk in visible_ids:
+            grid[occ.label] = {
+                "id": sample.pk,
+                "uuid": str(sample.uuid),
+                "sample_id": sample.sample_id,
+                "status": sample.status,
+            }
+        else:
+            grid[occ.label] = {"occupied": True}
+
+    return grid
+
+
+# ===========================================================
+# ALOCAÇÃO (placa inteira em uma transação)
+# ===========================================================
+
+def place_samples(samples, unit, user=None, start=None) -> list:
+    """
+    Aloca `samples` (em ordem) nas próximas posições livres de `unit`,
+    em uma transação: ocupação (bulk_create), storage_location
+    (bulk_update) e Events "transfer" (bulk_create). Amostras já
+    alocadas são movidas. Levanta ValueError se faltar espaço ou se
+    outra operação ocupar as posições ao mesmo tempo.
+    """
+    samples = list(samples)
+    if not samples:
+        return []
+
+    try:
+        with transaction.atomic():
+            # Serializa alocações concorrentes na mesma unidade
+            list(StorageUnit.objects.select_for_update().filter(pk=unit.pk).values_list("pk", flat=True))
+
+            StorageOccupancy.objects.filter(sample__in=samples).delete()
+
+            free = next_free_positions(unit, len(samples), start=start)
+            if len(free) < len(samples):
+                raise ValueError(
+                    f"Espaço insuficiente em '{unit.path}': "
+                    f"{len(free)} posições livres para {len(samples)} amostras."
+                )
+
+            StorageOccupancy.objects.bulk_create([
+                StorageOccupancy(box=box, row=row, column=column, sample=sample, placed_by=user)
+                for sample, (box, row, column) in zip(samples, free)
+            ])
+
+            now = timezone.now()
+            events = []
+            for sample, (box, row, column) in zip(samples, free):
+                old = sample.storage_location
+                sample.storage_location = location_string(box, row, column)
+                sample.updated_at = now
+                events += history_events(
+                    sample.pk,
+                    {"storage_location": (old, sample.storage_location)},
+                    performed_by=user,
+                    timestamp=now,
+                )
+
+            Sample.objects.bulk_update(samples, ["storage_location", "updated_at"], batch_size=CHUNK_SIZE)
+            Event.objects.bulk_create(events)
+            for sample in samples:
+                sample._snapshot_tracked()
+    except IntegrityError:
+        raise ValueError("Posições ocupadas por outra operação; tente novamente.")
+
+    invalidate_scan_cache([s.uuid for s in samples])
+    return [(sample, box, row, column) for sample, (box, row, column) in zip(samples, free)]
+
+
+# ===========================================================
+# IMPORTAÇÃO DOS TEXTOS LIVRES EXISTENTES
+# ===========================================================
+
+class LocationImportReport:
+    """
+    Resultado da conversão de storage_location em ocupações.
+    """
+
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.total = 0
+        self.placed = 0
+        self.created_units = 0
+        self.errors = []
+
+    def add_error(self, sample_id, location, reason):
+        self.errors.append({"sample_id": sample_id, "location": location, "reason": reason})
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "total": self.total,
+            "placed": self.placed,
+            "created_units": self.created_units,
+            "errors": self.errors,
+        }
+
+
+class LocationImporter:
+    """
+    Lê os storage_location de Samples ainda sem posição, cria a
+    hierarquia que faltar (caixas novas com a grade padrão) e grava as
+    ocupações em lote. Textos fora do formato, posições fora da grade e
+    posições já ocupadas (dupla alocação) vão para o relatório.
+    """
+
+    def __init__(self, default_site=DEFAULT_SITE, box_rows=DEFAULT_BOX_ROWS,
+                 box_columns=DEFAULT_BOX_COLUMNS, dry_run=False, chunk_size=CHUNK_SIZE):
+        self.default_site = default_site
+        self.box_rows = box_rows
+        self.box_columns = box_columns
+        self.dry_run = dry_run
+        self.chunk_size = chunk_size
+        self.report = LocationImportReport(dry_run)
+
+        self._units = {}
+        self._claimed = {}
+
+    def _unit(self, levels):
+        """
+        Unidade do caminho `levels`, criando os níveis que faltarem.
+        """
+        parent = None
+        for kind, name in zip(LEVELS, levels):
+            path = f"{parent.path}{StorageUnit.PATH_SEPARATOR}{name}" if parent else name
+            unit = self._units.get(path)
+            if unit is None:
+                unit = StorageUnit(kind=kind, name=name, parent=parent)
+                if kind == StorageUnit.BOX:
+                    unit.rows, unit.columns = self.box_rows, self.box_columns
+                unit.save()
+                self._units[path] = unit
+                self.report.created_units += 1
+            elif unit.kind != kind:
+                raise ValueError(f"'{path}' já existe como {unit.get_kind_display()}.")
+            parent = unit
+        return parent
+
+    def run(self, queryset=None) -> LocationImportReport:
+        if queryset is None:
+            queryset = Sample.objects.all()
+
+        rows = (
+            queryset
+            .filter(storage_position__isnull=True)
+            .exclude(storage_location__isnull=True)
+            .exclude(storage_location="")
+            .order_by("pk")
+            .values_list("pk", "sample_id", "storage_location")
+        )
+
+        with transaction.atomic():
+            self._units = {u.path: u for u in StorageUnit.objects.all()}
+            self._claimed = {
+                (box_id, row, column): sample_id
+                for box_id, row, column, sample_id in
+                StorageOccupancy.objects.values_list("box_id", "row", "column", "sample__sample_id")
+            }
+
+            chunk = []
+            for row in rows.iterator(chunk_size=self.chunk_size):
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    self._import_chunk(chunk)
+                    chunk = []
+            if chunk:
+                self._import_chunk(chunk)
+
+            if self.dry_run:
+                transaction.set_rollback(True)
+
+        return self.report
+
+    def _import_chunk(self, chunk):
+        occupancies = []
+
+        for pk, sample_id, text in chunk:
+            self.report.total += 1
+
+            parsed = parse_location(text, self.default_site)
+            if parsed is None:
+                self.report.add_error(sample_id, text, "Formato não reconhecido.")
+                continue
+
+            levels, position = parsed
+            try:
+                box = self._unit(levels)
+            except ValueError as e:
+                self.report.add_error(sample_id, text, str(e))
+                continue
+
+            cell = resolve_position(position, box)
+            if cell is None:
+                self.report.add_error(sample_id, text, f"Posição fora da grade {box.rows}x{box.columns}.")
+                continue
+
+            key = (box.pk, *cell)
+            if key in self._claimed:
+                self.report.add_error(sample_id, text, f"Posição já ocupada por '{self._claimed[key]}'.")
+                continue
+
+            self._claimed[key] = sample_id
+            occupancies.append(StorageOccupancy(box=box, row=cell[0], column=cell[1], sample_id=pk))
+
+        StorageOccupancy.objects.bulk_create(occupancies, batch_size=self.chunk_size)
+        self.report.placed += len(occupancies)
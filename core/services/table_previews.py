@@ -0,0 +1,418 @@
+import csv
+import os
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from itertools import islice
+
+from core.models import AttachmentMetadata, SampleFile
+from core.models.samples.sample_files import split_extension
+
+
+# Janela máxima de linhas por requisição
+MAX_WINDOW = 500
+
+# A cada N linhas o resumo guarda o byte de início (CSV): uma janela no
+# fim do arquivo começa no ponto de retomada mais próximo, sem reler tudo
+CHECKPOINT_EVERY = 10_000
+
+# Amostra lida para detectar codificação e separador
+SNIFF_BYTES = 64 * 1024
+
+# Células tratadas como vazias na contagem de nulos
+NULL_VALUES = {"", "na", "n/a", "nan", "null", "none", "-"}
+
+_INTEGER = re.compile(r"^[+-]?\d+$")
+_DECIMAL_COMMA = re.compile(r"^[+-]?\d+,\d+$")
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$")
+
+
+class TablePreviewError(ValueError):
+    """
+    Arquivo que não pode ser lido como tabela (formato / conteúdo).
+    """
+
+
+def table_format(filename: str) -> str:
+    ext, gzipped = split_extension(filename)
+    if gzipped:
+        raise TablePreviewError("Tabelas compactadas não têm prévia.")
+    if ext == ".xlsx":
+        return "xlsx"
+    if ext in (".csv", ".tsv"):
+        return "csv"
+    raise TablePreviewError(f"Formato sem prévia: {ext or filename}")
+
+
+# ===========================================================
+# CSV: DIALETO + LEITURA COM PONTOS DE RETOMADA
+# ===========================================================
+
+def sniff_csv(path: str) -> dict:
+    """Codificação (UTF-8 ou Latin-1) e separador, a partir do início do arquivo"""
+    with open(path, "rb") as f:
+        sample = f.read(SNIFF_BYTES)
+
+    bom = sample.startswith(b"\xef\xbb\xbf")
+    try:
+        text = sample.decode("utf-8-sig")
+        encoding = "utf-8"
+    except UnicodeDecodeError as e:
+        # Corte no meio de um caractere multibyte no fim da amostra
+        if e.start >= len(sample) - 3:
+            text, encoding = sample[:e.start].decode("utf-8-sig"), "utf-8"
+        else:
+            text, encoding = sample.decode("latin-1"), "latin-1"
+
+    try:
+        head = "\n".join(text.splitlines()[:20])
+        delimiter = csv.Sniffer().sniff(head, delimiters=",;\t|").delimiter
+    except csv.Error:
+        delimiter = "\t" if text.count("\t") > text.count(",") else ","
+
+    return {"encoding": encoding, "delimiter": delimiter, "start": 3 if bom else 0}
+
+
+def _csv_lines(raw, encoding: str, checkpoints=None):
+    """
+    Linhas de texto para o csv.reader, marcando em `checkpoints` o byte
+    de início de cada CHECKPOINT_EVERY-ésima linha da tabela. Aspas
+    ímpares na linha = quebra de linha dentro de um campo (não é fim
+    de registro).
+    """
+    position = raw.tell()
+    record = 0
+    quoted = False
+    for line in raw:
+        if checkpoints is not None and not quoted:
+            if record % CHECKPOINT_EVERY == 0:
+                checkpoints.append(position)
+            record += 1
+        if line.count(b'"') % 2:
+            quoted = not quoted
+        position += len(line)
+        yield line.decode(encoding, errors="replace")
+
+
+def _csv_rows(raw, dialect: dict, checkpoints=None):
+    return csv.reader(_csv_lines(raw, dialect["encoding"], checkpoints), delimiter=dialect["delimiter"])
+
+
+# ===========================================================
+# XLSX: PLANILHAS EM MODO SOMENTE LEITURA
+# ===========================================================
+
+@contextmanager
+def _open_workbook(path: str):
+    """
+    Planilha em modo somente leitura (linhas lidas sob demanda do XML).
+    Abre pelo objeto de arquivo: o blob não tem extensão, e o openpyxl
+    recusa caminhos sem ".xlsx".
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Prévia de XLSX requer o pacote 'openpyxl'.")
+
+    with open(path, "rb") as f:
+        try:
+            workbook = load_workbook(f, read_only=True, data_only=True)
+        except Exception as e:
+            raise TablePreviewError(f"Planilha ilegível: {e}")
+        try:
+            yield workbook
+        finally:
+            workbook.close()
+
+
+def _worksheet(workbook, sheet):
+    if not sheet:
+        return workbook.worksheets[0]
+    if sheet not in workbook.sheetnames:
+        raise TablePreviewError(f"Planilha inexistente: {sheet}")
+    return workbook[sheet]
+
+
+# ===========================================================
+# JANELA DE LINHAS
+# ===========================================================
+
+def _cell(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def read_window(path: str, filename: str, offset: int = 0, limit: int = 100, sheet=None, summary=None) -> dict:
+    """
+    Cabeçalho + `limit` linhas de dados a partir de `offset` (0 = primeira
+    linha após o cabeçalho). Com o resumo em cache (`summary`), o CSV
+    começa no ponto de retomada mais próximo.
+    """
+    fmt = table_format(filename)
+    limit = max(1, min(limit, MAX_WINDOW))
+    offset = max(offset, 0)
+
+    if fmt == "xlsx":
+        with _open_workbook(path) as workbook:
+            worksheet = _worksheet(workbook, sheet)
+            header = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+            rows = worksheet.iter_rows(min_row=offset + 2, max_row=offset + 1 + limit + 1, values_only=True)
+            window = [[_cell(v) for v in row] for row in rows]
+            sheets = workbook.sheetnames
+            sheet = worksheet.title
+    else:
+        dialect = summary["dialect"] if summary else sniff_csv(path)
+        checkpoints = summary.get("checkpoints") if summary else None
+        with open(path, "rb") as raw:
+            raw.seek(dialect["start"])
+            header = next(_csv_rows(raw, dialect), [])
+
+            # Já depois do cabeçalho (linha 0): pular `offset` registros,
+            # ou saltar para o ponto de retomada k (registro k*CHECKPOINT_EVERY)
+            skip = offset
+            if checkpoints:
+                target = offset + 1
+                k = min(target // CHECKPOINT_EVERY, len(checkpoints) - 1)
+                if k > 0:
+                    raw.seek(checkpoints[k])
+                    skip = target - k * CHECKPOINT_EVERY
+
+            try:
+                window = list(islice(_csv_rows(raw, dialect), skip, skip + limit + 1))
+            except csv.Error as e:
+                raise TablePreviewError(f"CSV malformado: {e}")
+        sheets, sheet = [], None
+
+    has_more = len(window) > limit
+    window = window[:limit]
+    return {
+        "format": fmt,
+        "sheet": sheet,
+        "sheets": sheets,
+        "columns": list(header),
+        "offset": offset,
+        "limit": limit,
+        "rows": window,
+        "next_offset": offset + limit if has_more else None,
+    }
+
+
+# ===========================================================
+# RESUMO POR COLUNA
+# ===========================================================
+
+class ColumnStats:
+    """
+    Tipo predominante, nulos e mínimo/máximo de uma coluna, em uma
+    passada (valores não são guardados).
+    """
+
+    def __init__(self, name, decimal_comma: bool = False):
+        self.name = name
+        self.decimal_comma = decimal_comma
+        self.nulls = 0
+        self.counts = {"integer": 0, "float": 0, "boolean": 0, "date": 0, "string": 0}
+        self.low = self.high = None
+        self.date_low = self.date_high = None
+
+    def _number(self, value):
+        self.low = value if self.low is None or value < self.low else self.low
+        self.high = value if self.high is None or value > self.high else self.high
+
+    def _date(self, value):
+        self.date_low = value if self.date_low is None or value < self.date_low else self.date_low
+        self.date_high = value if self.date_high is None or value > self.date_high else self.date_high
+
+    def add(self, value):
+        if value is None or (isinstance(value, str) and value.strip().lower() in NULL_VALUES):
+            self.nulls += 1
+            return
+
+        if isinstance(value, bool):
+            self.counts["boolean"] += 1
+        elif isinstance(value, int):
+            self.counts["integer"] += 1
+            self._number(value)
+        elif isinstance(value, float):
+            if value != value:
+                self.nulls += 1
+                return
+            self.counts["float"] += 1
+            self._number(value)
+        elif isinstance(value, (datetime, date)):
+            self.counts["date"] += 1
+            self._date(value.isoformat())
+        elif isinstance(value, time):
+            self.counts["string"] += 1
+        else:
+            self._add_text(value.strip())
+
+    def _add_text(self, text):
+        if _INTEGER.match(text):
+            self.counts["integer"] += 1
+            self._number(int(text))
+            return
+        if self.decimal_comma and _DECIMAL_COMMA.match(text):
+            text = text.replace(",", ".")
+        try:
+            number = float(text)
+        except ValueError:
+            pass
+        else:
+            if number == number:
+                self.counts["float"] += 1
+                self._number(number)
+                return
+        if _ISO_DATE.match(text):
+            self.counts["date"] += 1
+            self._date(text)
+        elif text.lower() in ("true", "false"):
+            self.counts["boolean"] += 1
+        else:
+            self.counts["string"] += 1
+
+    def summary(self) -> dict:
+        present = {kind: n for kind, n in self.counts.items() if n}
+        if not present:
+            kind = "empty"
+        elif set(present) <= {"integer", "float"}:
+            kind = "float" if "float" in present else "integer"
+        elif len(present) == 1:
+            kind = next(iter(present))
+        else:
+            kind = "string"
+
+        result = {"name": self.name, "type": kind, "nulls": self.nulls, "min": None, "max": None}
+        if kind in ("integer", "float"):
+            result["min"], result["max"] = self.low, self.high
+        elif kind == "date":
+            result["min"], result["max"] = self.date_low, self.date_high
+        return result
+
+
+def _summarize_rows(header, rows, decimal_comma=False, on_progress=None) -> dict:
+    columns = [ColumnStats(name if name is not None else "", decimal_comma) for name in header]
+    count = 0
+    for row in rows:
+        count += 1
+        for i, value in enumerate(row):
+            if i >= len(columns):
+                columns.append(ColumnStats(f"coluna_{i + 1}", decimal_comma))
+                columns[-1].nulls = count - 1
+            columns[i].add(value)
+        # Linha mais curta que o cabeçalho: o que falta é nulo
+        for column in columns[len(row):]:
+            column.nulls += 1
+        if on_progress and count % CHECKPOINT_EVERY == 0:
+            on_progress(count)
+    return {"rows": count, "columns": [c.summary() for c in columns]}
+
+
+def summarize_table(path: str, filename: str, ctx=None) -> dict:
+    """
+    Uma passada pelo arquivo: linhas, tipo / nulos / mín / máx por
+    coluna e (CSV) o dialeto e os pontos de retomada.
+    """
+    fmt = table_format(filename)
+    size = os.path.getsize(path)
+
+    if fmt == "xlsx":
+        with _open_workbook(path) as workbook:
+            sheets = []
+            for worksheet in workbook.worksheets:
+                rows = worksheet.iter_rows(values_only=True)
+                header = next(rows, ())
+
+                def on_progress(count, title=worksheet.title):
+                    if ctx is not None:
+                        ctx.progress(count, message=f"{title}: {count} linhas")
+
+                sheets.append({"name": worksheet.title, **_summarize_rows(header, rows, on_progress=on_progress)})
+        return {"format": fmt, "sheets": sheets}
+
+    dialect = sniff_csv(path)
+    checkpoints = []
+    with open(path, "rb", buffering=1024 * 1024) as raw:
+        raw.seek(dialect["start"])
+        rows = _csv_rows(raw, dialect, checkpoints)
+        header = next(rows, [])
+
+        def on_progress(count):
+            if ctx is not None:
+                ctx.progress(raw.tell(), total=size, message=f"{count} linhas")
+
+        try:
+            summary = _summarize_rows(header, rows, dialect["delimiter"] != ",", on_progress)
+        except csv.Error as e:
+            raise TablePreviewError(f"CSV malformado: {e}")
+
+    return {
+        "format": fmt,
+        "dialect": dialect,
+        "checkpoints": checkpoints,
+        "sheets": [{"name": "", **summary}],
+    }
+
+
+# ===========================================================
+# CACHE POR CONTEÚDO / FILA
+# ===========================================================
+
+def table_summary(content_hash: str):
+    return AttachmentMetadata.objects.filter(
+        content_hash=content_hash, kind=AttachmentMetadata.TABLE,
+    ).first()
+
+
+def request_table_summary(sample_file):
+    """Enfileira o resumo se o conteúdo ainda não foi processado"""
+    from core.services.jobs import enqueue
+
+    if not sample_file.sha256 or table_summary(sample_file.sha256):
+        return None
+    return enqueue("attachments.table_summary", unique=True, content_hash=sample_file.sha256)
+
+
+def build_table_summary(content_hash: str, ctx=None):
+    """
+    Calcula (ou devolve do cache) o resumo. Tabela ilegível grava
+    status "failed"; erro de I/O sobe para a fila tentar de novo.
+    """
+    cached = table_summary(content_hash)
+    if cached:
+        return cached
+
+    sample_file = (
+        SampleFile.objects
+        .filter(sha256=content_hash, category="table")
+        .only("id", "file", "name")
+        .first()
+    )
+    if sample_file is None:
+        return None
+
+    try:
+        data = summarize_table(sample_file.file.path, sample_file.display_name, ctx)
+        fields = {"status": AttachmentMetadata.READY, "data": data, "error": ""}
+    except TablePreviewError as e:
+        fields = {"status": AttachmentMetadata.FAILED, "data": {}, "error": str(e)[:1000]}
+
+    metadata, _ = AttachmentMetadata.objects.update_or_create(
+        content_hash=content_hash, kind=AttachmentMetadata.TABLE, defaults=fields,
+    )
+    return metadata
+
+
+def table_summary_for(sample_file) -> dict:
+    """Estado para a interface (sem os pontos de retomada internos)"""
+    metadata = table_summary(sample_file.sha256) if sample_file.sha256 else None
+    if metadata is None:
+        return {"status": "pending"}
+    data = {k: v for k, v in metadata.data.items() if k != "checkpoints"}
+    result = {"status": metadata.status, "data": data}
+    if metadata.error:
+        result["error"] = metadata.error
+    return result
@@ -0,0 +1,271 @@
+import fcntl
+import hashlib
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from core.models import SampleFile, SampleFileUpload
+from core.models.samples.sample_files import sample_file_upload_to
+from core.services.blobs import adopt_file
+
+
+# Tamanho máximo de cada parte e limite do arquivo inteiro
+CHUNK_SIZE = getattr(settings, "UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024)
+MAX_UPLOAD_SIZE = getattr(settings, "UPLOAD_MAX_SIZE", 100 * 1024 ** 3)
+
+# Bloco de leitura do corpo da requisição / do disco (memória por parte)
+READ_BLOCK = 1024 * 1024
+
+
+class UploadError(ValueError):
+    """
+    Erro do protocolo de upload (tamanho, estado, verificação).
+    """
+
+
+class OffsetMismatch(UploadError):
+    """
+    A parte não começa onde o servidor parou: o cliente deve retomar
+    a partir de `expected`.
+    """
+
+    def __init__(self, expected: int):
+        super().__init__(f"Offset inválido; retome a partir de {expected}.")
+        self.expected = expected
+
+
+class UploadBusy(UploadError):
+    """
+    Outra requisição está gravando uma parte do mesmo upload.
+    """
+
+
+# ===========================================================
+# SHA-256 INCREMENTAL
+# ===========================================================
+# O estado do hashlib não é serializável: cada processo guarda o hash
+# parcial das sessões que está recebendo. Se a parte seguinte cair em
+# outro processo (ou após um restart), o estado é reconstruído lendo
+# do disco os bytes já recebidos.
+
+_hashers = {}
+_hashers_lock = threading.Lock()
+
+
+def _take_hasher(upload):
+    with _hashers_lock:
+        offset, digest = _hashers.pop(upload.pk, (None, None))
+    if offset == upload.received:
+        return digest
+
+    digest = hashlib.sha256()
+    remaining = upload.received
+    if remaining:
+        with open(upload.part_path, "rb") as f:
+            while remaining:
+                block = f.read(min(READ_BLOCK, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+    return digest
+
+
+def _keep_hasher(upload, digest):
+    with _hashers_lock:
+        _hashers[upload.pk] = (upload.received, digest)
+
+
+def _drop_hasher(upload):
+    with _hashers_lock:
+        _hashers.pop(upload.pk, None)
+
+
+# ===========================================================
+# PROTOCOLO
+# ===========================================================
+
+def start_upload(sample, user, filename: str, size: int, sha256: str = "", description=None) -> SampleFileUpload:
+    """
+    Abre uma sessão e cria o ".part" vazio no diretório temporário
+    dos blobs.
+    """
+    filename = get_valid_filename(os.path.basename(filename or ""))
+    if not filename:
+        raise UploadError("Nome de arquivo inválido.")
+    if size < 0 or size > MAX_UPLOAD_SIZE:
+        raise UploadError(f"Tamanho inválido (máximo {MAX_UPLOAD_SIZE} bytes).")
+
+    sha256 = (sha256 or "").strip().lower()
+    if sha256 and (len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256)):
+        raise UploadError("sha256 inválido.")
+
+    upload = SampleFileUpload.objects.create(
+        sample=sample,
+        created_by=user,
+        filename=filename,
+        description=description or None,
+        storage_name=sample_file_upload_to(SampleFile(sample=sample), filename),
+        size=size,
+        expected_sha256=sha256,
+    )
+
+    os.makedirs(os.path.dirname(upload.part_path), exist_ok=True)
+    open(upload.part_path, "wb").close()
+
+    if size == 0:
+        _finalize(upload, hashlib.sha256())
+    return upload
+
+
+def write_chunk(upload, offset: int, stream, length: int) -> SampleFileUpload:
+    """
+    Grava `length` bytes de `stream` (ex.: o próprio request) a partir
+    de `offset`, em blocos de READ_BLOCK, atualizando o SHA-256. Na
+    última parte verifica e cria o SampleFile.
+    """
+    if not upload.is_pending:
+        raise UploadError(f"Upload não está em andamento ({upload.get_status_display()}).")
+    if offset != upload.received:
+        raise OffsetMismatch(upload.received)
+    if length <= 0 or length > CHUNK_SIZE:
+        raise UploadError(f"Parte deve ter de 1 a {CHUNK_SIZE} bytes.")
+    if offset + length > upload.size:
+        raise UploadError("Parte ultrapassa o tamanho declarado.")
+
+    with open(upload.part_path, "r+b") as f:
+        # Uma requisição por vez por upload (retries paralelos da mesma parte)
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadBusy("Outra requisição está gravando este upload.")
+
+        upload.refresh_from_db(fields=["received", "status"])
+        if not upload.is_pending or upload.received != offset:
+            raise OffsetMismatch(upload.received)
+
+        digest = _take_hasher(upload)
+
+        written = 0
+        f.seek(offset)
+        f.truncate()
+        while written < length:
+            block = stream.read(min(READ_BLOCK, length - written))
+            if not block:
+                break
+            f.write(block)
+            digest.update(block)
+            written += len(block)
+
+        received = offset + written
+        SampleFileUpload.objects.filter(pk=upload.pk).update(
+            received=received, updated_at=timezone.now(),
+        )
+
+    upload.received = received
+    if written < length:
+        # Conexão caiu no meio da parte: o que chegou fica, o cliente retoma
+        _keep_hasher(upload, digest)
+        raise OffsetMismatch(received)
+
+    if received == upload.size:
+        _finalize(upload, digest)
+    else:
+        _keep_hasher(upload, digest)
+    return upload
+
+
+def _finalize(upload, digest):
+    """
+    Confere tamanho e hash, incorpora o arquivo ao armazenamento por
+    hash e cria o SampleFile (file_size / mime_type / category via save()).
+    """
+    _drop_hasher(upload)
+    checksum = digest.hexdigest()
+
+    problem = None
+    if os.path.getsize(upload.part_path) != upload.size:
+        problem = "Tamanho final diferente do declarado."
+    elif upload.expected_sha256 and checksum != upload.expected_sha256:
+        problem = "SHA-256 não confere."
+
+    if problem:
+        os.remove(upload.part_path)
+        SampleFileUpload.objects.filter(pk=upload.pk).update(
+            status=SampleFileUpload.FAILED, sha256=checksum, error=problem,
+        )
+        upload.status, upload.sha256, upload.error = SampleFileUpload.FAILED, checksum, problem
+        raise UploadError(problem)
+
+    with open(upload.part_path, "rb") as f:
+        os.fsync(f.fileno())
+
+    with transaction.atomic():
+        # Conteúdo repetido (mesmo SHA-256) reaproveita o blob existente
+        blob = adopt_file(upload.part_path, checksum, upload.size)
+
+        sample_file = SampleFile.objects.create(
+            sample=upload.sample,
+            blob=blob,
+            name=upload.filename,
+            description=upload.description,
+        )
+
+        upload.storage_name = sample_file.logical_path
+        upload.sha256 = checksum
+        upload.sample_file = sample_file
+        upload.status = SampleFileUpload.COMPLETE
+        upload.save(update_fields=["storage_name", "sha256", "sample_file", "status", "updated_at"])
+
+
+def abort_upload(upload) -> bool:
+    if not upload.is_pending:
+        return False
+    _drop_hasher(upload)
+    if os.path.exists(upload.part_path):
+        os.remove(upload.part_path)
+    upload.status = SampleFileUpload.ABORTED
+    upload.save(update_fields=["status", "updated_at"])
+    return True
+
+
+def purge_stale_uploads(max_age_hours: int = 48) -> int:
+    """
+    Cancela sessões paradas há mais de `max_age_hours` (libera o disco).
+    """
+    stale = SampleFileUpload.objects.filter(
+        status=SampleFileUpload.PENDING,
+        updated_at__lt=timezone.now() - timedelta(hours=max_age_hours),
+    )
+    return sum(abort_upload(upload) for upload in stale.iterator())
+
+
+def upload_summary(upload) -> dict:
+    data = {
+        "id": str(upload.pk),
+        "sample": upload.sample_id,
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": upload.received,
+        "status": upload.status,
+        "chunk_size": CHUNK_SIZE,
+    }
+    if upload.sha256:
+        data["sha256"] = upload.sha256
+    if upload.error:
+        data["error"] = upload.error
+    if upload.sample_file_id:
+        data["file"] = {
+            "id": upload.sample_file_id,
+            "name": upload.sample_file.display_name,
+            "path": upload.sample_file.logical_path,
+            "file_size": upload.sample_file.file_size,
+            "mime_type": upload.sample_file.mime_type,
+            "category": upload.sample_file.category,
+        }
+    return data
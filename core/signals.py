@@ -1,33 +1,143 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete, post_init
+from django.db import transaction
 from django.dispatch import receiver
 from core.models.samples.sample import Sample
 from core.models.events import Event
+from core.models import (
+    Biobank,
+    BiobankUserRole,
+    Collection,
+    CollectionUserRole,
+    Keyword,
+    KeywordValue,
+    SampleFile,
+)
+from core.permissions.cache import invalidate_permissions
+from core.permissions.effective_access import (
+    refresh_effective_access,
+    refresh_biobank_access,
+)
+from core.services.blobs import release_blob
+from core.services.keywords import invalidate_keyword_cache
+from core.services.sample_history import history_events
+from core.services.scan import invalidate_scan_cache
 
 @receiver(pre_save, sender=Sample)
-def track_sample_history(sender, instance, **kwargs):
+def track_sample_history(sender, instance, update_fields=None, raw=False, **kwargs):
     # Se for uma amostra nova (sem ID ainda), não fazemos o rastreio de mudança
-    if not instance.pk:
+    if not instance.pk or raw:
         return
 
-    try:
-        # Pega a versão atual que está no banco antes de salvar a nova
-        old_instance = Sample.objects.get(pk=instance.pk)
-    except Sample.DoesNotExist:
-        return
+    # Diferença em memória contra o snapshot carregado (sem SELECT extra)
+    changes = instance.tracked_changes(fields=update_fields)
+    if changes:
+        Event.objects.bulk_create(history_events(
+            instance.pk,
+            changes,
+            # __dict__: não dispara carga se storage_location estiver deferido
+            location=instance.__dict__.get("storage_location") or "N/A",
+        ))
+
+
+@receiver(post_delete, sender=SampleFile)
+def release_sample_file_blob(sender, instance, **kwargs):
+    # Conteúdo compartilhado: o arquivo só sai quando a última referência sai
+    if instance.blob_id:
+        release_blob(instance.blob_id)
+
+
+@receiver(post_save, sender=Sample)
+@receiver(post_delete, sender=Sample)
+def invalidate_sample_scan(sender, instance, **kwargs):
+    invalidate_scan_cache([instance.uuid])
+
+
+# ===========================================================
+# ACL: CACHE DE PERMISSÕES + ACESSO EFETIVO (EffectiveAccess)
+# ===========================================================
+
+# Campos que afetam permissões efetivas (ver core/permissions/index.py)
+COLLECTION_ACL_FIELDS = ("visibility", "owner_id", "biobank_id")
+BIOBANK_ACL_FIELDS = ("visibility", "owner_id", "is_active")
+
+
+def _acl_snapshot(instance, fields):
+    # Lê direto do __dict__ para não disparar queries em campos deferidos
+    return tuple(instance.__dict__.get(f) for f in fields)
+
+
+@receiver(post_save, sender=BiobankUserRole)
+@receiver(post_delete, sender=BiobankUserRole)
+def on_biobank_role_change(sender, instance, **kwargs):
+    invalidate_permissions()
+    transaction.on_commit(
+        lambda: refresh_biobank_access(instance.biobank_id, user_ids=[instance.user_id])
+    )
+
+
+@receiver(post_save, sender=CollectionUserRole)
+@receiver(post_delete, sender=CollectionUserRole)
+def on_collection_role_change(sender, instance, **kwargs):
+    invalidate_permissions()
+    transaction.on_commit(
+        lambda: refresh_effective_access([instance.collection_id], user_ids=[instance.user_id])
+    )
+
+
+@receiver(post_init, sender=Collection)
+def snapshot_collection_acl(sender, instance, **kwargs):
+    instance._acl_snapshot = _acl_snapshot(instance, COLLECTION_ACL_FIELDS)
+
+
+@receiver(post_init, sender=Biobank)
+def snapshot_biobank_acl(sender, instance, **kwargs):
+    instance._acl_snapshot = _acl_snapshot(instance, BIOBANK_ACL_FIELDS)
+
+
+@receiver(post_save, sender=Collection)
+def on_collection_acl_change(sender, instance, created, **kwargs):
+    current = _acl_snapshot(instance, COLLECTION_ACL_FIELDS)
+
+    if created or current != instance._acl_snapshot:
+        if not created:
+            invalidate_permissions()
+        transaction.on_commit(lambda: refresh_effective_access([instance.pk]))
+
+    instance._acl_snapshot = current
+
+
+@receiver(post_save, sender=Biobank)
+def on_biobank_acl_change(sender, instance, created, **kwargs):
+    current = _acl_snapshot(instance, BIOBANK_ACL_FIELDS)
+
+    if not created and current != instance._acl_snapshot:
+        invalidate_permissions()
+        transaction.on_commit(lambda: refresh_biobank_access(instance.pk))
+
+    instance._acl_snapshot = current
+
+
+@receiver(post_delete, sender=Collection)
+@receiver(post_delete, sender=Biobank)
+def invalidate_on_delete(sender, instance, **kwargs):
+    # Linhas de EffectiveAccess saem por CASCADE
+    invalidate_permissions()
+
+
+# ===========================================================
+# CACHE DE KEYWORDS (core/services/keywords.py)
+# ===========================================================
+
+@receiver(post_save, sender=KeywordValue)
+@receiver(post_delete, sender=KeywordValue)
+def on_keyword_value_change(sender, instance, created=False, **kwargs):
+    if not created:
+        invalidate_keyword_cache()
+
 
-    # 1. Rastreio de Movimentação Física (MAPA/LOG)
-    if old_instance.storage_location != instance.storage_location:
-        Event.objects.create(
-            sample=instance,
-            event_type="transfer",
-            location_snapshot=instance.storage_location or "N/A",
-            notes=f"Movimentação detectada: De '{old_instance.storage_location}' para '{instance.storage_location}'"
-        )
-
-    # 2. Rastreio de Mudança de Status (Controle de Qualidade)
-    if old_instance.status != instance.status:
-        Event.objects.create(
-            sample=instance,
-            event_type="qc_update",
-            notes=f"Status alterado: {old_instance.get_status_display()} -> {instance.get_status_display()}"
-        )
\ No newline at end of file
+@receiver(post_save, sender=Keyword)
+@receiver(post_delete, sender=Keyword)
+def on_keyword_change(sender, instance, created=False, **kwargs):
+    # Renomear/excluir uma chave afeta todos os pares com o nome antigo
+    if not created:
+        invalidate_keyword_cache()
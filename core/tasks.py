@@ -0,0 +1,185 @@
+# core/tasks.py
+# Tarefas executadas fora do request por `manage.py runworker`
+# (registradas no import; ver core.services.jobs)
+from core.models import Sample
+from core.services.jobs import task
+
+
+# =========================================================
+# BENCHLING
+# =========================================================
+@task("benchling.sync")
+def sync_benchling(ctx, sample_ids):
+    """
+    Espelha os Samples no Registry do Benchling. Falha total gera nova
+    tentativa; falhas parciais ficam no log da tarefa.
+    """
+    from core.services.benchling_service import BenchlingService
+
+    service = BenchlingService()
+    samples = (
+        Sample.objects
+        .filter(pk__in=sample_ids, is_active=True)
+        .prefetch_related("keywords__keyword")
+        .order_by("-id")
+    )
+
+    synced, failed = [], []
+    ctx.progress(0, total=len(sample_ids), message="Sincronizando com o Benchling...", force=True)
+    for sample in samples:
+        entity_id = service.sync_sample_to_benchling(sample)
+        if entity_id:
+            synced.append({"sample": sample.sample_id, "entity": entity_id})
+        else:
+            failed.append(sample.sample_id)
+            ctx.log(f"Falha ao criar a entidade de '{sample.sample_id}'.", level="warning")
+        ctx.step()
+
+    if failed and not synced:
+        raise RuntimeError("Falha na criação das entidades. Verifique os IDs de Schema e Registry no serviço.")
+
+    return {"synced": synced, "failed": failed}
+
+
+# =========================================================
+# ARQUIVOS
+# =========================================================
+@task("samples.move_files")
+def move_files(ctx, sample_id):
+    """
+    Leva os anexos antigos do Sample para a pasta da coleção atual
+    (ver core.services.file_relocation).
+    """
+    from core.services.file_relocation import relocate_sample_files
+
+    sample = Sample.objects.select_related("biobank", "collection").filter(pk=sample_id).first()
+    if sample is None:
+        ctx.log(f"Sample {sample_id} não existe mais.", level="warning")
+        return None
+
+    return {"sample": sample.sample_id, **relocate_sample_files(sample)}
+
+
+@task("samples.relocate_files")
+def relocate_files(ctx, sample_ids):
+    """
+    Relocação dos anexos após uma reassociação de coleção em massa
+    (até file_relocation.JOB_CHUNK Samples por tarefa). Repetível:
+    Samples já no lugar custam uma consulta.
+    """
+    from core.services.file_relocation import relocate_sample_files
+
+    totals = {"moved": 0, "missing": 0, "recovered": 0}
+    samples = Sample.objects.select_related("biobank", "collection").filter(pk__in=sample_ids).order_by("pk")
+    ctx.progress(0, total=len(sample_ids), force=True)
+    for done, sample in enumerate(samples.iterator(), 1):
+        for key, value in relocate_sample_files(sample).items():
+            totals[key] += value
+        ctx.progress(done)
+    return totals
+
+
+@task("attachments.sequence_metadata")
+def sequence_metadata(ctx, content_hash):
+    """
+    Estatísticas de FASTA/FASTQ/GenBank (N50, GC%, qualidade...) por
+    conteúdo. CPU: prefira `runworker --pool process --kind attachments.sequence_metadata`.
+    """
+    from core.services.sequence_metadata import extract_sequence_metadata
+
+    metadata = extract_sequence_metadata(content_hash, ctx)
+    if metadata is None:
+        ctx.log(f"Nenhum anexo com o conteúdo {content_hash}.", level="warning")
+        return None
+    return {"status": metadata.status, "sequences": metadata.data.get("sequences")}
+
+
+@task("attachments.sequence_index")
+def sequence_index(ctx, content_hash):
+    """
+    Índice lateral (offsets por registro, estilo .fai; blocos do bgzip)
+    para leitura de regiões por seek.
+    """
+    from core.services.sequence_index import build_sequence_index
+
+    metadata = build_sequence_index(content_hash, ctx)
+    if metadata is None:
+        ctx.log(f"Nenhum FASTA/FASTQ com o conteúdo {content_hash}.", level="warning")
+        return None
+    return {"status": metadata.status, "records": metadata.data.get("records")}
+
+
+@task("attachments.image_preview")
+def image_preview(ctx, content_hash):
+    """
+    Miniatura, prévia e pirâmide de blocos (imagens grandes) por
+    conteúdo. CPU / memória: prefira o pool de processos.
+    """
+    from core.services.image_previews import build_image_previews
+
+    metadata = build_image_previews(content_hash)
+    if metadata is None:
+        ctx.log(f"Nenhuma imagem com o conteúdo {content_hash}.", level="warning")
+        return None
+    return {"status": metadata.status, "pyramid": metadata.data.get("pyramid")}
+
+
+@task("attachments.table_summary")
+def table_summary(ctx, content_hash):
+    """
+    Tipo, nulos e mínimo/máximo por coluna de CSV/XLSX (e os pontos de
+    retomada usados pela prévia paginada), por conteúdo.
+    """
+    from core.services.table_previews import build_table_summary
+
+    metadata = build_table_summary(content_hash, ctx)
+    if metadata is None:
+        ctx.log(f"Nenhuma tabela com o conteúdo {content_hash}.", level="warning")
+        return None
+    return {"status": metadata.status, "sheets": len(metadata.data.get("sheets", []))}
+
+
+# =========================================================
+# ETIQUETAS
+# =========================================================
+@task("labels.render_qr")
+def render_qr(ctx, sample_ids, level="M", chunk_size=500):
+    """
+    Pré-gera os PNGs de QR (cache em disco) para impressões futuras.
+    """
+    from core.services.labels import ensure_qr_images, normalize_level
+
+    level = normalize_level(level)
+    uuids = list(Sample.objects.filter(pk__in=sample_ids).values_list("uuid", flat=True))
+
+    created = 0
+    ctx.progress(0, total=len(uuids), force=True)
+    for start in range(0, len(uuids), chunk_size):
+        created += ensure_qr_images(uuids[start:start + chunk_size], level)
+        ctx.progress(min(start + chunk_size, len(uuids)))
+
+    return {"rendered": created, "total": len(uuids)}
+
+
+# =========================================================
+# FERRAMENTAS MOLECULARES
+# =========================================================
+@task("molecular.import_fasta")
+def import_fasta(ctx, path, filename, seq_type, description=""):
+    """
+    Importação multi-FASTA grande (arquivo salvo pela view em
+    `path`, relativo ao MEDIA_ROOT). O arquivo sai ao terminar.
+    """
+    from django.contrib.auth import get_user_model
+    from django.core.files.storage import default_storage
+    from core.services.molecular_import import import_fasta as run_import
+
+    author = get_user_model().objects.filter(pk=ctx.user_id).first()
+    if author is None or not default_storage.exists(path):
+        ctx.log("Autor ou arquivo da importação não existe mais.", level="warning")
+        return None
+
+    with default_storage.open(path, "rb") as f:
+        report = run_import(f, filename, seq_type, author, description, ctx=ctx)
+    default_storage.delete(path)
+    return report.as_dict()
@@ -0,0 +1,33 @@
+import os
+import resource
+import sys
+import time
+import unittest
+from contextlib import contextmanager
+
+
+# Medições de desempenho só com BENCHMARK_ROWS=<n> no ambiente
+# (ex.: BENCHMARK_ROWS=100000 python manage.py test core)
+BENCHMARK_ROWS = int(os.environ.get("BENCHMARK_ROWS") or 0)
+
+benchmark = unittest.skipUnless(BENCHMARK_ROWS, "defina BENCHMARK_ROWS=<n> para medir")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss em KiB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def measure(label: str, rows: int):
+    """
+    Tempo e pico de RSS de um trecho, escritos no stderr do teste.
+    """
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - started
+    sys.stderr.write(
+        f"\n{label}: {rows} linhas em {elapsed:.2f}s ({rows / elapsed:.0f} linhas/s); "
+        f"pico de RSS {peak_rss_mb():.0f} MB (+{peak_rss_mb() - rss_before:.1f} MB)\n"
+    )
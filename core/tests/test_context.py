@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.context import base_context
+from core.models import Biobank, Collection, CollectionUserRole, Sample
+from core.tests.test_visibility import TEST_CACHES
+
+
+@override_settings(CACHES=TEST_CACHES)
+class LazyBaseContextTests(TestCase):
+    """
+    base_context só consulta o banco para as entradas que a página usa.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("tech", password="x")
+        biobank = Biobank.objects.create(name="B", institution="Inst", owner=cls.user)
+        collection = Collection.objects.create(name="C", biobank=biobank, owner=cls.user)
+        CollectionUserRole.objects.create(user=cls.user, collection=collection, role=CollectionUserRole.OWNER)
+        for i in range(20):
+            Sample.objects.create(sample_id=f"S{i:02d}", owner=cls.user, collection=collection)
+
+    def request(self):
+        request = RequestFactory().get("/")
+        request.user = User.objects.get(pk=self.user.pk)
+        return request
+
+    def test_building_the_context_runs_no_queries(self):
+        request = self.request()
+        with self.assertNumQueries(0):
+            base_context(request)
+
+    def test_entries_are_memoized_per_request(self):
+        request = self.request()
+        # Papéis do usuário: uma query, compartilhada pelos contextos do request
+        with self.assertNumQueries(1):
+            self.assertTrue(base_context(request)["can_manage_permissions"])
+            self.assertTrue(base_context(request)["can_manage_permissions"])
+
+    def test_keywords_page_queries(self):
+        self.client.force_login(self.user)
+        # Sessão, usuário e a listagem (vazia) de Keywords; nada de
+        # Biobanks, Collections, Samples ou papéis do base_context
+        with self.assertNumQueries(3):
+            response = self.client.get("/keywords/")
+        self.assertEqual(response.status_code, 200)
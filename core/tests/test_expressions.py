@@ -0,0 +1,34 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models import OrderBy
+from django.db.models.functions import Collate, Upper
+from django.db.models.indexes import IndexExpression
+from django.test import SimpleTestCase
+
+from core.models import Sample
+from core.models.expressions import PatternOps, PatternOpsIndex
+
+
+class PatternOpsIndexTests(SimpleTestCase):
+
+    def index_sql(self, index):
+        # Só gera o SQL: o editor não precisa entrar em uma transação
+        return str(index.create_sql(Sample, connection.schema_editor(collect_sql=True)))
+
+    def test_global_index_wrappers_are_untouched(self):
+        # Sem register_wrappers: OpClass do contrib.postgres (ou o padrão
+        # do Django) continua valendo para os outros índices
+        self.assertEqual(IndexExpression.wrapper_classes, (OrderBy, Collate))
+
+    def test_pattern_ops_is_only_the_expression_outside_postgresql(self):
+        index = PatternOpsIndex(PatternOps(Upper("organism_name")), name="organism_idx")
+        sql = self.index_sql(index)
+        self.assertIn('(UPPER("organism_name"))', sql)
+        self.assertNotIn("pattern_ops", sql)
+
+    def test_pattern_ops_stays_outside_the_parentheses_on_postgresql(self):
+        index = PatternOpsIndex(PatternOps(Upper("organism_name")).desc(), name="organism_idx")
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            sql = self.index_sql(index)
+        self.assertIn('((UPPER("organism_name")) varchar_pattern_ops DESC)', sql)
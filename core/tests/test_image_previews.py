@@ -0,0 +1,115 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from core.models import AttachmentMetadata, Sample, SampleFile
+from core.services import image_previews
+from core.services.image_previews import build_image_previews, image_preview_for, render_previews
+from core.tests.test_visibility import TEST_CACHES
+
+
+def encoded(image, format):
+    buffer = io.BytesIO()
+    image.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+class RenderPreviewsTests(SimpleTestCase):
+
+    def setUp(self):
+        self.target = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target, ignore_errors=True)
+
+    def write(self, name, data):
+        path = os.path.join(self.target, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_pixel_limit_is_only_raised_while_rendering(self):
+        default = Image.MAX_IMAGE_PIXELS
+        seen = []
+        original = image_previews.to_display
+
+        def spy(image):
+            seen.append(Image.MAX_IMAGE_PIXELS)
+            return original(image)
+
+        path = self.write("a.png", encoded(Image.new("L", (8, 8)), "PNG"))
+        with self.settings(PREVIEW_MAX_PIXELS=default * 4), \
+                mock.patch.object(image_previews, "to_display", spy):
+            render_previews(path, self.target)
+
+        self.assertEqual(seen, [default * 4])
+        self.assertEqual(Image.MAX_IMAGE_PIXELS, default)
+
+    def test_16_bit_image_is_stretched_in_strips(self):
+        # Gradiente horizontal: cada coluna mantém o mesmo valor em 8 bits
+        data = np.tile(np.linspace(1000, 5000, 300, dtype=np.uint16), (70, 1))
+        path = self.write("a.tif", encoded(Image.fromarray(data), "TIFF"))
+
+        with mock.patch.object(image_previews, "STRIP_PIXELS", 1000):
+            info = render_previews(path, self.target)
+            with Image.open(path) as source:
+                image = image_previews.to_display(source)
+
+        self.assertEqual(info["mode"], "I;16")
+        self.assertEqual((info["width"], info["height"]), (300, 70))
+        self.assertEqual(image.mode, "L")
+        pixels = np.asarray(image)
+        self.assertTrue((pixels == pixels[0]).all())
+        self.assertEqual((pixels[0, 0], pixels[0, -1]), (0, 255))
+        self.assertTrue(np.all(np.diff(pixels[0].astype(int)) >= 0))
+
+    def test_truncated_image_is_a_preview_error(self):
+        data = encoded(Image.new("RGB", (400, 400), "red"), "PNG")
+        path = self.write("a.png", data[:len(data) // 2])
+
+        with self.assertRaises(image_previews.ImagePreviewError):
+            render_previews(path, self.target)
+
+    def test_missing_file_is_left_to_the_queue(self):
+        with self.assertRaises(FileNotFoundError):
+            render_previews(os.path.join(self.target, "missing.png"), self.target)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BuildImagePreviewsTests(TestCase):
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media, PREVIEW_CACHE_ROOT=os.path.join(media, "previews"))
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.sample = Sample.objects.create(sample_id="S-1", owner=User.objects.create_user("tech"))
+
+    def attach(self, name, data):
+        return SampleFile.objects.create(sample=self.sample, file=ContentFile(data, name=name))
+
+    def test_truncated_image_is_marked_failed(self):
+        data = encoded(Image.new("RGB", (400, 400), "red"), "JPEG")
+        sample_file = self.attach("broken.jpg", data[:len(data) // 2])
+
+        metadata = build_image_previews(sample_file.sha256)
+
+        self.assertEqual(metadata.status, AttachmentMetadata.FAILED)
+        self.assertIn("Imagem ilegível", metadata.error)
+        self.assertEqual(image_preview_for(sample_file)["status"], AttachmentMetadata.FAILED)
+
+    def test_image_is_published(self):
+        sample_file = self.attach("ok.png", encoded(Image.new("RGB", (40, 30), "red"), "PNG"))
+
+        metadata = build_image_previews(sample_file.sha256)
+
+        self.assertEqual(metadata.status, AttachmentMetadata.READY)
+        self.assertEqual((metadata.data["width"], metadata.data["height"]), (40, 30))
+        self.assertTrue(os.path.exists(os.path.join(image_previews.preview_dir(sample_file.sha256), "thumb.jpg")))
@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.models import KeywordValue, Sample
+from core.services import keywords
+from core.services.keywords import attach_keywords, resolve_keyword_values
+from core.tests.test_visibility import TEST_CACHES
+
+
+@override_settings(CACHES=TEST_CACHES)
+class KeywordValueCacheTests(TestCase):
+    """
+    O LRU de (chave, valor) → id é por processo: exclusões feitas em
+    outro processo chegam pela versão compartilhada e, na corrida,
+    pela conferência dos ids antes do INSERT na tabela through.
+    """
+
+    PAIRS = [("run", "7"), ("well", "A1")]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sample = Sample.objects.create(sample_id="S-1", owner=User.objects.create_user("tech"))
+
+    def setUp(self):
+        caches[keywords.SHARED_CACHE_ALIAS].clear()
+        keywords._cache.clear()
+
+    def delete_elsewhere(self, pk):
+        # Como outro processo antes de trocar a versão: sem signals aqui
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {KeywordValue._meta.db_table} WHERE id = %s", [pk])
+
+    def test_deleted_cached_value_is_resolved_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            stale = resolve_keyword_values(self.PAIRS)[("run", "7")]
+        self.delete_elsewhere(stale)
+
+        kv_ids = attach_keywords(self.sample, self.PAIRS)
+
+        self.assertNotIn(stale, kv_ids)
+        self.assertEqual(
+            set(self.sample.keywords.values_list("id", flat=True)),
+            set(KeywordValue.objects.values_list("id", flat=True)),
+        )
+        self.assertEqual(set(self.sample.keywords.values_list("keyword__name", "value")), set(self.PAIRS))
+
+    def test_delete_signal_invalidates_other_processes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resolved = resolve_keyword_values(self.PAIRS)
+        version = keywords._shared_version()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            KeywordValue.objects.get(pk=resolved[("well", "A1")]).delete()
+        # Versão trocada só depois do commit
+        self.assertEqual(keywords._shared_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(keywords._shared_version(), version)
+
+        # Outro processo: LRU ainda na versão antiga, descartado na resolução
+        keywords._cache.set_many(resolved)
+        keywords._cache.version = version
+        with self.captureOnCommitCallbacks(execute=True):
+            fresh = resolve_keyword_values(self.PAIRS)
+        self.assertEqual(fresh[("run", "7")], resolved[("run", "7")])
+        self.assertNotEqual(fresh[("well", "A1")], resolved[("well", "A1")])
+
+    def test_cached_values_cost_one_query(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            expected = resolve_keyword_values(self.PAIRS)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_keyword_values(self.PAIRS), expected)
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.models import Job, Sample
+from core.services import labels
+from core.services.labels import LabelLayout, qr_path, request_qr_images
+from core.tests.test_visibility import TEST_CACHES
+
+
+class LabelLayoutTests(SimpleTestCase):
+
+    def test_non_finite_overrides_are_ignored(self):
+        default = LabelLayout.PRESETS[LabelLayout.DEFAULT_PRESET]
+        for raw in ("nan", "NaN", "inf", "-inf", "abc"):
+            with self.subTest(raw=raw):
+                layout = LabelLayout.from_params({"columns": raw, "width": raw})
+                self.assertEqual(layout.columns, default["columns"])
+                self.assertEqual(layout.width, default["width"])
+
+    def test_overrides_are_clamped(self):
+        layout = LabelLayout.from_params({"layout": "cryo", "columns": "99", "rows": "0", "gap": "2.5"})
+        self.assertEqual((layout.columns, layout.rows, layout.gap), (20, 1, 2.5))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class PrintLabelsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("tech")
+        cls.samples = [Sample.objects.create(sample_id=f"S{i}", owner=cls.user) for i in range(5)]
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        qr_settings = override_settings(QR_CACHE_ROOT=root)
+        qr_settings.enable()
+        self.addCleanup(qr_settings.disable)
+        self.client.force_login(self.user)
+
+    def test_nan_layout_parameter_renders(self):
+        ids = ",".join(str(s.pk) for s in self.samples)
+        response = self.client.get("/samples/labels/", {"ids": ids, "columns": "nan", "margin": "inf"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total"], 5)
+
+    def test_large_batches_go_to_the_queue(self):
+        with mock.patch.object(labels, "INLINE_QR_LIMIT", 2):
+            job = request_qr_images(self.samples, "M", user=self.user)
+
+        rendered = [os.path.exists(qr_path(s.uuid, "M")) for s in self.samples]
+        self.assertEqual(rendered, [True, True, False, False, False])
+        self.assertEqual(job.kind, "labels.render_qr")
+        self.assertEqual(job.payload, {"sample_ids": [s.pk for s in self.samples[2:]], "level": "M"})
+
+        # Tudo em cache: nada a enfileirar
+        labels.ensure_qr_images([s.uuid for s in self.samples], "M")
+        self.assertIsNone(request_qr_images(self.samples, "M"))
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_qr_view_renders_on_demand(self):
+        sample = self.samples[0]
+        response = self.client.get(f"/samples/qr/{sample.uuid}.png", {"ec": "H"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertTrue(os.path.exists(qr_path(sample.uuid, "H")))
+        response.close()
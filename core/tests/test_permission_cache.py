@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from core.permissions import cache as permission_cache
+from core.permissions.index import PermissionIndex
+from core.tests.test_visibility import TEST_CACHES
+
+
+@override_settings(CACHES=TEST_CACHES)
+class PermissionCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("tech")
+        cls.staff = User.objects.create_user("admin", is_staff=True)
+
+    def setUp(self):
+        caches[permission_cache.CACHE_ALIAS].clear()
+
+    def test_version_is_read_once_per_request(self):
+        permission_cache.acl_version()
+        cache = caches[permission_cache.CACHE_ALIAS]
+
+        with mock.patch.object(cache, "get", wraps=cache.get) as get:
+            with permission_cache.request_scope():
+                for _ in range(3):
+                    PermissionIndex.for_user(User.objects.get(pk=self.user.pk))
+        reads = [c for c in get.call_args_list if c.args[0] == permission_cache.VERSION_KEY]
+        self.assertEqual(len(reads), 1)
+
+        # Fora de um request (workers, shell): lida a cada chamada
+        with mock.patch.object(cache, "get", wraps=cache.get) as get:
+            permission_cache.acl_version()
+            permission_cache.acl_version()
+        reads = [c for c in get.call_args_list if c.args[0] == permission_cache.VERSION_KEY]
+        self.assertEqual(len(reads), 2)
+
+    def test_invalidation_inside_the_request_is_seen(self):
+        with permission_cache.request_scope():
+            user = User.objects.get(pk=self.user.pk)
+            index = PermissionIndex.for_user(user)
+            permission_cache.invalidate_permissions()
+
+            fresh = PermissionIndex.for_user(user)
+            self.assertIsNot(fresh, index)
+            self.assertEqual(fresh.version, caches[permission_cache.CACHE_ALIAS].get(permission_cache.VERSION_KEY))
+
+    def test_stats_are_shared_between_processes(self):
+        for _ in range(2):
+            index = PermissionIndex.for_user(User.objects.get(pk=self.user.pk))
+            index.biobank_roles
+            index.save()
+        permission_cache.invalidate_permissions()
+
+        # Outro processo lê os mesmos contadores no cache compartilhado
+        cache = caches[permission_cache.CACHE_ALIAS]
+        self.assertEqual(cache.get(permission_cache.STATS_KEYS["hits"]), 1)
+
+        self.client.force_login(self.staff)
+        stats = self.client.get("/internal/api/permission-cache/").json()
+        self.assertEqual((stats["hits"], stats["misses"], stats["invalidations"]), (1, 1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+        permission_cache.reset_cache_stats()
+        self.assertEqual(permission_cache.cache_stats()["hits"], 0)
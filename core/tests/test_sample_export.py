@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from core.models import Event, Sample, SampleFile, Tag
+from core.permissions.samples import can_view_sample
+from core.services.keywords import resolve_keyword_values
+from core.services.sample_export import EXPORT_FIELDS, export_samples
+from core.tests.benchmark import BENCHMARK_ROWS, benchmark, measure
+from core.tests.test_visibility import TEST_CACHES, build_matrix, viewers
+
+
+def synthetic_samples(owner, n, chunk_size=1000, **fields):
+    tag, _ = Tag.objects.get_or_create(name="bench")
+    kv_ids = list(resolve_keyword_values([("run", "bench"), ("plate", "1")]).values())
+    SampleTag = Sample.tags.through
+    SampleKeyword = Sample.keywords.through
+
+    for start in range(0, n, chunk_size):
+        samples = Sample.objects.bulk_create([
+            Sample(
+                sample_id=f"EXPORT-{i:07d}",
+                organism_name="Escherichia coli",
+                storage_location=f"F1/R{i // 9600}/B{i // 96}/{i % 96}",
+                owner=owner,
+                **fields,
+            )
+            for i in range(start, min(start + chunk_size, n))
+        ])
+        SampleTag.objects.bulk_create([SampleTag(sample_id=s.pk, tag_id=tag.pk) for s in samples])
+        SampleKeyword.objects.bulk_create(
+            [SampleKeyword(sample_id=s.pk, keywordvalue_id=kv) for s in samples for kv in kv_ids]
+        )
+
+
+@override_settings(CACHES=TEST_CACHES)
+class SampleExportTests(TestCase):
+    """
+    Export em streaming: mesmos Samples que can_view_sample aprova
+    (matriz de test_visibility) e formato das linhas CSV / JSONL.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            build_matrix(cls)
+
+        cls.sample = Sample.objects.filter(collection__isnull=False).order_by("pk").first()
+        cls.sample.tags.add(Tag.objects.create(name="frozen"), Tag.objects.create(name="alpha"))
+        cls.sample.keywords.add(*resolve_keyword_values([("run", "7"), ("well", "A1")]).values())
+        Event.objects.create(sample=cls.sample, event_type="transfer", location_snapshot="F2/B1")
+        SampleFile.objects.bulk_create([SampleFile(sample=cls.sample, name=f"f{i}.txt") for i in range(2)])
+
+    def export(self, user, fmt, chunk_size=7):
+        queryset = Sample.objects.filter(is_active=True).visible_to(user)
+        return "".join(export_samples(queryset, fmt, chunk_size=chunk_size))
+
+    def expected(self, user):
+        return {
+            s.sample_id for s in Sample.objects.select_related("collection__biobank")
+            if s.is_active and can_view_sample(user, s)
+        }
+
+    def test_exported_rows_match_visibility(self):
+        for name, user in viewers(self.users):
+            with self.subTest(user=name):
+                rows = list(csv.DictReader(io.StringIO(self.export(user, "csv"))))
+                self.assertEqual({row["sample_id"] for row in rows}, self.expected(user))
+                self.assertEqual(len(rows), len({row["sample_id"] for row in rows}))
+
+    def test_csv_shape(self):
+        user = User.objects.get(username="superuser")
+        reader = csv.reader(io.StringIO(self.export(user, "csv")))
+        header = next(reader)
+        self.assertEqual(tuple(header), EXPORT_FIELDS)
+        rows = [dict(zip(header, row)) for row in reader]
+        self.assertTrue(all(len(row) == len(EXPORT_FIELDS) for row in rows))
+
+        row = next(r for r in rows if r["sample_id"] == self.sample.sample_id)
+        self.assertEqual(row["uuid"], str(self.sample.uuid))
+        self.assertEqual(row["collection"], self.sample.collection.name)
+        self.assertEqual(row["biobank"], self.sample.biobank.name)
+        self.assertEqual(row["tags"], "alpha;frozen")
+        self.assertEqual(row["keywords"], "run=7;well=A1")
+        self.assertEqual(row["location"], "F2/B1")
+        self.assertEqual(row["file_count"], "2")
+
+    def test_jsonl_shape(self):
+        user = User.objects.get(username="superuser")
+        lines = self.export(user, "jsonl").splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual({r["sample_id"] for r in rows}, self.expected(user))
+        self.assertTrue(all(tuple(r) == EXPORT_FIELDS for r in rows))
+
+        row = next(r for r in rows if r["sample_id"] == self.sample.sample_id)
+        self.assertEqual(row["tags"], ["alpha", "frozen"])
+        self.assertEqual(row["keywords"], ["run=7", "well=A1"])
+        self.assertEqual(row["file_count"], 2)
+        self.assertEqual(row["created_at"], self.sample.created_at.isoformat())
+
+    @benchmark
+    def test_export_throughput(self):
+        user = User.objects.get(username="superuser")
+        synthetic_samples(user, BENCHMARK_ROWS, biobank=self.sample.biobank, collection=self.sample.collection)
+        queryset = Sample.objects.filter(is_active=True).visible_to(user)
+
+        lines = 0
+        with measure("export", BENCHMARK_ROWS):
+            for line in export_samples(queryset, "csv"):
+                lines += line.count("\n")
+        self.assertGreaterEqual(lines, BENCHMARK_ROWS + 1)
@@ -0,0 +1,120 @@
+import io
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from core.models import Biobank, Collection, CollectionUserRole, Event, KeywordValue, Sample, Tag
+from core.services.sample_import import SampleImporter, iter_rows
+from core.tests.benchmark import BENCHMARK_ROWS, benchmark, measure
+from core.tests.test_visibility import TEST_CACHES
+
+
+def manifest(*lines) -> io.BytesIO:
+    return io.BytesIO(("\n".join(lines) + "\n").encode())
+
+
+def synthetic_manifest(n: int, bad_every: int = 0) -> io.BytesIO:
+    """
+    Manifesto de placas de 96 poços. Com `bad_every`, uma linha a cada
+    `bad_every` tem status inválido.
+    """
+    lines = ["sample_id,organism_name,collection,status,tags,keywords"]
+    for i in range(n):
+        status = "bad" if bad_every and i % bad_every == bad_every - 1 else "qc"
+        lines.append(f"BENCH-{i:07d},Escherichia coli,C,{status},frozen,well={i % 96};run=bench")
+    return manifest(*lines)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class SampleImportTests(TestCase):
+    """
+    Importação em lote pelo SampleImporter: erros por linha e gravação
+    por lote.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("tech")
+        biobank = Biobank.objects.create(name="B", institution="Inst", owner=cls.user)
+        cls.collection = Collection.objects.create(name="C", biobank=biobank, owner=cls.user)
+        CollectionUserRole.objects.create(user=cls.user, collection=cls.collection, role=CollectionUserRole.EDITOR)
+        Tag.objects.create(name="frozen")
+
+    def run_import(self, data, dry_run=False, importer_class=SampleImporter, chunk_size=1000):
+        importer = importer_class(User.objects.get(pk=self.user.pk), dry_run=dry_run, chunk_size=chunk_size)
+        return importer.run(iter_rows(data, "csv"))
+
+    def test_unknown_tags_are_row_errors(self):
+        for dry_run in (True, False):
+            with self.subTest(dry_run=dry_run):
+                report = self.run_import(manifest(
+                    "sample_id,collection,tags",
+                    "S1,C,frozen",
+                    "S2,C,frozen;forzen",
+                ), dry_run=dry_run)
+
+                self.assertEqual(report.valid, 1)
+                self.assertEqual(report.errors, [
+                    {"line": 3, "sample_id": "S2", "error": "Tag não encontrada: 'forzen'."},
+                ])
+                self.assertFalse(Tag.objects.filter(name="forzen").exists())
+
+        self.assertEqual(list(Sample.objects.get(sample_id="S1").tags.values_list("name", flat=True)), ["frozen"])
+
+    def test_sample_id_taken_after_validation(self):
+        owner = self.user
+
+        class RacingImporter(SampleImporter):
+            # Outra importação grava S2 entre a validação e a escrita do lote
+            def _validate(self, chunk, report):
+                valid = super()._validate(chunk, report)
+                if any(row["sample_id"] == "S2" for _, row in chunk):
+                    Sample.objects.create(sample_id="S2", owner=owner)
+                return valid
+
+        report = self.run_import(manifest(
+            "sample_id,collection",
+            "S1,C",
+            "S2,C",
+            "S3,C",
+            "S4,C",
+        ), importer_class=RacingImporter, chunk_size=2)
+
+        self.assertEqual(report.errors, [
+            {"line": 3, "sample_id": "S2", "error": "sample_id já cadastrado."},
+        ])
+        self.assertEqual((report.total, report.valid, report.created), (4, 3, 3))
+        self.assertEqual(
+            set(Sample.objects.filter(collection=self.collection).values_list("sample_id", flat=True)),
+            {"S1", "S3", "S4"},
+        )
+        self.assertEqual(Event.objects.filter(sample__collection=self.collection).count(), 3)
+
+    def test_synthetic_manifest_dry_run_then_import(self):
+        report = self.run_import(synthetic_manifest(300, bad_every=50), dry_run=True, chunk_size=100)
+
+        self.assertEqual((report.total, report.valid, report.created), (300, 294, 0))
+        # Linha 1 é o cabeçalho: a linha do registro i é i + 2
+        self.assertEqual(
+            [(e["line"], e["error"]) for e in report.errors],
+            [(i + 2, "Status inválido: 'bad'.") for i in range(49, 300, 50)],
+        )
+        self.assertFalse(Sample.objects.exists())
+        self.assertFalse(KeywordValue.objects.exists())
+
+        report = self.run_import(synthetic_manifest(300, bad_every=50), chunk_size=100)
+
+        self.assertEqual((report.valid, report.created), (294, 294))
+        self.assertEqual(Sample.objects.filter(collection=self.collection, status="qc").count(), 294)
+        self.assertEqual(Sample.tags.through.objects.count(), 294)
+        self.assertEqual(Sample.keywords.through.objects.count(), 2 * 294)
+        self.assertEqual(KeywordValue.objects.count(), 96 + 1)
+        self.assertEqual(Event.objects.filter(event_type="entry").count(), 294)
+
+    @benchmark
+    def test_import_throughput(self):
+        data = synthetic_manifest(BENCHMARK_ROWS)
+        with measure("import", BENCHMARK_ROWS):
+            report = self.run_import(data)
+        self.assertEqual(report.created, BENCHMARK_ROWS)
+        self.assertEqual(report.errors, [])
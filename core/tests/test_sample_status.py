@@ -0,0 +1,128 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Biobank, Collection, CollectionUserRole, Event, Sample
+from core.services.sample_history import STATUS_LABELS
+from core.services.sample_status import transition_samples
+from core.tests.benchmark import BENCHMARK_ROWS, benchmark, measure
+from core.tests.test_visibility import TEST_CACHES
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TransitionSamplesTests(TestCase):
+    """
+    Transição de status em lote: Events "qc_update" no formato de
+    history_events, linhas ignoradas no relatório e número de queries
+    que não cresce com o lote.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # EffectiveAccess é mantido por signals em on_commit
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.build()
+
+    @classmethod
+    def build(cls):
+        cls.user = User.objects.create_user("tech")
+        cls.viewer = User.objects.create_user("viewer")
+        biobank = Biobank.objects.create(name="B", institution="Inst", owner=cls.user)
+        cls.collection = Collection.objects.create(name="C", biobank=biobank, owner=cls.user)
+        CollectionUserRole.objects.create(user=cls.user, collection=cls.collection, role=CollectionUserRole.EDITOR)
+        CollectionUserRole.objects.create(user=cls.viewer, collection=cls.collection, role=CollectionUserRole.VIEWER)
+
+    def create(self, n, status="pending", prefix="S"):
+        return Sample.objects.bulk_create([
+            Sample(
+                sample_id=f"{prefix}{i:05d}",
+                owner=self.user,
+                collection=self.collection,
+                biobank_id=self.collection.biobank_id,
+                status=status,
+                storage_location=f"F1/B{i // 96}/{i % 96}" if i % 2 else None,
+            )
+            for i in range(n)
+        ])
+
+    def transition(self, target, user=None, **kwargs):
+        user = User.objects.get(pk=(user or self.user).pk)
+        return transition_samples(user, Sample.objects.filter(collection=self.collection), target, **kwargs)
+
+    def test_events_match_history_format(self):
+        samples = self.create(3)
+        Sample.objects.filter(pk=samples[2].pk).update(status="depleted")
+
+        report = self.transition("qc")
+
+        self.assertEqual((report.matched, report.updated), (3, 2))
+        self.assertEqual(report.skipped, [
+            {"sample": samples[2].sample_id, "reason": "Transição não permitida: depleted → qc."},
+        ])
+        events = list(Event.objects.filter(event_type="qc_update").order_by("sample_id"))
+        notes = f"Status alterado: {STATUS_LABELS['pending']} -> {STATUS_LABELS['qc']}"
+        self.assertEqual(
+            [(e.sample_id, e.location_snapshot, e.notes, e.performed_by_id) for e in events],
+            [
+                (samples[0].pk, "N/A", notes, self.user.pk),
+                (samples[1].pk, "F1/B0/1", notes, self.user.pk),
+            ],
+        )
+        self.assertEqual(len({e.timestamp for e in events}), 1)
+        self.assertEqual(
+            sorted(Sample.objects.values_list("status", flat=True)), ["depleted", "qc", "qc"],
+        )
+
+    def test_dry_run_and_read_only_users_write_nothing(self):
+        self.create(4)
+
+        self.assertEqual(self.transition("qc", dry_run=True).updated, 0)
+        report = self.transition("qc", user=self.viewer)
+        self.assertEqual(report.updated, 0)
+        self.assertEqual(len(report.skipped), 4)
+
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(set(Sample.objects.values_list("status", flat=True)), {"pending"})
+
+    def test_scan_cache_is_invalidated_after_commit(self):
+        samples = self.create(2)
+
+        with mock.patch("core.services.sample_status.invalidate_scan_cache") as invalidate:
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.transition("qc")
+            invalidate.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        invalidate.assert_called_once_with([s.uuid for s in samples])
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        # Fora os INSERTs de Event (lotes do bulk_create, limitados pelo
+        # número de parâmetros do banco), o mesmo número de queries
+        counts = []
+        for n, target, status in ((20, "qc", "pending"), (600, "available", "qc")):
+            Sample.objects.all().delete()
+            self.create(n, status=status, prefix=target)
+            user = User.objects.get(pk=self.user.pk)
+            with CaptureQueriesContext(connection) as queries:
+                report = transition_samples(user, Sample.objects.all(), target)
+            self.assertEqual(report.updated, n)
+            self.assertEqual(Event.objects.filter(sample__status=target).count(), n)
+            inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "core_event"')]
+            self.assertLessEqual(len(inserts), n // 100 + 1)
+            counts.append(len(queries) - len(inserts))
+        self.assertEqual(counts[0], counts[1])
+
+    @benchmark
+    def test_transition_throughput(self):
+        self.create(BENCHMARK_ROWS)
+        user = User.objects.get(pk=self.user.pk)
+
+        with measure("transição de status", BENCHMARK_ROWS):
+            report = transition_samples(user, Sample.objects.all(), "qc")
+
+        self.assertEqual(report.updated, BENCHMARK_ROWS)
+        self.assertEqual(Event.objects.filter(event_type="qc_update").count(), BENCHMARK_ROWS)
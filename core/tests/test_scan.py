@@ -0,0 +1,97 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from core.models import Biobank, BiobankUserRole, Collection, CollectionUserRole, Sample
+from core.permissions.samples import can_view_sample
+from core.services.file_relocation import assign_collection
+from core.services.scan import lookup_samples
+from core.tests.test_visibility import TEST_CACHES
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ScanLookupQueryTests(TestCase):
+    """
+    Um lote de tubos de Collections e Biobanks diferentes, lido por um
+    usuário comum: uma query para os Samples, nenhuma por Collection.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # EffectiveAccess (edição em massa) é mantido por signals em on_commit
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.build()
+
+    @classmethod
+    def build(cls):
+        owner = User.objects.create_user("owner")
+        cls.user = User.objects.create_user("tech")
+        cls.samples = []
+        for b in range(3):
+            biobank = Biobank.objects.create(
+                name=f"B{b}", institution="Inst", owner=owner, visibility="biobank",
+            )
+            BiobankUserRole.objects.create(user=cls.user, biobank=biobank, role=BiobankUserRole.MEMBER)
+            for c, visibility in enumerate(("biobank", "private")):
+                collection = Collection.objects.create(
+                    name=f"B{b}/C{c}", biobank=biobank, owner=owner, visibility=visibility,
+                )
+                if visibility == "private" and b == 0:
+                    CollectionUserRole.objects.create(
+                        user=cls.user, collection=collection, role=CollectionUserRole.EDITOR,
+                    )
+                for s in range(2):
+                    cls.samples.append(Sample.objects.create(
+                        sample_id=f"S{b}{c}{s}", owner=owner, collection=collection,
+                    ))
+        # Tubo sem cadastro no meio do lote
+        cls.uuids = [str(s.uuid) for s in cls.samples[:10]] + ["00000000-0000-0000-0000-000000000000"]
+
+    def setUp(self):
+        for alias in ("permissions", "scan"):
+            caches[alias].clear()
+
+    def test_cold_batch_queries(self):
+        user = User.objects.get(pk=self.user.pk)
+        # Samples do lote (collection__biobank junto: as regras não buscam
+        # o Biobank de cada Collection), depois os papéis do usuário
+        with self.assertNumQueries(3):
+            results = lookup_samples(user, self.uuids)
+
+        visible = {u for u, summary in results.items() if summary}
+        viewer = User.objects.get(pk=self.user.pk)
+        self.assertEqual(visible, {
+            str(s.uuid) for s in self.samples[:10] if can_view_sample(viewer, s)
+        })
+        self.assertTrue(visible)
+        self.assertIsNone(results["00000000-0000-0000-0000-000000000000"])
+        summary = results[str(self.samples[2].uuid)]
+        self.assertTrue(summary["permissions"]["can_edit"])
+        self.assertEqual(summary["biobank"]["name"], "B0")
+
+    def test_warm_batch_queries(self):
+        user = User.objects.get(pk=self.user.pk)
+        known = self.uuids[:-1]
+        lookup_samples(user, known)
+        # Samples no cache de leitura; índice memoizado no usuário
+        with self.assertNumQueries(0):
+            lookup_samples(user, known)
+
+    def test_bulk_assignment_invalidates_after_commit(self):
+        user = User.objects.get(pk=self.user.pk)
+        sample, target = self.samples[2], self.samples[0].collection
+        key = str(sample.uuid)
+        self.assertEqual(lookup_samples(user, [key])[key]["collection"]["name"], "B0/C1")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            report = assign_collection(user, Sample.objects.filter(pk=sample.pk), target)
+            # Ainda na transação: o cache não é tocado
+            with self.assertNumQueries(0):
+                cached = lookup_samples(user, [key])[key]
+        self.assertEqual(report["updated"], 1)
+        self.assertEqual(cached["collection"]["name"], "B0/C1")
+
+        for callback in callbacks:
+            callback()
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(lookup_samples(user, [key])[key]["collection"]["name"], "B0/C0")
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import random
+import shutil
+import tempfile
+
+from Bio import bgzf
+from django.test import SimpleTestCase, override_settings
+
+from core.services.sequence_index import (
+    IndexedSequence,
+    SequenceIndexError,
+    build_index,
+    index_path,
+)
+
+
+class SequenceIndexTests(SimpleTestCase):
+    """
+    build_index + IndexedSequence sem banco: ida e volta de regiões em
+    FASTA comum e bgzip, e recusa de arquivos que o faidx não indexa.
+    """
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        index_settings = override_settings(SEQUENCE_INDEX_ROOT=os.path.join(self.root, "indexes"))
+        index_settings.enable()
+        self.addCleanup(index_settings.disable)
+
+    def write(self, filename, data, compressed=False):
+        path = os.path.join(self.root, filename)
+        if compressed:
+            with bgzf.BgzfWriter(path, "wb") as f:
+                f.write(data)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+        return path
+
+    def index(self, filename, data, compressed=False):
+        path = self.write(filename, data, compressed)
+        content_hash = hashlib.sha256(data).hexdigest()
+        target = index_path(content_hash)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        summary = build_index(path, filename, target)
+        return summary, IndexedSequence(path, content_hash, compressed)
+
+    def records(self, width=60):
+        rng = random.Random(7)
+        records = {f"c{i}": "".join(rng.choice("ACGTN") for _ in range(n))
+                   for i, n in enumerate((1, 59, 60, 61, 1000, 12345))}
+        data = "".join(
+            f">{name} desc\n" + "".join(seq[j:j + width] + "\n" for j in range(0, len(seq), width))
+            for name, seq in records.items()
+        ).encode()
+        return records, data
+
+    def assertRoundTrip(self, indexed, records):
+        rng = random.Random(3)
+        for _ in range(200):
+            name = rng.choice(list(records))
+            seq = records[name]
+            start = rng.randint(1, len(seq))
+            end = rng.randint(start, len(seq))
+            self.assertEqual(indexed.fetch(name, start, end)["sequence"], seq[start - 1:end])
+        for name, seq in records.items():
+            self.assertEqual(indexed.fetch(name)["sequence"], seq)
+
+    def test_plain_round_trip(self):
+        records, data = self.records()
+        summary, indexed = self.index("asm.fa", data)
+        with indexed:
+            self.assertEqual(summary, {"format": "fasta", "bgzf": False, "records": 6, "duplicates": 0})
+            self.assertRoundTrip(indexed, records)
+
+    def test_bgzip_round_trip(self):
+        records, data = self.records(width=70)
+        summary, indexed = self.index("asm.fa.gz", data, compressed=True)
+        with indexed:
+            self.assertEqual(summary, {"format": "fasta", "bgzf": True, "records": 6, "duplicates": 0})
+            self.assertRoundTrip(indexed, records)
+
+    def test_crlf_without_final_newline(self):
+        _, indexed = self.index("crlf.fasta", b">a\r\nACGT\r\nAC\r\n>b\r\nGGG")
+        with indexed:
+            self.assertEqual(indexed.fetch("a", 3, 6)["sequence"], "GTAC")
+            self.assertEqual(indexed.fetch("b")["sequence"], "GGG")
+
+    def test_blank_lines_between_records(self):
+        _, indexed = self.index("gaps.fa", b">a\nACGT\nTT\n\n\n>b\nGG\n\n")
+        with indexed:
+            self.assertEqual(indexed.fetch("a")["sequence"], "ACGTTT")
+            self.assertEqual(indexed.fetch("b")["sequence"], "GG")
+
+    def test_blank_line_inside_record_is_rejected(self):
+        # Como no samtools faidx: offsets por linha deixariam de valer
+        for data in (b">a\nACGT\n\nTTGG\n", b">a\n\nACGT\n"):
+            with self.subTest(data=data), self.assertRaises(SequenceIndexError):
+                self.index("blank.fa", data)
+
+    def test_irregular_line_width_is_rejected(self):
+        with self.assertRaises(SequenceIndexError):
+            self.index("bad.fa", b">a\nACG\nACGT\n")
@@ -0,0 +1,184 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from core.models import Sample, SampleFile, SampleFileUpload
+from core.services import uploads
+from core.tests.test_visibility import TEST_CACHES
+
+
+# Tamanho do upload grande (bytes). O pedido original é 2 GiB; no CI
+# basta um múltiplo pequeno do CHUNK_SIZE (ex.: UPLOAD_TEST_SIZE=2147483648)
+LARGE_SIZE = int(os.environ.get("UPLOAD_TEST_SIZE", 64 * 1024 ** 2))
+
+# Teto de memória Python alocada durante o upload grande: o corpo é
+# lido em blocos de READ_BLOCK, nunca uma parte inteira
+MEMORY_CEILING = 4 * uploads.READ_BLOCK
+
+
+class SyntheticBody:
+    """
+    Corpo de uma parte gerado sob demanda em blocos de 1 MiB (wsgi.input
+    em stream, como um servidor real), sem materializar a parte.
+    """
+    BLOCK = 1024 * 1024
+
+    def __init__(self, seed: bytes, chunk: int, length: int):
+        self.seed, self.chunk, self.length = seed, chunk, length
+        self.position, self.buffer = 0, b""
+
+    @classmethod
+    def block(cls, seed, chunk, index):
+        return chunk.to_bytes(4, "big") + index.to_bytes(4, "big") + seed[8:cls.BLOCK]
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.length
+        while len(self.buffer) < size and self.position < self.length:
+            block = self.block(self.seed, self.chunk, self.position // self.BLOCK)
+            block = block[:self.length - self.position]
+            self.position += len(block)
+            self.buffer += block
+        out, self.buffer = self.buffer[:size], self.buffer[size:]
+        return out
+
+    readline = read
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ChunkedUploadTests(TestCase):
+    """
+    start_upload_view → upload_chunk_view pelo cliente de teste: retomada,
+    verificação do SHA-256 e criação do SampleFile.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("tech", password="x")
+        cls.sample = Sample.objects.create(sample_id="S-1", owner=cls.user)
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.addCleanup(uploads._hashers.clear)
+        self.client.force_login(self.user)
+
+    def start(self, filename, size, sha256=""):
+        response = self.client.post(
+            f"/samples/{self.sample.pk}/uploads/",
+            {"filename": filename, "size": size, "sha256": sha256},
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def put(self, url, body, offset, length, total):
+        # Corpo entregue pelo handler WSGI; Content-Length pode ser maior
+        # que o corpo (conexão que caiu no meio da parte)
+        return self.client.request(**{
+            "PATH_INFO": url,
+            "REQUEST_METHOD": "PUT",
+            "CONTENT_TYPE": "application/octet-stream",
+            "CONTENT_LENGTH": str(length),
+            "HTTP_CONTENT_RANGE": f"bytes {offset}-{offset + length - 1}/{total}",
+            "wsgi.input": body,
+        })
+
+    def put_bytes(self, url, data, offset, total):
+        return self.put(url, io.BytesIO(data), offset, len(data), total)
+
+    def test_resume_after_interrupted_chunk(self):
+        chunk = uploads.CHUNK_SIZE
+        data = os.urandom(chunk * 2 + 123)
+        sha256 = hashlib.sha256(data).hexdigest()
+        url = self.start("reads.fastq", len(data), sha256)["url"]
+
+        self.assertEqual(self.put_bytes(url, data[:chunk], 0, len(data)).status_code, 200)
+
+        # Segunda parte cai no meio: o que chegou fica gravado
+        cut = chunk // 3
+        response = self.put(url, io.BytesIO(data[chunk:chunk + cut]), chunk, chunk, len(data))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["offset"], chunk + cut)
+
+        # Parte repetida no offset antigo: 409 com a posição do servidor
+        response = self.put_bytes(url, data[:chunk], 0, len(data))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["offset"], chunk + cut)
+
+        # Retomada em outro processo: hash parcial reconstruído do disco
+        uploads._hashers.clear()
+        offset = self.client.get(url).json()["offset"]
+        self.assertEqual(offset, chunk + cut)
+        self.assertEqual(self.put_bytes(url, data[offset:2 * chunk], offset, len(data)).status_code, 200)
+
+        response = self.put_bytes(url, data[2 * chunk:], 2 * chunk, len(data))
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["sha256"], sha256)
+
+        sample_file = SampleFile.objects.get(pk=response.json()["file"]["id"])
+        self.assertEqual(sample_file.sha256, sha256)
+        self.assertEqual(sample_file.file_size, len(data))
+        self.assertEqual(sample_file.name, "reads.fastq")
+        self.assertEqual(sample_file.category, "sequence")
+        with sample_file.file.open("rb") as f:
+            self.assertEqual(hashlib.sha256(f.read()).hexdigest(), sha256)
+
+        upload = SampleFileUpload.objects.get(pk=response.json()["id"])
+        self.assertEqual(upload.status, SampleFileUpload.COMPLETE)
+        self.assertFalse(os.path.exists(upload.part_path))
+
+    def test_checksum_mismatch_is_rejected(self):
+        info = self.start("bad.bin", 4, "0" * 64)
+        response = self.put_bytes(info["url"], b"abcd", 0, 4)
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["status"], SampleFileUpload.FAILED)
+        self.assertEqual(response.json()["sha256"], hashlib.sha256(b"abcd").hexdigest())
+        self.assertFalse(SampleFile.objects.exists())
+        self.assertFalse(os.path.exists(SampleFileUpload.objects.get(pk=info["id"]).part_path))
+
+        # Sessão encerrada: novas partes são recusadas
+        response = self.put_bytes(info["url"], b"abcd", 0, 4)
+        self.assertEqual(response.status_code, 422)
+        self.assertIn("não está em andamento", response.json()["error"])
+        self.assertFalse(SampleFile.objects.exists())
+
+    def test_other_users_cannot_touch_the_upload(self):
+        url = self.start("a.bin", 4)["url"]
+        self.client.force_login(User.objects.create_user("other"))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.put_bytes(url, b"abcd", 0, 4).status_code, 403)
+
+    def test_large_upload_streams_with_bounded_memory(self):
+        chunk = uploads.CHUNK_SIZE
+        total = max(LARGE_SIZE // chunk, 1) * chunk
+        seed = os.urandom(SyntheticBody.BLOCK)
+
+        digest = hashlib.sha256()
+        for i in range(total // chunk):
+            for k in range(chunk // SyntheticBody.BLOCK):
+                digest.update(SyntheticBody.block(seed, i, k))
+        info = self.start("big.fastq", total, digest.hexdigest())
+
+        tracemalloc.start()
+        try:
+            for i in range(total // chunk):
+                response = self.put(info["url"], SyntheticBody(seed, i, chunk), i * chunk, chunk, total)
+                self.assertIn(response.status_code, (200, 201), response.content)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(peak, MEMORY_CEILING)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["sha256"], digest.hexdigest())
+        self.assertEqual(response.json()["file"]["file_size"], total)
@@ -0,0 +1,209 @@
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import TestCase, override_settings
+
+from core.models import (
+    Biobank,
+    BiobankUserRole,
+    Collection,
+    CollectionUserRole,
+    Sample,
+)
+from core.permissions.biobanks import can_view_biobank
+from core.permissions.collections import can_view_collection
+from core.permissions.samples import can_edit_sample, can_view_sample
+
+
+# Cache de permissões em memória: nada de arquivos entre execuções
+TEST_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "permissions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test-permissions"},
+    "scan": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test-scan"},
+}
+
+
+def build_matrix(cls):
+    """
+    Usuários, papéis, Biobanks / Collections em toda visibilidade e
+    Samples (inclusive rascunhos), gravados como atributos de `cls`.
+    """
+    def user(name, **flags):
+        return User.objects.create(username=name, **flags)
+
+    cls.owner = user("owner")
+    cls.users = {
+        "staff": user("staff", is_staff=True),
+        "superuser": user("superuser", is_superuser=True),
+        "owner": cls.owner,
+        "biobank_owner": user("biobank_owner"),
+        "biobank_manager": user("biobank_manager"),
+        "biobank_member": user("biobank_member"),
+        "biobank_viewer": user("biobank_viewer"),
+        "coordinator": user("coordinator"),
+        "collection_editor": user("collection_editor"),
+        "collection_viewer": user("collection_viewer"),
+        "collection_owner_field": user("collection_owner_field"),
+        "outsider": user("outsider"),
+    }
+
+    # Biobanks: toda visibilidade, ativo e desativado
+    cls.biobanks = [
+        Biobank.objects.create(
+            name=f"{visibility}-{'on' if active else 'off'}",
+            institution="Inst",
+            owner=cls.owner,
+            visibility=visibility,
+            is_active=active,
+        )
+        for visibility in ("private", "biobank", "public")
+        for active in (True, False)
+    ]
+
+    # Collections: toda visibilidade em cada Biobank
+    cls.collections = [
+        Collection.objects.create(
+            name=f"{biobank.name}/{visibility}",
+            biobank=biobank,
+            owner=cls.owner,
+            visibility=visibility,
+        )
+        for biobank in cls.biobanks
+        for visibility in ("private", "group", "biobank", "public")
+    ]
+
+    # Papéis de Biobank nos Biobanks restritos (ativo e desativado)
+    restricted = [b for b in cls.biobanks if b.visibility == "biobank"]
+    for name, role in (
+        ("biobank_owner", BiobankUserRole.OWNER),
+        ("biobank_manager", BiobankUserRole.MANAGER),
+        ("biobank_member", BiobankUserRole.MEMBER),
+        ("biobank_viewer", BiobankUserRole.VIEWER),
+    ):
+        for biobank in restricted:
+            BiobankUserRole.objects.create(user=cls.users[name], biobank=biobank, role=role)
+    # Papel em Biobank privado não dá visibilidade (só o owner vê)
+    BiobankUserRole.objects.create(
+        user=cls.users["biobank_member"], biobank=cls.biobanks[0], role=BiobankUserRole.MEMBER,
+    )
+
+    # ACL local: uma Collection privada de cada Biobank privado
+    private_collections = [
+        c for c in cls.collections
+        if c.visibility == "private" and c.biobank.visibility == "private"
+    ]
+    for name, role in (
+        ("coordinator", CollectionUserRole.OWNER),
+        ("collection_editor", CollectionUserRole.EDITOR),
+        ("collection_viewer", CollectionUserRole.VIEWER),
+    ):
+        for collection in private_collections:
+            CollectionUserRole.objects.create(user=cls.users[name], collection=collection, role=role)
+
+    # Dono científico (campo owner) de uma Collection privada
+    owned = private_collections[0]
+    owned.owner = cls.users["collection_owner_field"]
+    owned.save()
+
+    # Samples: uma por Collection, mais rascunhos (sem Collection)
+    for i, collection in enumerate(cls.collections):
+        Sample.objects.create(sample_id=f"S{i:03d}", owner=cls.owner, collection=collection)
+    for name in ("outsider", "coordinator", "owner"):
+        Sample.objects.create(sample_id=f"DRAFT-{name}", owner=cls.users[name])
+
+
+def viewers(users):
+    yield "anonymous", AnonymousUser()
+    for name, user in users.items():
+        # Instância nova: sem índice de permissões memoizado
+        yield name, User.objects.get(pk=user.pk)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class VisibleToParityTests(TestCase):
+    """
+    `.visible_to(user)` (regras compiladas em SQL, core.permissions.queries)
+    tem de devolver exatamente os objetos aprovados pelas funções por
+    objeto (can_view_*), em uma matriz fixa de usuários, papéis,
+    visibilidades e Samples em rascunho.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # EffectiveAccess é mantido por signals em on_commit
+        with cls.captureOnCommitCallbacks(execute=True):
+            build_matrix(cls)
+
+    def viewers(self):
+        return viewers(self.users)
+
+    def assertParity(self, queryset, objects, rule):
+        for name, user in self.viewers():
+            with self.subTest(user=name):
+                self.assertEqual(
+                    set(queryset(user).values_list("pk", flat=True)),
+                    {o.pk for o in objects if rule(user, o)},
+                )
+
+    def test_biobanks(self):
+        self.assertParity(
+            Biobank.objects.visible_to, Biobank.objects.all(), can_view_biobank,
+        )
+
+    def test_collections(self):
+        self.assertParity(
+            Collection.objects.visible_to,
+            Collection.objects.select_related("biobank"),
+            can_view_collection,
+        )
+
+    def test_samples(self):
+        self.assertParity(
+            Sample.objects.visible_to,
+            Sample.objects.select_related("collection__biobank"),
+            can_view_sample,
+        )
+
+    def test_editable_samples(self):
+        self.assertParity(
+            Sample.objects.editable_by,
+            Sample.objects.select_related("collection__biobank"),
+            can_edit_sample,
+        )
+
+    def test_matrix_is_not_trivial(self):
+        # Cada perfil vê um subconjunto próprio: a paridade não é "tudo" / "nada"
+        seen = {
+            name: frozenset(Sample.objects.visible_to(user).values_list("pk", flat=True))
+            for name, user in self.viewers()
+        }
+        self.assertEqual(seen["anonymous"], frozenset())
+        # Admin vê toda Sample com Collection; rascunhos só do criador / coordenador
+        self.assertEqual(
+            seen["superuser"],
+            frozenset(Sample.objects.filter(collection__isnull=False).values_list("pk", flat=True)),
+        )
+        self.assertLess(len(seen["outsider"]), len(seen["biobank_member"]))
+        self.assertGreater(len(set(seen.values())), 5)
+
+    def test_parity_after_acl_changes(self):
+        # Signals mantêm EffectiveAccess e invalidam o cache de permissões
+        with self.captureOnCommitCallbacks(execute=True):
+            restricted = Biobank.objects.get(name="biobank-on")
+            restricted.visibility = "private"
+            restricted.save()
+            CollectionUserRole.objects.filter(user=self.users["collection_viewer"]).delete()
+            BiobankUserRole.objects.create(
+                user=self.users["outsider"],
+                biobank=Biobank.objects.get(name="public-on"),
+                role=BiobankUserRole.MANAGER,
+            )
+
+        self.assertParity(
+            Sample.objects.visible_to,
+            Sample.objects.select_related("collection__biobank"),
+            can_view_sample,
+        )
+        self.assertParity(
+            Sample.objects.editable_by,
+            Sample.objects.select_related("collection__biobank"),
+            can_edit_sample,
+        )
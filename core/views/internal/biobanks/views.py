@@ -1,6 +1,7 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.db import transaction
+from django.db.models import Prefetch
 from django.core.exceptions import PermissionDenied
 
 from core.context import base_context
@@ -9,13 +10,10 @@ from core.forms import BiobankForm
 from core.models.biobanks.biobank import Biobank
 from core.models.biobanks.biobank_user_role import BiobankUserRole
 from core.models.tags.model import Tag
-from core.models.keywords.model import Keyword, KeywordValue
 
-from core.permissions.biobanks import (
-    can_view_biobank,
-    can_edit_biobank,
-    can_manage_biobank_permissions,
-)
+from core.permissions.biobanks import can_edit_biobank
+from core.permissions.index import PermissionIndex
+from core.services.keywords import attach_keywords, parse_keyword_pairs
 
 
 def biobanks_view(request):
@@ -76,20 +74,10 @@ def biobanks_view(request):
                 # ------------------------------
                 # 4) KEYWORDS (custom M2M)
                 # ------------------------------
-                for raw in request.POST.getlist("keyword_pairs"):
-                    if ":::" not in raw:
-                        continue
-
-                    key, value = map(str.strip, raw.split(":::"))
-                    if not key or not value:
-                        continue
-
-                    keyword_obj, _ = Keyword.objects.get_or_create(name=key)
-                    kv, _ = KeywordValue.objects.get_or_create(
-                        keyword=keyword_obj,
-                        value=value
-                    )
-                    biobank.keywords.add(kv)
+                attach_keywords(
+                    biobank,
+                    parse_keyword_pairs(request.POST.getlist("keyword_pairs")),
+                )
 
                 messages.success(request, "Biobank created successfully!")
 
@@ -137,32 +125,27 @@ def biobanks_view(request):
 
     # -----------------------------------------------------
     # FILTER BIOBANKS BY PERMISSION + VISIBILITY
+    # (papéis do usuário carregados uma única vez)
     # -----------------------------------------------------
-    visible_biobanks = []
-
-    for b in Biobank.objects.filter(is_active=True).order_by("name"):
-
-        # permission layer
-        if not can_view_biobank(user, b):
-            continue
-
-        # visibility layer
-        if b.visibility == "private" and b.owner != user:
-            continue
+    index = PermissionIndex.for_user(user)
+
+    biobanks_qs = (
+        Biobank.objects
+        .visible_to(user)
+        .prefetch_related(
+            Prefetch(
+                "user_roles",
+                queryset=BiobankUserRole.objects.select_related("user"),
+            )
+        )
+        .order_by("name")
+    )
 
-        visible_biobanks.append(b)
+    # permission layer + FLAGS FOR TEMPLATE
+    visible_biobanks = index.visible_biobanks(biobanks_qs)
 
-    # -----------------------------------------------------
-    # FLAGS FOR TEMPLATE
-    # -----------------------------------------------------
     for b in visible_biobanks:
-        b.can_edit = can_edit_biobank(user, b)
-        b.can_manage_members = can_manage_biobank_permissions(user, b)
-        b.members_roles = (
-            b.user_roles
-            .select_related("user")
-            .all()
-        )
+        b.members_roles = b.user_roles.all()
 
     ctx["biobanks"] = visible_biobanks
 
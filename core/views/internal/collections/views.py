@@ -1,6 +1,7 @@
 from django.contrib import messages
 from django.shortcuts import redirect, render, get_object_or_404
 from django.db import transaction
+from django.db.models import Prefetch
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.decorators import login_required
 
@@ -11,15 +12,11 @@ from core.models import (
     Collection,
     CollectionUserRole,
     Tag,
-    Keyword,
-    KeywordValue,
 )
 
-from core.permissions.collections import (
-    can_view_collection,
-    can_edit_collection,
-    can_manage_collection_permissions,
-)
+from core.permissions.collections import can_manage_collection_permissions
+from core.permissions.index import PermissionIndex
+from core.services.keywords import attach_keywords, parse_keyword_pairs
 
 @login_required
 def collections_view(request):
@@ -58,21 +55,10 @@ def collections_view(request):
                         collection.tags.set(selected_tags)
 
                     # Processamento de KEYWORDS (Padrão Chave:::Valor)
-                    pairs = request.POST.getlist("keyword_pairs")
-                    for raw in pairs:
-                        if ":::" not in raw:
-                            continue
-
-                        key, value = raw.split(":::")
-                        key, value = key.strip(), value.strip()
-
-                        if key and value:
-                            keyword_obj, _ = Keyword.objects.get_or_create(name=key)
-                            kv, _ = KeywordValue.objects.get_or_create(
-                                keyword=keyword_obj,
-                                value=value
-                            )
-                            collection.keywords.add(kv)
+                    attach_keywords(
+                        collection,
+                        parse_keyword_pairs(request.POST.getlist("keyword_pairs")),
+                    )
 
                     messages.success(request, "Collection criada com sucesso!")
                     return redirect("/?page=collections")
@@ -133,19 +119,28 @@ def collections_view(request):
     ctx["preselect_tag"] = request.session.pop("new_tag_id", None)
 
     # Filtragem de listagem (Apenas Ativas)
-    collections_qs = Collection.objects.filter(is_active=True)
+    collections_qs = (
+        Collection.objects
+        .filter(is_active=True)
+        .visible_to(user)
+        .select_related("biobank")
+        .prefetch_related(
+            # Otimização: Carrega papéis dos membros para exibição
+            Prefetch(
+                "user_roles",
+                queryset=CollectionUserRole.objects.select_related("user"),
+            )
+        )
+    )
     if biobank_id:
         collections_qs = collections_qs.filter(biobank_id=biobank_id)
 
-    visible_collections = []
-    for c in collections_qs:
-        if can_view_collection(user, c):
-            c.can_edit = can_edit_collection(user, c)
-            c.can_manage_members = can_manage_collection_permissions(user, c)
-            
-            # Otimização: Carrega papéis dos membros para exibição
-            c.members_roles = c.user_roles.select_related("user").all()
-            visible_collections.append(c)
+    # Papéis do usuário carregados uma única vez para todo o lote
+    index = PermissionIndex.for_user(user)
+    visible_collections = index.visible_collections(collections_qs)
+
+    for c in visible_collections:
+        c.members_roles = c.user_roles.all()
 
     ctx["collections"] = visible_collections
 
@@ -0,0 +1,57 @@
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from core.models import Job
+from core.services.jobs import cancel_job, job_summary
+
+
+def _get_job(request, job_id):
+    job = get_object_or_404(Job, id=job_id)
+    if not (request.user.is_staff or job.created_by_id == request.user.id):
+        raise PermissionDenied
+    return job
+
+
+def job_accepted(job) -> JsonResponse:
+    """
+    Resposta padrão das views que enfileiram trabalho (202 + URL de polling).
+    """
+    return JsonResponse(
+        {
+            "job": job.pk,
+            "status": job.status,
+            "status_url": reverse("job_status", args=[job.pk]),
+        },
+        status=202,
+    )
+
+
+# =========================================================
+# POLLING / CANCELAMENTO
+# =========================================================
+@login_required
+def job_status_view(request, job_id):
+    """
+    Estado, progresso e logs da tarefa. ?after=<id do último log>
+    devolve só as linhas novas.
+    """
+    job = _get_job(request, job_id)
+
+    after = request.GET.get("after", "")
+    return JsonResponse(job_summary(job, after_log=int(after) if after.isdigit() else 0))
+
+
+@login_required
+def job_cancel_view(request, job_id):
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    job = _get_job(request, job_id)
+    if not cancel_job(job):
+        return JsonResponse({"error": "Tarefa já finalizada."}, status=409)
+
+    job.refresh_from_db()
+    return JsonResponse(job_summary(job))
@@ -1,8 +1,31 @@
+import os
+import uuid
+
 from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.text import slugify
 
 # Imports Específicos do Molecular
 from core.models.lab_tools.molecular import MolecularSequence
+from core.services.jobs import enqueue
+from core.services.molecular_import import INLINE_MAX_SIZE, import_fasta, is_fasta
+from core.views.internal.jobs.views import job_accepted
+
+
+# Grade de leitura: resíduos por linha e linhas por página
+ROW_SIZE = 80
+PAGE_ROWS = 100
+
+# Acima disto o mapa (SeqViz) não é desenhado: receberia o genoma inteiro
+MAP_MAX_LENGTH = 100_000
+
+# Resíduos por bloco no download FASTA (múltiplo da linha de 60)
+DOWNLOAD_CHUNK = 60 * 16_384
 
 
 # --- MOLECULAR VIEWER VIEWS ---
@@ -10,7 +33,7 @@ from core.models.lab_tools.molecular import MolecularSequence
 @login_required
 def molecular_index(request):
     """Lista todas as sequências moleculares salvas"""
-    sequences = MolecularSequence.objects.all().order_by('-created_at')
+    sequences = MolecularSequence.objects.defer(*MolecularSequence.PACKED_FIELDS).order_by('-created_at')
     return render(request, 'internal/lab_tools/molecular_list.html', {
         'sequences': sequences
     })
@@ -28,14 +51,26 @@ def molecular_upload(request):
         sequence_data = request.POST.get('sequence_data')
         description = request.POST.get('description')
 
-        # Criação do registro no banco de dados
-        new_seq = MolecularSequence.objects.create(
+        # Criação do registro no banco de dados (conteúdo compactado)
+        new_seq = MolecularSequence(
             name=name,
             seq_type=seq_type,
-            sequence_data=sequence_data,
             description=description,
             author=request.user
         )
+        new_seq.set_sequence(sequence_data or '')
+        try:
+            with transaction.atomic():
+                new_seq.save()
+        except IntegrityError:
+            # Conteúdo idêntico já cadastrado (constraint molecular_unique_content)
+            existing = MolecularSequence.objects.only('id', 'name').filter(
+                seq_type=new_seq.seq_type, sequence_hash=new_seq.sequence_hash,
+            ).first()
+            if existing is None:
+                raise
+            messages.info(request, f"Sequência idêntica já cadastrada: {existing.name}.")
+            return redirect('molecular_viewer', seq_id=existing.id)
 
         # Redireciona imediatamente para o visualizador da molécula recém-criada
         return redirect('molecular_viewer', seq_id=new_seq.id)
@@ -43,31 +78,137 @@ def molecular_upload(request):
     return redirect('molecular_index')
 
 
+@login_required
+def molecular_import_fasta(request):
+    """
+    Importa um arquivo multi-FASTA (campo "fasta_file", .gz aceito) como
+    uma MolecularSequence por registro. Arquivos até INLINE_MAX_SIZE são
+    processados na hora; maiores vão para a fila (runworker) e a página
+    volta imediatamente.
+    """
+    if request.method != "POST":
+        return redirect('molecular_index')
+
+    upload = request.FILES.get('fasta_file')
+    seq_type = request.POST.get('seq_type', 'DNA')
+    description = request.POST.get('description', '')
+
+    if not upload or not is_fasta(upload.name):
+        messages.error(request, "Envie um arquivo FASTA (.fasta, .fa, .fna, .faa, opcionalmente .gz).")
+        return redirect('molecular_index')
+    if seq_type not in ('DNA', 'PROTEIN'):
+        messages.error(request, "Importação FASTA só para DNA ou Proteína.")
+        return redirect('molecular_index')
+
+    if upload.size <= INLINE_MAX_SIZE:
+        report = import_fasta(upload.file, upload.name, seq_type, request.user, description)
+        messages.success(
+            request,
+            f"{report.created} sequências importadas ({report.duplicates} repetidas, "
+            f"{report.invalid} inválidas).",
+        )
+        for error in report.errors[:5]:
+            messages.warning(request, f"{error['record']}: {error['error']}")
+        return redirect('molecular_index')
+
+    # Arquivo grande: salvo no armazenamento (em blocos) e processado pelo worker
+    _, ext = os.path.splitext(upload.name)
+    path = default_storage.save(os.path.join("molecular_imports", f"{uuid.uuid4().hex}{ext}"), upload)
+    job = enqueue(
+        "molecular.import_fasta",
+        user=request.user,
+        path=path,
+        filename=upload.name,
+        seq_type=seq_type,
+        description=description,
+    )
+
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        return job_accepted(job)
+
+    messages.info(
+        request,
+        f"Importação de {upload.name} enfileirada (tarefa #{job.pk}). "
+        f"Acompanhe em {reverse('job_status', args=[job.pk])}.",
+    )
+    return redirect('molecular_index')
+
+
+def _page_start(request, length: int) -> int:
+    """?start= (1-based) alinhado ao início da linha da grade"""
+    try:
+        start = int(request.GET.get('start', 1)) - 1
+    except ValueError:
+        start = 0
+    if start >= length:
+        # Além do fim: última página
+        start = max(length - 1, 0) // (ROW_SIZE * PAGE_ROWS) * (ROW_SIZE * PAGE_ROWS)
+    start = max(start, 0)
+    return start - start % ROW_SIZE
+
+
 @login_required
 def molecular_viewer(request, seq_id):
-    """Visualizador Híbrido: 3D para PDB e Texto formatado para DNA/Proteína"""
-    sequence = get_object_or_404(MolecularSequence, id=seq_id)
+    """
+    Visualizador Híbrido: 3D para PDB e Texto formatado para DNA/Proteína.
+    A grade de texto mostra uma janela de PAGE_ROWS linhas (?start=):
+    só esses resíduos são lidos do banco e decodificados.
+    """
+    sequence = get_object_or_404(
+        MolecularSequence.objects.defer(*MolecularSequence.PACKED_FIELDS), id=seq_id,
+    )
 
     context = {
         'sequence': sequence,
         'formatted_seq': None
     }
 
+    if sequence.seq_type == 'PDB':
+        context['structure'] = sequence.text
+
     # Lógica de formatação para leitura biológica (blocos de texto de 80 caracteres)
     if sequence.seq_type in ['DNA', 'PROTEIN']:
-        # Remove quebras de linha espúrias e normaliza para maiúsculas
-        raw = sequence.sequence_data.replace('\n', '').replace('\r', '').upper()
-
-        # Divide em chunks de 80 caracteres para melhor leitura no grid
-        chunks = [raw[i:i + 80] for i in range(0, len(raw), 80)]
+        start = _page_start(request, sequence.length)
+        page_size = ROW_SIZE * PAGE_ROWS
+        window = sequence.read(start, start + page_size)
+
+        context['formatted_seq'] = [
+            {'index': start + offset + 1, 'text': window[offset:offset + ROW_SIZE]}
+            for offset in range(0, len(window), ROW_SIZE)
+        ]
+        context['seq_length'] = sequence.length
+        context['window_text'] = window
+        context['window_start'] = start + 1
+        context['window_end'] = start + len(window)
+        context['prev_start'] = max(start - page_size, 0) + 1 if start else None
+        context['next_start'] = start + page_size + 1 if start + page_size < sequence.length else None
+        context['last_start'] = max(sequence.length - 1, 0) // page_size * page_size + 1
+        context['show_map'] = sequence.length <= MAP_MAX_LENGTH
+        if context['show_map']:
+            context['map_seq'] = sequence.read()
+
+    return render(request, 'internal/lab_tools/molecular_viewer.html', context)
 
-        formatted_seq = []
-        current_index = 1
-        for chunk in chunks:
-            formatted_seq.append({'index': current_index, 'text': chunk})
-            current_index += 80
 
-        context['formatted_seq'] = formatted_seq
-        context['seq_length'] = len(raw)
-
-    return render(request, 'internal/lab_tools/molecular_viewer.html', context)
\ No newline at end of file
+@login_required
+def molecular_download(request, seq_id):
+    """FASTA (DNA / proteína) ou PDB inteiro, decodificado em blocos"""
+    sequence = get_object_or_404(
+        MolecularSequence.objects.defer(*MolecularSequence.PACKED_FIELDS), id=seq_id,
+    )
+    filename = slugify(sequence.name) or f"sequence-{sequence.pk}"
+
+    if sequence.seq_type == 'PDB':
+        response = HttpResponse(sequence.text, content_type='chemical/x-pdb')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.pdb"'
+        return response
+
+    def fasta():
+        yield f">{sequence.name}\n"
+        for start in range(0, sequence.length, DOWNLOAD_CHUNK):
+            chunk = sequence.read(start, start + DOWNLOAD_CHUNK)
+            yield "".join(chunk[i:i + 60] + "\n" for i in range(0, len(chunk), 60))
+
+    response = StreamingHttpResponse(fasta(), content_type='text/x-fasta')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.fasta"'
+    return response
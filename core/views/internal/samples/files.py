@@ -0,0 +1,248 @@
+import re
+
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from core.models import SampleFile
+from core.permissions.samples import can_view_sample
+from core.services.file_serving import serve_file
+from core.services.image_previews import image_preview_for, preview_path
+from core.services.sequence_index import (
+    IndexedSequence,
+    SequenceIndexError,
+    indexable,
+    parse_region,
+    request_sequence_index,
+    sequence_index_for,
+)
+from core.services.sequence_metadata import sequence_metadata_for
+from core.services.table_previews import (
+    MAX_WINDOW,
+    TablePreviewError,
+    read_window,
+    request_table_summary,
+    table_summary,
+    table_summary_for,
+)
+
+
+def _get_sample_file(request, file_id):
+    sample_file = get_object_or_404(SampleFile.objects.select_related("sample"), id=file_id)
+    if not can_view_sample(request.user, sample_file.sample):
+        raise PermissionDenied
+    return sample_file
+
+
+# =========================================================
+# DOWNLOAD
+# =========================================================
+@require_safe
+@login_required
+def sample_file_download_view(request, file_id):
+    """
+    Download do anexo com checagem de permissão. Suporta Range
+    (retomada, leitura parcial por visualizadores) e revalidação por
+    ETag (SHA-256) / Last-Modified. ?inline=1 abre no navegador.
+    """
+    sample_file = _get_sample_file(request, file_id)
+    try:
+        return serve_file(
+            request,
+            sample_file.file.path,
+            filename=sample_file.display_name,
+            content_type=sample_file.mime_type,
+            etag=sample_file.sha256 or None,
+            last_modified=sample_file.uploaded_at,
+            as_attachment=request.GET.get("inline") != "1",
+        )
+    except FileNotFoundError:
+        raise Http404("Arquivo não encontrado no armazenamento.")
+
+
+# =========================================================
+# PRÉVIAS DE IMAGEM
+# =========================================================
+# Só os nomes gerados por core.services.image_previews
+_PREVIEW_NAME = re.compile(r"^(thumb|preview)\.jpg$|^tiles/\d+/\d+_\d+\.jpg$")
+
+
+@require_safe
+@login_required
+def sample_file_preview_view(request, file_id, content_hash, name):
+    """
+    Miniatura, prévia e blocos da pirâmide. O hash do conteúdo faz parte
+    da URL: cache de um ano no navegador, e conteúdo novo = URL nova.
+    """
+    sample_file = _get_sample_file(request, file_id)
+    if content_hash != sample_file.sha256 or not _PREVIEW_NAME.match(name):
+        raise Http404
+    try:
+        return serve_file(
+            request,
+            preview_path(content_hash, name),
+            filename=name.replace("/", "_"),
+            content_type="image/jpeg",
+            etag=f"{content_hash}-{name}",
+            as_attachment=False,
+            immutable=True,
+        )
+    except FileNotFoundError:
+        raise Http404("Prévia ainda não gerada.")
+
+
+def _image_info(sample_file) -> dict:
+    info = image_preview_for(sample_file)
+    if info["status"] != "ready":
+        return info
+
+    base = reverse("sample_file_preview", args=[sample_file.pk, sample_file.sha256, "thumb.jpg"])
+    base = base[:-len("thumb.jpg")]
+    info["thumbnail_url"] = base + "thumb.jpg"
+    info["preview_url"] = base + "preview.jpg"
+
+    data = info["data"]
+    if data.get("pyramid"):
+        # Tile source do OpenSeadragon (formato Deep Zoom)
+        info["dzi"] = {
+            "Image": {
+                "xmlns": "http://schemas.microsoft.com/deepzoom/2008",
+                "Url": base + "tiles/",
+                "Format": data["tile_format"],
+                "Overlap": str(data["overlap"]),
+                "TileSize": str(data["tile_size"]),
+                "Size": {"Width": str(data["width"]), "Height": str(data["height"])},
+            }
+        }
+    return info
+
+
+# =========================================================
+# PRÉVIA DE TABELAS
+# =========================================================
+@require_safe
+@login_required
+def sample_file_table_view(request, file_id):
+    """
+    Janela de linhas de um CSV/XLSX: ?offset= (0 = primeira linha de
+    dados), ?limit= (até MAX_WINDOW) e ?sheet= (XLSX). Lê só até o fim
+    da janela; com o resumo pronto, o CSV começa no ponto de retomada
+    mais próximo do offset.
+    """
+    sample_file = _get_sample_file(request, file_id)
+    if sample_file.category != "table":
+        return JsonResponse({"error": "O anexo não é uma tabela."}, status=400)
+
+    try:
+        offset = int(request.GET.get("offset", 0))
+        limit = int(request.GET.get("limit", 100))
+    except ValueError:
+        return JsonResponse({"error": f"offset / limit inválidos (limit máximo {MAX_WINDOW})."}, status=400)
+
+    summary = table_summary(sample_file.sha256) if sample_file.sha256 else None
+    try:
+        window = read_window(
+            sample_file.file.path,
+            sample_file.display_name,
+            offset=offset,
+            limit=limit,
+            sheet=request.GET.get("sheet") or None,
+            summary=summary.data if summary and summary.status == summary.READY else None,
+        )
+    except TablePreviewError as e:
+        return JsonResponse({"error": str(e)}, status=422)
+    except FileNotFoundError:
+        raise Http404("Arquivo não encontrado no armazenamento.")
+
+    return JsonResponse({"id": sample_file.pk, **window})
+
+
+# =========================================================
+# REGIÕES DE SEQUÊNCIA
+# =========================================================
+def _int_or_none(value):
+    return int(value.replace(",", "")) if value else None
+
+
+@require_safe
+@login_required
+def sample_file_region_view(request, file_id):
+    """
+    Trecho de um registro de FASTA/FASTQ pelo índice, sem ler o arquivo
+    inteiro: ?name=&start=&end= (1-based, fim inclusivo) ou
+    ?region=chr1:1000-2000. ?format=fasta devolve texto FASTA.
+    """
+    sample_file = _get_sample_file(request, file_id)
+    if sample_file.category != "sequence" or not indexable(sample_file.display_name):
+        return JsonResponse({"error": "Regiões só para anexos FASTA / FASTQ."}, status=400)
+
+    index = sequence_index_for(sample_file)
+    if index["status"] == "pending":
+        request_sequence_index(sample_file)
+        return JsonResponse({"status": "pending", "error": "Índice ainda não gerado."}, status=409)
+    if index["status"] != "ready":
+        return JsonResponse({"status": index["status"], "error": index.get("error", "")}, status=422)
+
+    try:
+        if request.GET.get("region"):
+            name, start, end = parse_region(request.GET["region"])
+        else:
+            name = request.GET.get("name", "")
+            start = _int_or_none(request.GET.get("start"))
+            end = _int_or_none(request.GET.get("end"))
+    except ValueError:
+        return JsonResponse({"error": "start / end inválidos."}, status=400)
+
+    try:
+        with IndexedSequence(sample_file.file.path, sample_file.sha256, index["data"]["bgzf"]) as indexed:
+            region = indexed.fetch(name, start, end)
+    except SequenceIndexError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except FileNotFoundError:
+        raise Http404("Arquivo não encontrado no armazenamento.")
+
+    if request.GET.get("format") == "fasta":
+        sequence = region["sequence"]
+        lines = "\n".join(sequence[i:i + 60] for i in range(0, len(sequence), 60))
+        return HttpResponse(
+            f">{region['name']}:{region['start']}-{region['end']}\n{lines}\n",
+            content_type="text/x-fasta; charset=ascii",
+        )
+    return JsonResponse({"id": sample_file.pk, **region})
+
+
+# =========================================================
+# METADADOS EXTRAÍDOS
+# =========================================================
+@login_required
+def sample_file_metadata_view(request, file_id):
+    """
+    Estatísticas do anexo (sequências: contagem, N50, GC%, qualidade,
+    histogramas, índice para regiões; imagens: dimensões e URLs das prévias / Deep Zoom;
+    tabelas: linhas e tipo / nulos / mín / máx por coluna).
+    "pending" enquanto a extração está na fila.
+    """
+    sample_file = _get_sample_file(request, file_id)
+
+    data = {
+        "id": sample_file.pk,
+        "name": sample_file.display_name,
+        "category": sample_file.category,
+        "file_size": sample_file.file_size,
+        "sha256": sample_file.sha256,
+    }
+    if sample_file.category == "sequence":
+        data["sequence"] = sequence_metadata_for(sample_file)
+        if indexable(sample_file.display_name):
+            data["index"] = sequence_index_for(sample_file)
+    elif sample_file.category == "image":
+        data["image"] = _image_info(sample_file)
+    elif sample_file.category == "table":
+        data["table"] = table_summary_for(sample_file)
+        # Tabelas anexadas antes do resumo existir: enfileira na primeira consulta
+        if data["table"]["status"] == "pending":
+            request_table_summary(sample_file)
+    return JsonResponse(data)
@@ -0,0 +1,56 @@
+from core.models import Sample
+
+
+# Parâmetros GET aceitos pela listagem de Samples
+SAMPLE_FILTER_PARAMS = ("status", "collection", "biobank", "tag", "kv", "organism")
+
+
+def sample_filters_from(params) -> dict:
+    """
+    Extrai os filtros ativos (não vazios) de um QueryDict.
+    """
+    filters = {}
+    for name in SAMPLE_FILTER_PARAMS:
+        value = (params.get(name) or "").strip()
+        if value:
+            filters[name] = value
+    return filters
+
+
+def apply_sample_filters(queryset, filters: dict):
+    """
+    Aplica os filtros da listagem no banco. IDs inválidos são ignorados.
+    """
+    valid_status = {key for key, _ in Sample.STATUS_CHOICES}
+
+    if filters.get("status") in valid_status:
+        queryset = queryset.filter(status=filters["status"])
+
+    for name, lookup in (
+        ("collection", "collection_id"),
+        ("biobank", "biobank_id"),
+        ("tag", "tags"),
+        ("kv", "keywords"),
+    ):
+        value = filters.get(name)
+        if value and value.isdigit():
+            queryset = queryset.filter(**{lookup: int(value)})
+
+    if filters.get("organism"):
+        queryset = queryset.filter(organism_name__istartswith=filters["organism"])
+
+    return queryset
+
+
+def sample_ids_from(params) -> list:
+    """
+    IDs de Sample de ?ids=1,2,3 e/ou ?sample= repetido (sem duplicatas,
+    na ordem informada).
+    """
+    ids = [
+        int(i)
+        for raw in params.getlist("ids") + params.getlist("sample")
+        for i in raw.split(",")
+        if i.strip().isdigit()
+    ]
+    return list(dict.fromkeys(ids))
@@ -0,0 +1,119 @@
+import re
+
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from core.models import Sample, SampleFileUpload
+from core.permissions.samples import can_edit_sample
+from core.services.uploads import (
+    OffsetMismatch,
+    UploadBusy,
+    UploadError,
+    abort_upload,
+    start_upload,
+    upload_summary,
+    write_chunk,
+)
+
+
+# Content-Range: bytes <início>-<fim>/<total>
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+
+def _summary(upload) -> dict:
+    return {**upload_summary(upload), "url": reverse("sample_upload", args=[upload.pk])}
+
+
+# =========================================================
+# ABERTURA DA SESSÃO
+# =========================================================
+@login_required
+def start_upload_view(request, sample_id):
+    """
+    POST filename + size [+ sha256, description]: abre um upload em
+    partes para o Sample e devolve a URL das partes e o chunk_size.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    sample = get_object_or_404(Sample, id=sample_id)
+    if not can_edit_sample(request.user, sample):
+        raise PermissionDenied
+
+    try:
+        upload = start_upload(
+            sample,
+            request.user,
+            filename=request.POST.get("filename", ""),
+            size=int(request.POST.get("size", "")),
+            sha256=request.POST.get("sha256", ""),
+            description=request.POST.get("description"),
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    return JsonResponse(_summary(upload), status=201)
+
+
+# =========================================================
+# PARTES / RETOMADA / CANCELAMENTO
+# =========================================================
+@login_required
+def upload_chunk_view(request, upload_id):
+    """
+    GET: offset atual (retomada). PUT/POST: corpo bruto com a parte,
+    posição em Content-Range (ou ?offset=). DELETE: cancela.
+
+    O corpo é lido do stream da requisição em blocos, sem passar pelos
+    upload handlers do Django (nada de request.body / request.FILES).
+    """
+    upload = get_object_or_404(SampleFileUpload.objects.select_related("sample"), pk=upload_id)
+    if upload.created_by_id != request.user.id:
+        raise PermissionDenied
+
+    if request.method == "GET":
+        return JsonResponse(_summary(upload))
+
+    if request.method not in ("PUT", "POST", "DELETE"):
+        return JsonResponse({"error": "Método não suportado."}, status=405)
+
+    if request.method == "DELETE":
+        if not abort_upload(upload):
+            return JsonResponse({"error": "Upload já finalizado."}, status=409)
+        return JsonResponse(_summary(upload))
+
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return JsonResponse({"error": "Content-Length inválido."}, status=400)
+
+    content_range = request.headers.get("Content-Range")
+    if content_range:
+        match = _CONTENT_RANGE.match(content_range.strip())
+        if not match:
+            return JsonResponse({"error": "Content-Range inválido."}, status=400)
+        offset, end, total = match.groups()
+        offset = int(offset)
+        if int(end) - offset + 1 != length or (total != "*" and int(total) != upload.size):
+            return JsonResponse({"error": "Content-Range não confere com o corpo."}, status=400)
+    else:
+        offset = request.GET.get("offset", "")
+        if not offset.isdigit():
+            return JsonResponse({"error": "Informe Content-Range ou ?offset=."}, status=400)
+        offset = int(offset)
+
+    try:
+        write_chunk(upload, offset, request, length)
+    except OffsetMismatch as e:
+        return JsonResponse({**_summary(upload), "error": str(e), "offset": e.expected}, status=409)
+    except UploadBusy as e:
+        return JsonResponse({**_summary(upload), "error": str(e)}, status=409)
+    except UploadError as e:
+        status = 422 if upload.status == SampleFileUpload.FAILED else 400
+        return JsonResponse({**_summary(upload), "error": str(e)}, status=status)
+
+    status = 201 if upload.status == SampleFileUpload.COMPLETE else 200
+    return JsonResponse(_summary(upload), status=status)
@@ -1,11 +1,14 @@
-import qrcode
-import io
-import base64
+import json
+import uuid
+from urllib.parse import urlencode
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
 
 from core.context import base_context
 from core.models import (
@@ -14,8 +17,6 @@ from core.models import (
     SampleFile,
     Biobank,
     Tag,
-    Keyword,
-    KeywordValue,
 )
 
 from core.permissions.samples import (
@@ -23,7 +24,30 @@ from core.permissions.samples import (
     can_edit_sample,
     can_delete_sample,
 )
-from core.permissions.collections import can_edit_collection
+from core.permissions.collections import can_edit_collection, can_view_collection
+from core.services.file_relocation import assign_collection
+from core.services.keywords import attach_keywords, parse_keyword_pairs
+from core.services.labels import (
+    LabelLayout,
+    ensure_qr_images,
+    normalize_level,
+    qr_path,
+    request_qr_images,
+)
+from core.services.pagination import keyset_page
+from core.services.sample_export import CONTENT_TYPES, export_samples
+from core.services.sample_import import import_samples
+from core.services.sample_status import transition_samples
+from core.services.scan import MAX_BATCH, lookup_samples
+from core.views.internal.samples.filters import (
+    apply_sample_filters,
+    sample_filters_from,
+    sample_ids_from,
+)
+
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
 
 @login_required
@@ -74,15 +98,10 @@ def samples_view(request):
                 sample.tags.set(Tag.objects.filter(id__in=tag_ids))
 
             # Processamento de Keywords (Metadados)
-            for raw in request.POST.getlist("keyword_pairs"):
-                if ":::" not in raw: continue
-                key, value = raw.split(":::")
-                keyword_obj, _ = Keyword.objects.get_or_create(name=key.strip())
-                kv, _ = KeywordValue.objects.get_or_create(
-                    keyword=keyword_obj,
-                    value=value.strip()
-                )
-                sample.keywords.add(kv)
+            attach_keywords(
+                sample,
+                parse_keyword_pairs(request.POST.getlist("keyword_pairs")),
+            )
 
             # Processamento de Arquivos (Attachments)
             files = request.FILES.getlist("files")
@@ -103,21 +122,214 @@ def samples_view(request):
 
     # =========================================================
     # 2. RENDERIZAÇÃO DA LISTAGEM (GET)
+    # Paginação por cursor (keyset) + filtros no servidor
     # =========================================================
     ctx = base_context(request)
 
-    # Filtros básicos para o Workspace
-    ctx["samples"] = Sample.objects.filter(is_active=True).order_by("-created_at")
-    ctx["collections"] = Collection.objects.all()
-    ctx["all_tags"] = Tag.objects.all()
-    ctx["biobanks"] = Biobank.objects.all()
+    filters = sample_filters_from(request.GET)
+    samples_qs = apply_sample_filters(
+        Sample.objects
+        .filter(is_active=True)
+        .visible_to(user)
+        .select_related("collection"),
+        filters,
+    )
+
+    try:
+        page_size = min(int(request.GET.get("page_size", PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = PAGE_SIZE
+
+    cursor = request.GET.get("cursor")
+    samples, next_cursor = keyset_page(samples_qs, cursor=cursor, page_size=max(page_size, 1))
+
+    ctx["samples"] = samples
+    ctx["next_cursor"] = next_cursor
+    ctx["is_first_page"] = not cursor
+    ctx["filters"] = filters
+    ctx["filter_query"] = urlencode(filters)
+    ctx["status_choices"] = Sample.STATUS_CHOICES
+
+    ctx["collections"] = Collection.objects.select_related("biobank").order_by("name")
+    ctx["all_tags"] = Tag.objects.all().order_by("name")
+    ctx["biobanks"] = Biobank.objects.all().order_by("name")
 
     return render(request, "internal/samples/samples.html", ctx)
 
 
+# =========================================================
+# IMPORTAÇÃO EM LOTE (CSV / TSV / XLSX)
+# =========================================================
+@login_required
+def import_samples_view(request):
+    """
+    Recebe um manifesto (campo "manifest") e importa em lote.
+    Com dry_run=1 apenas valida e devolve os erros por linha.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    upload = request.FILES.get("manifest")
+    if not upload:
+        return JsonResponse({"error": "Arquivo 'manifest' obrigatório."}, status=400)
+
+    dry_run = request.POST.get("dry_run") in ("1", "true", "on")
+
+    try:
+        report = import_samples(upload.file, upload.name, request.user, dry_run=dry_run)
+    except (ImportError, ValueError, UnicodeDecodeError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except IntegrityError:
+        # Conflitos de sample_id já voltam como erros por linha; aqui só
+        # o que sobrou (lotes anteriores já foram gravados)
+        return JsonResponse(
+            {"error": "Conflito ao gravar o lote; confira os Samples já importados e reenvie."},
+            status=409,
+        )
+
+    return JsonResponse(report.as_dict())
+
+
+# =========================================================
+# EXPORTAÇÃO EM STREAMING (CSV / JSONL)
+# =========================================================
+@login_required
+def export_samples_view(request):
+    """
+    Exporta os Samples visíveis ao usuário (mesmos filtros da
+    listagem) sem montar o resultado em memória.
+    """
+    fmt = request.GET.get("format", "csv")
+    if fmt not in CONTENT_TYPES:
+        return JsonResponse({"error": f"Formato inválido: '{fmt}'."}, status=400)
+
+    samples_qs = apply_sample_filters(
+        Sample.objects
+        .filter(is_active=True)
+        .visible_to(request.user),
+        sample_filters_from(request.GET),
+    )
+
+    response = StreamingHttpResponse(
+        export_samples(samples_qs, fmt),
+        content_type=CONTENT_TYPES[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="samples.{fmt}"'
+    return response
+
+
+# =========================================================
+# TRANSIÇÃO DE STATUS EM LOTE (QC)
+# =========================================================
+@login_required
+def transition_samples_view(request):
+    """
+    Muda o status de vários Samples de uma vez (placa de QC):
+    POST status=<destino> + ids ou collection; dry_run=1 só valida.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    ids = sample_ids_from(request.POST)
+    collection_id = request.POST.get("collection", "")
+
+    if ids:
+        samples_qs = Sample.objects.filter(pk__in=ids)
+    elif collection_id.isdigit():
+        samples_qs = Sample.objects.filter(collection_id=int(collection_id))
+    else:
+        return JsonResponse({"error": "Informe 'ids' ou 'collection'."}, status=400)
+
+    try:
+        report = transition_samples(
+            request.user,
+            samples_qs,
+            request.POST.get("status", ""),
+            dry_run=request.POST.get("dry_run") in ("1", "true", "on"),
+            requested_ids=ids or None,
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    return JsonResponse(report.as_dict())
+
+
+# =========================================================
+# REASSOCIAÇÃO DE COLEÇÃO EM LOTE
+# =========================================================
+@login_required
+def assign_collection_view(request):
+    """
+    Move vários Samples para outra Collection: POST collection=<destino>
+    + ids. Responde logo após o UPDATE; os anexos são relocados por
+    tarefas em segundo plano.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    ids = sample_ids_from(request.POST)
+    if not ids:
+        return JsonResponse({"error": "Informe 'ids'."}, status=400)
+
+    collection = get_object_or_404(Collection, id=request.POST.get("collection") or 0)
+    if not can_edit_collection(request.user, collection):
+        raise PermissionDenied
+
+    report = assign_collection(request.user, Sample.objects.filter(pk__in=ids), collection)
+    return JsonResponse({"collection": collection.pk, **report})
+
+
+# =========================================================
+# LEITURA DE QR / CÓDIGO DE BARRAS (uuid → Sample)
+# =========================================================
+@login_required
+def scan_sample_view(request, sample_uuid):
+    """
+    Resumo de um Sample lido pelo scanner de bancada.
+    """
+    summary = lookup_samples(request.user, [sample_uuid])[str(sample_uuid)]
+    if summary is None:
+        return JsonResponse({"error": "Sample não encontrado."}, status=404)
+    return JsonResponse(summary)
+
+
+@login_required
+def scan_samples_view(request):
+    """
+    Lote de leituras (racks de 96 tubos): POST JSON {"uuids": [...]}
+    ou GET ?uuid= (repetido ou separado por vírgula).
+    """
+    if request.method == "POST":
+        try:
+            raw = json.loads(request.body or b"{}").get("uuids", [])
+        except (ValueError, AttributeError):
+            return JsonResponse({"error": "JSON inválido."}, status=400)
+    else:
+        raw = [u for value in request.GET.getlist("uuid") for u in value.split(",")]
+
+    if not isinstance(raw, list) or len(raw) > MAX_BATCH:
+        return JsonResponse({"error": f"Envie uma lista de até {MAX_BATCH} uuids."}, status=400)
+
+    uuids, invalid = [], []
+    for value in raw:
+        try:
+            uuids.append(uuid.UUID(str(value).strip()))
+        except ValueError:
+            invalid.append(value)
+
+    return JsonResponse({
+        "results": lookup_samples(request.user, uuids),
+        "invalid": invalid,
+    })
+
+
 # =========================================================
 # NOVA VIEW: GERAÇÃO FÍSICA DA ETIQUETA (QR CODE)
 # =========================================================
+def _qr_url(sample, level):
+    return f"{reverse('sample_qr', args=[sample.uuid])}?ec={level}"
+
+
 @login_required
 def print_sample_label(request, sample_id):
     """
@@ -128,27 +340,75 @@ def print_sample_label(request, sample_id):
     if not can_view_sample(request.user, sample):
         raise PermissionDenied
 
-    # Gerar QR Code baseado no UUID único da USP/CEBID
-    qr_data = str(sample.uuid)
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=0,
-    )
-    qr.add_data(qr_data)
-    qr.make(fit=True)
+    # QR Code baseado no UUID único da USP/CEBID (PNG em cache)
+    level = normalize_level(request.GET.get("ec"))
+    ensure_qr_images([sample.uuid], level)
+
+    ctx = {
+        'sample': sample,
+        'qr_url': _qr_url(sample, level),
+    }
+
+    return render(request, "internal/samples/print_label.html", ctx)
+
+
+# =========================================================
+# IMPRESSÃO EM LOTE (FOLHAS COM VÁRIAS ETIQUETAS)
+# =========================================================
+MAX_LABELS = 2000
+
+
+@login_required
+def print_labels_view(request):
+    """
+    Etiquetas de vários Samples por folha: ?ids=1,2,3 (ou ?sample=
+    repetido) ou ?collection=<id>. Layout via ?layout= e sobrescritas
+    (ver LabelLayout); nível de correção via ?ec=.
+    """
+    user = request.user
+    samples_qs = Sample.objects.filter(is_active=True).visible_to(user)
+
+    ids = sample_ids_from(request.GET)
+    collection_id = request.GET.get("collection")
 
-    img = qr.make_image(fill_color="black", back_color="white")
+    if ids:
+        by_id = samples_qs.in_bulk(ids[:MAX_LABELS])
+        samples = [by_id[i] for i in ids if i in by_id]
+    elif collection_id and collection_id.isdigit():
+        collection = get_object_or_404(Collection.objects.select_related("biobank"), id=collection_id)
+        if not can_view_collection(user, collection):
+            raise PermissionDenied
+        samples = list(samples_qs.filter(collection=collection).order_by("sample_id")[:MAX_LABELS])
+    else:
+        return JsonResponse({"error": "Informe 'ids' ou 'collection'."}, status=400)
 
-    # Encode para Base64
-    buf = io.BytesIO()
-    img.save(buf, format='PNG')
-    qr_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
+    level = normalize_level(request.GET.get("ec"))
+    request_qr_images(samples, level, user=user)
 
+    for s in samples:
+        s.qr_url = _qr_url(s, level)
+
+    layout = LabelLayout.from_params(request.GET)
     ctx = {
-        'sample': sample,
-        'qr_code': qr_base64,
+        "layout": layout,
+        "sheets": layout.sheets(samples),
+        "total": len(samples),
     }
+    return render(request, "internal/samples/print_labels.html", ctx)
+
+
+@login_required
+def sample_qr_view(request, sample_uuid):
+    """
+    PNG do QR de um Sample, servido do cache em disco. O conteúdo só
+    depende de (uuid, nível): pode ser cacheado pelo navegador.
+    """
+    if not Sample.objects.visible_to(request.user).filter(uuid=sample_uuid).exists():
+        raise PermissionDenied
+
+    level = normalize_level(request.GET.get("ec"))
+    ensure_qr_images([sample_uuid], level)
 
-    return render(request, "internal/samples/print_label.html", ctx)
\ No newline at end of file
+    response = FileResponse(open(qr_path(sample_uuid, level), "rb"), content_type="image/png")
+    patch_cache_control(response, private=True, max_age=31536000, immutable=True)
+    return response
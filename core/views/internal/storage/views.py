@@ -0,0 +1,117 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+
+from core.models import Sample, StorageUnit
+from core.models.storage.occupancy import position_label
+from core.services.storage import (
+    box_grid,
+    location_string,
+    next_free_positions,
+    parse_position,
+    place_samples,
+)
+from core.views.internal.samples.filters import sample_ids_from
+
+
+MAX_PLACEMENT = 384
+
+
+def _position_dict(box, row, column) -> dict:
+    return {
+        "box_id": box.pk,
+        "box": box.path,
+        "position": position_label(row, column),
+        "location": location_string(box, row, column),
+    }
+
+
+def _start_from(value):
+    position = parse_position(value or "")
+    return position if isinstance(position, tuple) else None
+
+
+# =========================================================
+# CONSULTAS
+# =========================================================
+@login_required
+def storage_free_view(request, unit_id):
+    """
+    Próximas N posições livres de uma caixa/rack/freezer (?n=, ?start=A1).
+    """
+    unit = get_object_or_404(StorageUnit, id=unit_id)
+
+    try:
+        n = min(max(int(request.GET.get("n", 1)), 1), MAX_PLACEMENT)
+    except ValueError:
+        n = 1
+
+    free = next_free_positions(unit, n, start=_start_from(request.GET.get("start")))
+    return JsonResponse({
+        "unit": unit.path,
+        "requested": n,
+        "positions": [_position_dict(box, row, column) for box, row, column in free],
+    })
+
+
+@login_required
+def storage_box_view(request, unit_id):
+    """
+    Grade de uma caixa; Samples não visíveis aparecem só como ocupados.
+    """
+    box = get_object_or_404(StorageUnit, id=unit_id, kind=StorageUnit.BOX)
+
+    visible_ids = set(
+        Sample.objects
+        .visible_to(request.user)
+        .filter(storage_position__box=box)
+        .values_list("pk", flat=True)
+    )
+
+    return JsonResponse({
+        "box": box.path,
+        "rows": box.rows,
+        "columns": box.columns,
+        "grid": box_grid(box, visible_ids=visible_ids),
+    })
+
+
+# =========================================================
+# ALOCAÇÃO DE PLACA (TRANSAÇÃO ÚNICA)
+# =========================================================
+@login_required
+def storage_place_view(request):
+    """
+    POST unit=<id> + ids (ordem da placa) [+ start=A1]: aloca todas as
+    amostras nas próximas posições livres, ou nenhuma.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    unit = get_object_or_404(StorageUnit, id=request.POST.get("unit") or 0)
+
+    ids = sample_ids_from(request.POST)
+    if not ids or len(ids) > MAX_PLACEMENT:
+        return JsonResponse({"error": f"Informe de 1 a {MAX_PLACEMENT} ids."}, status=400)
+
+    editable = Sample.objects.editable_by(request.user).in_bulk(ids)
+    denied = [i for i in ids if i not in editable]
+    if denied:
+        return JsonResponse({"error": "Sem permissão de edição.", "samples": denied}, status=403)
+
+    try:
+        placed = place_samples(
+            [editable[i] for i in ids],
+            unit,
+            user=request.user,
+            start=_start_from(request.POST.get("start")),
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=409)
+
+    return JsonResponse({
+        "placed": [
+            {"id": sample.pk, "sample_id": sample.sample_id, **_position_dict(box, row, column)}
+            for sample, box, row, column in placed
+        ],
+    })
@@ -2,6 +2,7 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.http import JsonResponse
 from django.core.exceptions import PermissionDenied
+from django.db.models import Q
 from core.context import base_context
 from core.models import Tag, KeywordValue
 from core.forms import TagForm
@@ -40,9 +41,10 @@ def search_view(request):
     tag_id = request.GET.get("tag")
     kv_id = request.GET.get("kv")
 
-    biobanks = ctx.get("biobanks", [])
-    collections = ctx.get("collections", [])
-    samples = ctx.get("samples", [])
+    # Querysets já filtrados por permissão (visible_to) no base_context
+    biobanks = ctx["biobanks"]
+    collections = ctx["collections"]
+    samples = ctx["samples"]
 
     selected_tag = Tag.objects.filter(id=tag_id).first() if tag_id else None
     selected_kv = KeywordValue.objects.filter(id=kv_id).first() if kv_id else None
@@ -50,14 +52,16 @@ def search_view(request):
     if selected_tag:
         biobanks = biobanks.filter(tags=selected_tag)
     if selected_kv:
-        samples = samples.filter(keyword_values=selected_kv)
+        samples = samples.filter(keywords=selected_kv)
 
     if query:
-        biobanks = [b for b in biobanks if
-                    query in b.name.lower() or any(query in t.name.lower() for t in b.tags.all())]
-        collections = [c for c in collections if query in c.name.lower()]
-        samples = [s for s in samples if
-                   query in s.sample_id.lower() or any(query in kv.value.lower() for kv in s.keyword_values.all())]
+        biobanks = biobanks.filter(
+            Q(name__icontains=query) | Q(tags__name__icontains=query)
+        ).distinct()
+        collections = collections.filter(name__icontains=query)
+        samples = samples.filter(
+            Q(sample_id__icontains=query) | Q(keywords__value__icontains=query)
+        ).distinct()
 
     ctx["selected_tag"] = selected_tag
     ctx["selected_keyword_value"] = selected_kv
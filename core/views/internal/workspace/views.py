@@ -1,7 +1,11 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
+from django.urls import reverse
 from django.contrib import messages
+from django.http import JsonResponse
+from django.core.exceptions import PermissionDenied
 from core.context import base_context
+from core.permissions.cache import cache_stats
 
 # IMPORTANTE: Importe os modelos assim para evitar erros circulares durante o boot
 from core.models.biobanks.biobank import Biobank
@@ -9,8 +13,9 @@ from core.models.collections.collection import Collection
 from core.models.samples.sample import Sample
 from core.models.events.model import Event
 
-# Import do serviço
-from core.services.benchling_service import BenchlingService
+# Fila de tarefas (Benchling roda no runworker)
+from core.services.jobs import enqueue
+from core.views.internal.jobs.views import job_accepted
 
 # Imports de Views (Certifique-se que esses arquivos existem nos novos caminhos)
 from core.views.internal.biobanks.views import biobanks_view
@@ -61,32 +66,39 @@ def workspace_view(request):
 
 def sync_benchling_view(request):
     """
-    View de execução que utiliza o BenchlingService para espelhar dados na nuvem.
+    Enfileira a sincronização com o Benchling (runworker) e retorna na
+    hora; o progresso fica em /jobs/<id>/.
     """
-    messages.info(request, "Iniciando comunicação com o Benchling SDK...")
-    
-    try:
-        service = BenchlingService()
-        # Selecionamos as últimas 5 amostras ativas para sincronizar
-        samples_to_sync = Sample.objects.filter(is_active=True).order_by('-id')[:5]
-        
-        if not samples_to_sync.exists():
-            messages.warning(request, "Nenhuma amostra disponível para sincronização.")
-            return redirect("/?page=workspace")
+    # Selecionamos as últimas 5 amostras ativas para sincronizar
+    sample_ids = list(
+        Sample.objects.filter(is_active=True).order_by('-id').values_list("id", flat=True)[:5]
+    )
 
-        success_count = 0
-        for sample in samples_to_sync:
-            # Chama o método de criação de Custom Entity definido no seu serviço
-            result_id = service.sync_sample_to_benchling(sample)
-            if result_id:
-                success_count += 1
-        
-        if success_count > 0:
-            messages.success(request, f"Sucesso! {success_count} amostras foram espelhadas no Benchling Registry.")
-        else:
-            messages.error(request, "Falha na criação das entidades. Verifique os IDs de Schema e Registry no serviço.")
+    if not sample_ids:
+        messages.warning(request, "Nenhuma amostra disponível para sincronização.")
+        return redirect("/?page=workspace")
 
-    except Exception as e:
-        messages.error(request, f"Erro na integração: {str(e)}")
-    
-    return redirect("/?page=workspace")
\ No newline at end of file
+    job = enqueue("benchling.sync", user=request.user, sample_ids=sample_ids)
+
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        return job_accepted(job)
+
+    messages.info(
+        request,
+        f"Sincronização com o Benchling enfileirada (tarefa #{job.pk}, "
+        f"{len(sample_ids)} amostras). Acompanhe em {reverse('job_status', args=[job.pk])}.",
+    )
+    return redirect("/?page=workspace")
+
+
+@login_required
+def permission_cache_stats_view(request):
+    """
+    Contadores do cache de permissões (hit/miss/invalidação), somados
+    entre os workers.
+    Apenas staff.
+    """
+    if not request.user.is_staff:
+        raise PermissionDenied
+
+    return JsonResponse(cache_stats())
@@ -1,6 +1,7 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.db import transaction
+from django.db.models import Prefetch
 from django.core.exceptions import PermissionDenied
 
 from ..context import base_context
@@ -10,15 +11,11 @@ from core.models import (
     Biobank,
     BiobankUserRole,
     Tag,
-    Keyword,
-    KeywordValue,
 )
 
-from core.permissions.biobanks import (
-    can_view_biobank,
-    can_edit_biobank,
-    can_manage_biobank_permissions,
-)
+from core.permissions.biobanks import can_manage_biobank_permissions
+from core.permissions.index import PermissionIndex
+from core.services.keywords import attach_keywords, parse_keyword_pairs
 
 
 def biobanks_view(request):
@@ -62,29 +59,10 @@ def biobanks_view(request):
                     # -------------------------------------------------
                     # 3) KEYWORDS (M2M)
                     # -------------------------------------------------
-                    pairs = request.POST.getlist("keyword_pairs")
-
-                    for raw in pairs:
-                        if ":::" not in raw:
-                            continue
-
-                        key, value = raw.split(":::")
-                        key = key.strip()
-                        value = value.strip()
-
-                        if not key or not value:
-                            continue
-
-                        keyword_obj, _ = Keyword.objects.get_or_create(
-                            name=key
-                        )
-
-                        kv, _ = KeywordValue.objects.get_or_create(
-                            keyword=keyword_obj,
-                            value=value
-                        )
-
-                        biobank.keywords.add(kv)
+                    attach_keywords(
+                        biobank,
+                        parse_keyword_pairs(request.POST.getlist("keyword_pairs")),
+                    )
 
                     messages.success(
                         request,
@@ -126,26 +104,25 @@ def biobanks_view(request):
     ctx["all_tags"] = Tag.objects.all().order_by("name")
 
     # -----------------------------------------------------
-    # FILTRAR BIOBANKS POR PERMISSÃO
+    # FILTRAR BIOBANKS POR PERMISSÃO (NO BANCO) + FLAGS PARA TEMPLATE
+    # (papéis só dos Biobanks visíveis)
     # -----------------------------------------------------
-    biobanks = [
-        b for b in Biobank.objects.all().order_by("name")
-        if can_view_biobank(user, b)
-    ]
+    index = PermissionIndex.for_user(user)
+    biobanks = index.visible_biobanks(
+        Biobank.objects
+        .visible_to(user)
+        .prefetch_related(
+            Prefetch(
+                "user_roles",
+                queryset=BiobankUserRole.objects.select_related("user"),
+            )
+        )
+        .order_by("name")
+    )
 
-    # -----------------------------------------------------
-    # FLAGS DE PERMISSÃO PARA TEMPLATE
-    # -----------------------------------------------------
+    # Membros (read-only)
     for b in biobanks:
-        b.can_edit = can_edit_biobank(user, b)
-        b.can_manage_members = can_manage_biobank_permissions(user, b)
-
-        # Membros (read-only)
-        b.members_roles = (
-            b.user_roles
-            .select_related("user")
-            .all()
-        )
+        b.members_roles = b.user_roles.all()
 
     ctx["biobanks"] = biobanks
 